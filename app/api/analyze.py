@@ -1,17 +1,41 @@
-"""POST /analyze — extract drugs from OCR text."""
+"""POST /analyze — extract drugs from OCR text.
 
-from fastapi import APIRouter
+Once the response is sent, the identified drugs are prefetched for the
+/interactions call that usually follows (see app.services.prefetch).
+Results are cached by OCR text, exact and near-duplicate (see
+app.services.analyze_cache).
+"""
 
-from app.api.schemas import AnalyzeRequest, AnalyzeResponse, DrugResult
-from app.services import drug_analyzer
+from fastapi import APIRouter, BackgroundTasks
+
+from app.api.schemas import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
+    AnalyzeRequest,
+    AnalyzeResponse,
+    DrugResult,
+)
+from app.services import analyze_cache, prefetch
 
 router = APIRouter()
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze(request: AnalyzeRequest):
-    drugs = await drug_analyzer.analyze(request.text)
+async def analyze(request: AnalyzeRequest, background_tasks: BackgroundTasks):
+    drugs = await analyze_cache.analyze(request.text)
+    background_tasks.add_task(prefetch.prefetch, drugs)
     return AnalyzeResponse(
         drugs=[DrugResult(**d) for d in drugs],
         raw_text=request.text,
     )
+
+
+@router.post("/analyze/batch", response_model=AnalyzeBatchResponse)
+async def analyze_batch(request: AnalyzeBatchRequest, background_tasks: BackgroundTasks):
+    """Several OCR texts (e.g. one per box in a cabinet scan) in one NER pass."""
+    batch = await analyze_cache.analyze_batch(request.texts)
+    background_tasks.add_task(prefetch.prefetch, [drug for drugs in batch for drug in drugs])
+    return AnalyzeBatchResponse(results=[
+        AnalyzeResponse(drugs=[DrugResult(**d) for d in drugs], raw_text=text)
+        for text, drugs in zip(request.texts, batch)
+    ])
@@ -1,8 +1,10 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter
+from app import profile
 from app.clients import drugbank_client
-from app.nlp import ner_model
+from app.nlp import ner_model, severity_classifier
+from app.services import analyze_cache, cache_warmer, overload
 
 router = APIRouter()
 
@@ -13,15 +15,35 @@ async def health_check():
     return {
         "status": "ok",
         "version": "0.1.0",
+        "profile": profile.PILLCHECKER_PROFILE,
         "ner_model_loaded": ner_model.is_loaded(),
     }
 
 
 @router.get("/health/data")
 async def data_health_check():
-    """Check the status of the drug interaction data source."""
+    """Check the status of the drug interaction data source.
+
+    `supervisor` reports the MCP child's circuit-breaker state, restart
+    count and how long the last recovery took. While the startup cache
+    warm-up is below WARM_READY_FRACTION the status is "warming".
+    `analyze_cache` reports /analyze cache hit rates and audited false reuse.
+    `severity` counts descriptions the fast tier answered and escalated.
+    `overload` reports the degradation level and the load it is based on.
+    """
     connected = await drugbank_client.health_check()
+    if not connected:
+        status = "degraded"
+    elif not cache_warmer.is_warm():
+        status = "warming"
+    else:
+        status = "ready"
     return {
-        "status": "ready" if connected else "degraded",
+        "status": status,
         "drugbank": "connected" if connected else "unreachable",
+        "supervisor": drugbank_client.status(),
+        "warmup": cache_warmer.status(),
+        "analyze_cache": analyze_cache.status(),
+        "severity": severity_classifier.status(),
+        "overload": overload.status(),
     }
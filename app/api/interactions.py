@@ -1,14 +1,64 @@
-"""POST /interactions — check drug-drug interactions."""
+"""POST /interactions — check drug-drug interactions.
 
-from fastapi import APIRouter
+Clients that send `Accept: application/x-ndjson` or `Accept: text/event-stream`
+get each interaction as soon as its pair resolves, then a summary with
+safe/error, instead of one JSON body at the end.
+"""
 
-from app.api.schemas import InteractionsRequest, InteractionsResponse
-from app.services import interaction_checker
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.schemas import (
+    InteractionResult,
+    InteractionsRequest,
+    InteractionsResponse,
+    InteractionsSummary,
+)
+from app.services import cache_warmer, interaction_checker
 
 router = APIRouter()
 
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+
 
 @router.post("/interactions", response_model=InteractionsResponse)
-async def check_interactions(request: InteractionsRequest):
-    result = await interaction_checker.check(request.drugs)
+async def check_interactions(request: InteractionsRequest, http_request: Request):
+    drugs = [d if isinstance(d, str) else d.model_dump(exclude_none=True) for d in request.drugs]
+    cache_warmer.record([d if isinstance(d, str) else d.name for d in request.drugs])
+
+    media_type = _stream_media_type(http_request.headers.get("accept", ""))
+    if media_type is not None:
+        return StreamingResponse(
+            _encode(interaction_checker.stream_refs(drugs), media_type),
+            media_type=media_type,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    result = await interaction_checker.check_refs(drugs)
     return InteractionsResponse(**result)
+
+
+def _stream_media_type(accept: str) -> str | None:
+    """The streaming format the client asked for, if any (unless it lists JSON first)."""
+    for part in accept.split(","):
+        media_type = part.split(";", 1)[0].strip().lower()
+        if media_type in (NDJSON, SSE):
+            return media_type
+        if media_type == "application/json":
+            return None
+    return None
+
+
+async def _encode(events: AsyncIterator[tuple[str, dict]], media_type: str) -> AsyncIterator[str]:
+    """One line (NDJSON) or one event (SSE) per interaction, then the summary."""
+    async for kind, payload in events:
+        model = InteractionResult if kind == "interaction" else InteractionsSummary
+        data = model(**payload).model_dump(mode="json")
+        if media_type == SSE:
+            yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+        else:
+            yield json.dumps({"type": kind, **data}) + "\n"
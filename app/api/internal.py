@@ -0,0 +1,21 @@
+"""GET /internal/cache/{group} — peer cache lookups between API nodes.
+
+Not exposed through nginx; see app.clients.peer_cache.
+"""
+
+from fastapi import APIRouter, HTTPException
+
+from app.clients import peer_cache
+
+router = APIRouter()
+
+
+@router.get("/internal/cache/{group}", include_in_schema=False)
+async def cache_lookup(group: str, key: str):
+    if not peer_cache.enabled() or not peer_cache.is_registered(group):
+        raise HTTPException(status_code=404, detail="Unknown cache group")
+    try:
+        value = await peer_cache.serve(group, key)
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Cache load failed: {exc}") from exc
+    return {"value": value}
@@ -0,0 +1,77 @@
+"""WebSocket /scan/live — drugs and interaction deltas for a stream of OCR frames.
+
+The client sends each OCR frame as {"text": "..."} and gets a LiveScanUpdate
+back. While a frame is being analyzed only the newest waiting frame is kept,
+so a slow frame never builds a backlog. ?regimen_id=<id> checks the scanned
+drugs against a regimen session; the API key goes in the X-API-Key header
+or, for clients that cannot set WebSocket headers, ?api_key=.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.api.schemas import LiveScanUpdate
+from app.middleware.api_key import is_authorized
+from app.services import live_scan, regimen
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.websocket("/scan/live")
+async def scan_live(websocket: WebSocket, regimen_id: str | None = None, api_key: str | None = None):
+    if not is_authorized(websocket.headers.get("x-api-key") or api_key or ""):
+        await websocket.close(code=1008, reason="Invalid or missing API key")
+        return
+    await websocket.accept()
+
+    regimen_refs = regimen.refs(regimen_id) if regimen_id else []
+    if regimen_refs is None:
+        await websocket.close(code=4404, reason="Unknown or expired regimen")
+        return
+
+    scan = live_scan.LiveScan(regimen_refs)
+    try:
+        async for message in _latest_frames(websocket):
+            try:
+                text = json.loads(message)["text"]
+                if not isinstance(text, str):
+                    raise TypeError("text must be a string")
+            except (ValueError, KeyError, TypeError) as exc:
+                await websocket.send_json({"type": "error", "detail": f"Expected {{\"text\": str}}: {exc}"})
+                continue
+            update = await scan.frame(text)
+            await websocket.send_json(LiveScanUpdate(**update).model_dump(mode="json"))
+    except WebSocketDisconnect:
+        pass
+
+
+async def _latest_frames(websocket: WebSocket) -> AsyncIterator[str]:
+    """Messages as they can be processed, dropping all but the newest while one is in flight."""
+    latest: asyncio.Queue[str] = asyncio.Queue(maxsize=1)
+
+    async def receive() -> None:
+        while True:
+            message = await websocket.receive_text()
+            if latest.full():
+                latest.get_nowait()
+            latest.put_nowait(message)
+
+    receiver = asyncio.create_task(receive())
+    try:
+        while True:
+            getter = asyncio.create_task(latest.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            receiver.result()  # re-raises the disconnect
+            return
+    finally:
+        receiver.cancel()
@@ -0,0 +1,55 @@
+"""/regimens — server-side medication lists checked incrementally.
+
+See app.services.regimen.
+"""
+
+from fastapi import APIRouter, HTTPException, Response
+
+from app.api.schemas import DrugRef, RegimenAddRequest, RegimenRequest, RegimenResponse
+from app.services import cache_warmer, regimen
+
+router = APIRouter()
+
+
+def _refs(drugs: list[str | DrugRef]) -> list[str | dict]:
+    cache_warmer.record([d if isinstance(d, str) else d.name for d in drugs])
+    return [d if isinstance(d, str) else d.model_dump(exclude_none=True) for d in drugs]
+
+
+def _found(view: dict | None) -> RegimenResponse:
+    if view is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired regimen")
+    return RegimenResponse(**view)
+
+
+@router.post("/regimens", response_model=RegimenResponse, status_code=201)
+async def create_regimen(request: RegimenRequest):
+    try:
+        return _found(await regimen.create(_refs(request.drugs)))
+    except regimen.RegimenFullError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.get("/regimens/{regimen_id}", response_model=RegimenResponse)
+async def get_regimen(regimen_id: str):
+    return _found(regimen.get(regimen_id))
+
+
+@router.post("/regimens/{regimen_id}/drugs", response_model=RegimenResponse)
+async def add_drugs(regimen_id: str, request: RegimenAddRequest):
+    try:
+        return _found(await regimen.add(regimen_id, _refs(request.drugs)))
+    except regimen.RegimenFullError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.delete("/regimens/{regimen_id}/drugs/{label}", response_model=RegimenResponse)
+async def remove_drug(regimen_id: str, label: str):
+    return _found(await regimen.remove(regimen_id, label))
+
+
+@router.delete("/regimens/{regimen_id}", status_code=204)
+async def delete_regimen(regimen_id: str):
+    if not regimen.delete(regimen_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired regimen")
+    return Response(status_code=204)
@@ -0,0 +1,26 @@
+"""POST /scan — identify drugs in OCR texts and check them for interactions in one request."""
+
+from fastapi import APIRouter
+
+from app.api.schemas import AnalyzeResponse, DrugResult, ScanRequest, ScanResponse
+from app.services import cache_warmer, scan_checker
+
+router = APIRouter()
+
+
+@router.post("/scan", response_model=ScanResponse)
+async def scan(request: ScanRequest):
+    known = [d if isinstance(d, str) else d.model_dump(exclude_none=True) for d in request.drugs]
+    result = await scan_checker.analyze_and_check(request.texts, known)
+
+    names = [d if isinstance(d, str) else d.name for d in request.drugs]
+    cache_warmer.record(names + [drug["name"] for found in result["drugs"] for drug in found])
+    return ScanResponse(
+        results=[
+            AnalyzeResponse(drugs=[DrugResult(**d) for d in drugs], raw_text=text)
+            for text, drugs in zip(request.texts, result["drugs"])
+        ],
+        interactions=result["interactions"],
+        safe=result["safe"],
+        error=result["error"],
+    )
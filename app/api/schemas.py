@@ -1,6 +1,8 @@
 """Pydantic request/response models for the PillChecker API."""
 
-from pydantic import BaseModel, Field
+from typing import Annotated
+
+from pydantic import BaseModel, Field, model_validator
 
 
 # --- POST /analyze ---
@@ -14,7 +16,7 @@ class DrugResult(BaseModel):
     name: str
     dosage: str | None
     form: str | None
-    source: str  # "ner" or "rxnorm_fallback"
+    source: str  # "gazetteer", "ner" or "rxnorm_fallback"
     confidence: float
 
 
@@ -23,14 +25,43 @@ class AnalyzeResponse(BaseModel):
     raw_text: str
 
 
-# --- POST /interactions ---
+# --- POST /analyze/batch ---
 
-class InteractionsRequest(BaseModel):
-    drugs: list[str] = Field(..., min_length=2, examples=[["ibuprofen", "warfarin"]])
+class AnalyzeBatchRequest(BaseModel):
+    texts: list[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=32,
+        examples=[["BRUFEN Ibuprofen 400 mg Film-Coated Tablets", "Warfarin Sodium 5 mg Tablets"]],
+    )
 
 
+class AnalyzeBatchResponse(BaseModel):
+    results: list[AnalyzeResponse]  # one per text, in request order
+
+
+# --- POST /interactions ---
+
 class DrugRef(BaseModel):
-    name: str
+    """A drug given by name, RxCUI (as returned by /analyze) or DrugBank ID."""
+
+    name: str | None = None
+    rxcui: str | None = Field(None, pattern=r"^\d+$")
+    drugbank_id: str | None = Field(None, pattern=r"^DB\d{5}$")
+
+    @model_validator(mode="after")
+    def _require_identifier(self):
+        if not (self.name or self.rxcui or self.drugbank_id):
+            raise ValueError("DrugRef needs at least one of name, rxcui, drugbank_id")
+        return self
+
+
+class InteractionsRequest(BaseModel):
+    drugs: list[str | DrugRef] = Field(
+        ...,
+        min_length=2,
+        examples=[["ibuprofen", "warfarin"], [{"rxcui": "5640"}, {"drugbank_id": "DB00682"}]],
+    )
 
 
 class InteractionResult(BaseModel):
@@ -45,3 +76,60 @@ class InteractionsResponse(BaseModel):
     interactions: list[InteractionResult]
     safe: bool | None
     error: str | None = None
+
+
+class InteractionsSummary(BaseModel):
+    """Last message of a streamed /interactions response."""
+
+    safe: bool | None
+    error: str | None = None
+
+
+# --- POST /scan ---
+
+class ScanRequest(BaseModel):
+    texts: list[Annotated[str, Field(min_length=1)]] = Field(
+        ..., min_length=1, max_length=32, examples=[["BRUFEN Ibuprofen 400 mg Film-Coated Tablets"]],
+    )
+    drugs: list[str | DrugRef] = Field(
+        default_factory=list, examples=[["warfarin"], [{"rxcui": "11289"}]],
+    )
+
+
+class ScanResponse(BaseModel):
+    results: list[AnalyzeResponse]  # one per text, in request order
+    interactions: list[InteractionResult]
+    safe: bool | None
+    error: str | None = None
+
+
+# --- /regimens ---
+
+class RegimenRequest(BaseModel):
+    drugs: list[str | DrugRef] = Field(default_factory=list, examples=[["ibuprofen"]])
+
+
+class RegimenAddRequest(BaseModel):
+    drugs: list[str | DrugRef] = Field(..., min_length=1, examples=[["warfarin"]])
+
+
+class RegimenResponse(BaseModel):
+    id: str
+    drugs: list[str]  # labels, as used in drug_a / drug_b
+    interactions: list[InteractionResult]
+    safe: bool | None
+    error: str | None = None
+
+
+# --- WebSocket /scan/live ---
+
+class LiveScanUpdate(BaseModel):
+    """Server message after each OCR frame."""
+
+    type: str = "update"
+    drugs: list[DrugResult]
+    added: list[InteractionResult]
+    removed: list[tuple[str, str]]  # drug_a, drug_b of interactions gone since the last frame
+    changed: bool
+    safe: bool | None
+    error: str | None = None
@@ -0,0 +1,48 @@
+"""Local alias index: normalized drug names → DrugBank IDs.
+
+Built once from the DrugBank MCP server's get_alias_index dump (names,
+synonyms, salt names, product names) so that "Advil", "ibuprofen" and
+"Ibuprofen Sodium" canonicalize to one DrugBank ID without an FTS search.
+"""
+
+import re
+import unicodedata
+
+# When two drugs claim the same alias the lower rank wins; a tie at the
+# winning rank makes the alias ambiguous and it is left out of the index.
+_RANKS = {"name": 0, "synonyms": 1, "salts": 2, "products": 3}
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize(name: str) -> str:
+    """Casefold, strip accents and collapse punctuation/whitespace to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def build_index(drugs: list[dict]) -> dict[str, str]:
+    """Build {normalized alias: drugbank_id} from get_alias_index records.
+
+    Each record is {drugbank_id, name, synonyms, salts, products}.
+    """
+    best: dict[str, tuple[int, str | None]] = {}
+    for drug in drugs:
+        drugbank_id = drug.get("drugbank_id")
+        if not drugbank_id:
+            continue
+        for field, rank in _RANKS.items():
+            names = [drug.get(field)] if field == "name" else drug.get(field) or []
+            for raw in names:
+                if not isinstance(raw, str):
+                    continue
+                alias = normalize(raw)
+                if not alias:
+                    continue
+                current = best.get(alias)
+                if current is None or rank < current[0]:
+                    best[alias] = (rank, drugbank_id)
+                elif rank == current[0] and current[1] != drugbank_id:
+                    best[alias] = (rank, None)
+    return {alias: drugbank_id for alias, (_, drugbank_id) in best.items() if drugbank_id}
@@ -2,16 +2,34 @@
 
 Spawns drugbank-mcp-server as a stdio child process and queries
 drug interaction data from a pre-built DrugBank SQLite database.
+
+The child is owned by a supervisor task: if the session dies or a call
+hangs past its deadline, the child is killed, respawned and re-initialized
+in the background. A circuit breaker fails calls fast while it is down.
+
+A watcher polls the database file's version. When it changes, a second
+supervisor spawns a child on the new file while the old one keeps serving;
+once it is up the session and alias index are swapped in one step, the
+old child is retired after a grace period, and only cache entries tagged
+with the old version are dropped. The interaction graph is used only while
+it was built from the version being served, and re-mapping it drops the
+entries cached from the previous one.
 """
 
+import asyncio
 import json
 import logging
 import os
+import re
 import time
-from contextlib import AbstractAsyncContextManager
+from collections.abc import Awaitable, Callable
 
 from mcp import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.stdio import StdioServerParameters, get_default_environment, stdio_client
+
+from app.clients import drug_aliases, interaction_graph, peer_cache, ttl_cache
+from app.clients.interaction_records import InteractionList
+from app.nlp.gazetteer import Gazetteer
 
 logger = logging.getLogger(__name__)
 
@@ -21,116 +39,490 @@ DRUGBANK_SERVER_ARGS = os.environ.get(
     os.path.join(os.path.dirname(__file__), "..", "..", "drugbank-mcp-server", "build", "index.js"),
 )
 
+# Per-call deadline; a hung Node child must not stall every waiting request.
+DRUGBANK_CALL_TIMEOUT = float(os.environ.get("DRUGBANK_CALL_TIMEOUT", "10"))
+# Consecutive failures before the breaker opens, and how long it stays open.
+DRUGBANK_BREAKER_THRESHOLD = int(os.environ.get("DRUGBANK_BREAKER_THRESHOLD", "5"))
+DRUGBANK_BREAKER_RESET = float(os.environ.get("DRUGBANK_BREAKER_RESET", "30"))
+# Database file the child is told to open (DRUGBANK_DB_PATH in its environment), and how
+# often to check it for a new version (0 disables).
+DRUGBANK_DB_PATH = os.environ.get(
+    "DRUGBANK_DB_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "drugbank-mcp-server", "data", "drugbank.db"),
+)
+DRUGBANK_DB_WATCH_INTERVAL = float(os.environ.get("DRUGBANK_DB_WATCH_INTERVAL", "60"))
+
+_BATCH_SIZE = 100  # MAX_BATCH_SIZE in drugbank-api.js
+_CONNECT_TIMEOUT = 30.0  # spawn + initialize, including the SQLite open
+_RESTART_BACKOFF_MIN = 1.0
+_RESTART_BACKOFF_MAX = 30.0
+
 _session: ClientSession | None = None
-_streams: AbstractAsyncContextManager | None = None
 
-# Simple TTL cache: {key: (value, expiry_timestamp)}
-_cache: dict[str, tuple[object, float]] = {}
-_CACHE_TTL = 86400  # 24 hours
-_CACHE_MISS = object()  # sentinel to distinguish cache miss from cached None
+# Supervisor state — events are created in connect() so they bind to the running loop.
+_supervisor: asyncio.Task | None = None
+_ready: asyncio.Event | None = None
+_dead: asyncio.Event | None = None
+_restarts = 0
+_down_since: float | None = None
+_last_recovery: float | None = None
+
+# Version of the database behind the live session; cache entries are tagged with it
+_data_version: str | None = None
+_graph_version: str | None = None
+_watcher: asyncio.Task | None = None
+_swap_listeners: list[Callable[[str, str | None], None]] = []
+
+# Accounted-bytes budget for cached ID resolutions and interaction lists (LRU eviction)
+DRUGBANK_CACHE_MAX_BYTES = int(float(os.environ.get("DRUGBANK_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+_CACHE_TTL = 86400  # 24 hours, then served stale while refreshed in the background
+_CACHE_MISS = ttl_cache.MISS  # sentinel to distinguish cache miss from cached None
+_cache = ttl_cache.TTLCache(
+    _CACHE_TTL,
+    max_bytes=DRUGBANK_CACHE_MAX_BYTES,
+    hard_ttl=_CACHE_TTL + ttl_cache.CACHE_STALE_TTL,
+    jitter=ttl_cache.CACHE_TTL_JITTER,
+    tagger=lambda: _data_version,
+)
+
+# Normalized alias → DrugBank ID, loaded once from get_alias_index
+_aliases: dict[str, str] = {}
+# Dictionary matcher over _aliases, for finding drug names in OCR text
+_gazetteer: Gazetteer | None = None
+
+# Bare DrugBank IDs ("DB01050") are taken as already resolved
+_DRUGBANK_ID = re.compile(r"DB\d{5}", re.IGNORECASE)
 
 
 class DrugBankUnavailableError(Exception):
     """Raised when the DrugBank MCP server is unreachable or returns an error."""
 
 
-def _cache_get(key: str) -> object:
-    """Return cached value or _CACHE_MISS sentinel."""
-    if key in _cache:
-        value, expiry = _cache[key]
-        if time.time() < expiry:
-            return value
-        del _cache[key]
-    return _CACHE_MISS
+class _CircuitBreaker:
+    """Fail fast while the DrugBank backend is down.
+
+    closed → open after `threshold` consecutive failures. Once `reset_timeout`
+    has elapsed the breaker is half_open and lets a single trial call through;
+    success closes it, failure re-opens it.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_deadline: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        # half_open: one trial at a time (a cancelled trial expires after reset_timeout)
+        now = time.monotonic()
+        if self._trial_deadline is not None and now < self._trial_deadline:
+            return False
+        self._trial_deadline = now + self.reset_timeout
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial_deadline = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_deadline = None
+        if self._opened_at is not None or self.failures >= self.threshold:
+            self._opened_at = time.monotonic()
+
+
+_breaker = _CircuitBreaker(DRUGBANK_BREAKER_THRESHOLD, DRUGBANK_BREAKER_RESET)
+
+
+def _cache_get(key: str, refresh: Callable[[], Awaitable[object]] | None = None) -> object:
+    """Return cached value or _CACHE_MISS sentinel; a stale value is refreshed in the background."""
+    return _cache.get(key, refresh=refresh)
 
 
-def _cache_set(key: str, value: object) -> None:
-    _cache[key] = (value, time.time() + _CACHE_TTL)
+def _cache_set(key: str, value: object, version: str | None) -> None:
+    """Cache a value served from data `version`; dropped if that version was swapped out since."""
+    if version != _data_version:
+        return
+    _cache.set(key, value)
 
 
 async def connect() -> None:
-    """Spawn the DrugBank MCP server and establish a stdio session.
+    """Start the supervisor and wait for the first DrugBank MCP session.
 
-    Silently degrades to _session=None on failure (graceful degradation).
+    Silently degrades to _session=None on failure (graceful degradation);
+    the supervisor keeps retrying in the background with exponential backoff.
     """
-    global _session, _streams
+    global _supervisor, _ready, _dead, _watcher, _graph_version
+    if _supervisor is not None and not _supervisor.done():
+        return
+
+    _ready = asyncio.Event()
+    _dead = asyncio.Event()
+    first_attempt = asyncio.get_running_loop().create_future()
+    _supervisor = asyncio.create_task(_supervise(first_attempt))
+    interaction_graph.expect_source(interaction_graph.file_version(DRUGBANK_DB_PATH))
+    if DRUGBANK_DB_WATCH_INTERVAL > 0:
+        _graph_version = interaction_graph.file_version(interaction_graph.INTERACTION_GRAPH_PATH)
+        _watcher = asyncio.create_task(_watch_data())
     try:
-        server_params = StdioServerParameters(
-            command=DRUGBANK_SERVER_CMD,
-            args=[DRUGBANK_SERVER_ARGS],
-        )
-        _streams = stdio_client(server_params)
-        read_stream, write_stream = await _streams.__aenter__()
+        await asyncio.wait_for(asyncio.shield(first_attempt), _CONNECT_TIMEOUT)
+    except TimeoutError:
+        logger.warning("DrugBank MCP server did not start within %.0fs", _CONNECT_TIMEOUT)
+
+
+async def _supervise(first_attempt: asyncio.Future) -> None:
+    """Keep one DrugBank MCP child alive, respawning it whenever it dies."""
+    global _down_since
+    backoff = _RESTART_BACKOFF_MIN
+    while True:
+        was_up = False
         try:
-            _session = ClientSession(read_stream, write_stream)
-            await _session.__aenter__()
-            await _session.initialize()
-            tools = await _session.list_tools()
+            was_up = await _run_session(first_attempt)
+        except Exception:
+            logger.warning("Failed to connect to DrugBank MCP server", exc_info=True)
+
+        if not first_attempt.done():
+            first_attempt.set_result(False)
+        if _down_since is None and _session is None:
+            _down_since = time.monotonic()
+
+        if was_up:
+            # A healthy session just died — respawn straight away.
+            backoff = _RESTART_BACKOFF_MIN
+            continue
+        logger.info("Retrying DrugBank MCP server in %.1fs", backoff)
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, _RESTART_BACKOFF_MAX)
+
+
+async def _run_session(first_attempt: asyncio.Future) -> bool:
+    """Spawn the child, initialize a session and hold it until marked dead.
+
+    Both context managers are entered and exited in the supervisor task,
+    as the stdio transport's task group requires. The alias index is built
+    into locals; going live then replaces the current session, data version
+    and alias index in one statement (no await in between), and points the
+    interaction graph check at the new version.
+    """
+    global _session, _dead, _data_version, _aliases, _gazetteer
+    global _restarts, _down_since, _last_recovery
+    version = interaction_graph.file_version(DRUGBANK_DB_PATH)
+    server_params = StdioServerParameters(
+        command=DRUGBANK_SERVER_CMD,
+        args=[DRUGBANK_SERVER_ARGS],
+        env={**get_default_environment(), "DRUGBANK_DB_PATH": DRUGBANK_DB_PATH},
+    )
+    async with stdio_client(server_params) as (read_stream, write_stream):
+        session = ClientSession(read_stream, write_stream)
+        async with session:
+            await asyncio.wait_for(session.initialize(), _CONNECT_TIMEOUT)
+            tools = await asyncio.wait_for(session.list_tools(), _CONNECT_TIMEOUT)
             names = {t.name for t in tools.tools}
             if "drugbank_info" not in names:
                 logger.warning("DrugBank MCP server tools: %s — expected 'drugbank_info'", names)
             logger.info("Connected to DrugBank MCP server (tools=%s)", names)
+            aliases, gazetteer = _aliases, _gazetteer
+            if not aliases or version != _data_version:
+                aliases, gazetteer = await _load_aliases(session)
+
+            dead = asyncio.Event()
+            previous = _data_version
+            _dead, _session, _data_version, _aliases, _gazetteer = (
+                dead, session, version, aliases, gazetteer,
+            )
+            interaction_graph.expect_source(version)
+            try:
+                _breaker.record_success()
+                if _down_since is not None:
+                    _last_recovery = time.monotonic() - _down_since
+                    _restarts += 1
+                    _down_since = None
+                    logger.info("DrugBank MCP server recovered in %.2fs", _last_recovery)
+                _ready.set()
+                if not first_attempt.done():
+                    first_attempt.set_result(True)
+                if previous is not None and version != previous:
+                    _invalidate(previous, version)
+
+                await dead.wait()
+            finally:
+                if _session is session:
+                    _session = None
+                    _ready.clear()
+    return True
+
+
+def data_version() -> str | None:
+    """Version of the database behind the live session."""
+    return _data_version
+
+
+def on_data_swap(listener: Callable[[str, str | None], None]) -> None:
+    """Call listener(old_version, new_version) after the database is swapped."""
+    _swap_listeners.append(listener)
+
+
+def _invalidate(old_version: str, new_version: str | None) -> None:
+    """Drop cache entries tagged old_version (new_version is the same after a graph reload)."""
+    dropped = _cache.invalidate_tag(old_version)
+    logger.info(
+        "DrugBank data %s → %s: dropped %d cache entries", old_version, new_version, dropped,
+    )
+    for listener in _swap_listeners:
+        try:
+            listener(old_version, new_version)
         except Exception:
-            await _streams.__aexit__(None, None, None)
-            raise
+            logger.warning("Data swap listener failed", exc_info=True)
+
+
+async def _watch_data() -> None:
+    """Poll the database and graph files; swap in new versions without downtime."""
+    global _graph_version
+    while True:
+        await asyncio.sleep(DRUGBANK_DB_WATCH_INTERVAL)
+        graph_version = interaction_graph.file_version(interaction_graph.INTERACTION_GRAPH_PATH)
+        if graph_version is not None and graph_version != _graph_version:
+            if interaction_graph.load():
+                _graph_version = graph_version
+                # Lists and pair results cached from the previous graph
+                if _data_version is not None:
+                    _invalidate(_data_version, _data_version)
+        version = interaction_graph.file_version(DRUGBANK_DB_PATH)
+        if version is not None and version != _data_version and _session is not None:
+            logger.info("New DrugBank database version %s — swapping", version)
+            await _swap()
+
+
+async def _swap() -> bool:
+    """Start a supervisor on the current file and retire the old one once the new child is live.
+
+    The old child keeps serving until the new session replaces it, then gets
+    DRUGBANK_CALL_TIMEOUT to finish calls already sent to it. If the new
+    child does not come up, the old one stays and the next check retries.
+    """
+    global _supervisor
+    old = _supervisor
+    first_attempt = asyncio.get_running_loop().create_future()
+    new = asyncio.create_task(_supervise(first_attempt))
+    try:
+        live = await asyncio.wait_for(asyncio.shield(first_attempt), _CONNECT_TIMEOUT)
+    except TimeoutError:
+        live = False
+    if not live:
+        logger.warning("New DrugBank database failed to start — keeping the current one")
+        await _cancel(new)
+        return False
+
+    _supervisor = new
+    await asyncio.sleep(DRUGBANK_CALL_TIMEOUT)
+    await _cancel(old)
+    return True
+
+
+async def _cancel(task: asyncio.Task | None) -> None:
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+async def _load_aliases(session: ClientSession) -> tuple[dict[str, str], Gazetteer | None]:
+    """Build the alias index and gazetteer from get_alias_index (best effort).
+
+    Returns empty ones on failure: names are still resolved, just by an MCP
+    search each. The caller installs them with the session they came from.
+    """
+    try:
+        result = await asyncio.wait_for(
+            session.call_tool("drugbank_info", {"method": "get_alias_index"}),
+            _CONNECT_TIMEOUT,
+        )
+        if result.isError:
+            raise ValueError("get_alias_index returned an error")
+        loop = asyncio.get_running_loop()
+        aliases = await loop.run_in_executor(None, _parse_alias_index, result.content[0].text)
+        gazetteer = await loop.run_in_executor(None, Gazetteer, aliases)
+        logger.info("Loaded DrugBank alias index (%d aliases)", len(aliases))
+        return aliases, gazetteer
     except Exception:
-        logger.warning("Failed to connect to DrugBank MCP server", exc_info=True)
-        _session = None
-        _streams = None
+        logger.warning("DrugBank alias index unavailable — resolving names by search", exc_info=True)
+        return {}, None
+
+
+def _parse_alias_index(text: str) -> dict[str, str]:
+    data = json.loads(text)
+    if "error" in data:
+        raise ValueError(data["error"])
+    return drug_aliases.build_index(data.get("drugs", []))
+
+
+def _mark_dead(session: ClientSession, reason: str) -> None:
+    """Drop a broken session and wake the supervisor to respawn the child."""
+    global _session, _down_since
+    if session is not _session:
+        return  # already replaced
+    logger.warning("DrugBank MCP session lost (%s) — restarting", reason)
+    _session = None
+    if _down_since is None:
+        _down_since = time.monotonic()
+    if _ready is not None:
+        _ready.clear()
+    if _dead is not None:
+        _dead.set()
 
 
 async def close() -> None:
-    """Close the MCP session and kill the child process."""
-    global _session, _streams
+    """Stop the supervisor, close the MCP session and kill the child process."""
+    global _session, _supervisor, _watcher
     try:
-        if _session is not None:
-            try:
-                await _session.__aexit__(None, None, None)
-            except Exception:
-                pass
-            _session = None
+        await _cancel(_watcher)
+        _watcher = None
+        await _cancel(_supervisor)
+        _supervisor = None
     finally:
-        if _streams is not None:
-            try:
-                await _streams.__aexit__(None, None, None)
-            except Exception:
-                pass
-            _streams = None
+        _session = None
 
 
 async def health_check() -> bool:
     """Check if the MCP session is alive by calling list_tools."""
-    if _session is None:
+    session = _session
+    if session is None:
         return False
     try:
-        await _session.list_tools()
+        await asyncio.wait_for(session.list_tools(), DRUGBANK_CALL_TIMEOUT)
         return True
-    except Exception:
+    except Exception as exc:
+        _mark_dead(session, f"health check failed: {exc!r}")
         return False
 
 
-async def _resolve_drugbank_id(drug_name: str) -> str | None:
-    """Resolve a drug name to a DrugBank ID via search_by_name.
+def status() -> dict:
+    """Supervisor and circuit-breaker state, reported by /health/data."""
+    return {
+        "circuit_breaker": _breaker.state,
+        "consecutive_failures": _breaker.failures,
+        "restarts": _restarts,
+        "last_recovery_seconds": round(_last_recovery, 3) if _last_recovery is not None else None,
+        "down_for_seconds": (
+            round(time.monotonic() - _down_since, 3) if _down_since is not None else None
+        ),
+    }
 
-    Returns the drugbank_id of the first result, or None if not found.
-    Raises DrugBankUnavailableError if the session is down.
-    """
-    cache_key = f"dbid:{drug_name.lower()}"
-    cached = _cache_get(cache_key)
-    if cached is not _CACHE_MISS:
-        return cached
 
-    if _session is None:
+async def _wait_for_session(timeout: float) -> ClientSession | None:
+    """Return the live session, waiting up to timeout if the supervisor is restarting it."""
+    if _session is not None or _supervisor is None or _supervisor.done() or _ready is None:
+        return _session
+    try:
+        await asyncio.wait_for(_ready.wait(), timeout)
+    except TimeoutError:
+        pass
+    return _session
+
+
+async def _call_tool(arguments: dict):
+    """Call drugbank_info with a deadline, behind the circuit breaker.
+
+    The deadline (DRUGBANK_CALL_TIMEOUT) covers waiting for a restarting
+    session as well as the call itself.
+
+    Returns the result and the data version of the session that served it,
+    for tagging what gets cached from it. Raises DrugBankUnavailableError
+    when the breaker is open, no session is available, or the call fails or
+    times out (which also restarts the child).
+    """
+    if not _breaker.allow():
+        raise DrugBankUnavailableError("DrugBank circuit breaker open")
+
+    deadline = time.monotonic() + DRUGBANK_CALL_TIMEOUT
+    session = await _wait_for_session(DRUGBANK_CALL_TIMEOUT)
+    # Replaced together with _session, so this is the serving session's version
+    version = _data_version
+    remaining = deadline - time.monotonic()
+    if session is None or remaining <= 0:
+        _breaker.record_failure()
         raise DrugBankUnavailableError("DrugBank MCP session not established")
 
     try:
-        result = await _session.call_tool(
-            "drugbank_info",
-            {"method": "search_by_name", "query": drug_name, "limit": 1},
+        result = await asyncio.wait_for(
+            session.call_tool("drugbank_info", arguments),
+            remaining,
         )
+    except TimeoutError as exc:
+        _breaker.record_failure()
+        _mark_dead(session, f"{arguments.get('method')} timed out")
+        raise DrugBankUnavailableError(
+            f"DrugBank call timed out after {DRUGBANK_CALL_TIMEOUT:.0f}s"
+        ) from exc
     except Exception as exc:
+        _breaker.record_failure()
+        _mark_dead(session, f"{arguments.get('method')} failed: {exc!r}")
         raise DrugBankUnavailableError(f"DrugBank call failed: {exc}") from exc
 
+    _breaker.record_success()
+    return result, version
+
+
+def _local_id(drug_name: str) -> object:
+    """DrugBank ID from the alias index or the resolution cache.
+
+    Returns _CACHE_MISS when the name has to be searched for.
+    """
+    if _DRUGBANK_ID.fullmatch(drug_name.strip()):
+        return drug_name.strip().upper()
+    drugbank_id = _aliases.get(drug_aliases.normalize(drug_name))
+    if drugbank_id is not None:
+        return drugbank_id
+    return _cache_get(f"dbid:{drug_name.lower()}", lambda: _refresh_drugbank_id(drug_name))
+
+
+def gazetteer() -> Gazetteer | None:
+    """Matcher for the current alias index, or None until it has loaded."""
+    return _gazetteer
+
+
+def canonical_id(drug_name: str) -> str | None:
+    """DrugBank ID a name canonicalizes to, if already known (no I/O).
+
+    Names resolved by an earlier lookup are known; others return None.
+    """
+    drugbank_id = _local_id(drug_name)
+    return None if drugbank_id is _CACHE_MISS else drugbank_id
+
+
+async def _resolve_drugbank_id(drug_name: str) -> str | None:
+    """Resolve a drug name to a DrugBank ID via the alias index or search_by_name.
+
+    Returns the drugbank_id of the first result, or None if not found.
+    Raises DrugBankUnavailableError if the session is down.
+    """
+    local = _local_id(drug_name)
+    if local is not _CACHE_MISS:
+        return local
+
+    result, version = await _call_tool(
+        {"method": "search_by_name", "query": drug_name, "limit": 1},
+    )
+
     if result.isError:
         raise DrugBankUnavailableError(f"DrugBank returned error for {drug_name}")
 
@@ -142,54 +534,258 @@ async def _resolve_drugbank_id(drug_name: str) -> str | None:
         logger.warning("Failed to parse search_by_name response for %s", drug_name)
         drugbank_id = None
 
-    _cache_set(cache_key, drugbank_id)
+    _cache_set(f"dbid:{drug_name.lower()}", drugbank_id, version)
     return drugbank_id
 
 
+async def resolve_rxcuis(rxcuis: list[str]) -> dict[str, str | None]:
+    """Map RxCUIs to DrugBank IDs through the server's crosswalk table.
+
+    An RxCUI shared by several DrugBank drugs maps to the lowest ID; unknown
+    RxCUIs map to None. Raises DrugBankUnavailableError if the session is down.
+    """
+    resolved: dict[str, str | None] = {}
+    misses = []
+    for rxcui in dict.fromkeys(rxcuis):
+        cached = _cache_get(f"rxcui:{rxcui}", lambda rxcui=rxcui: _refresh_rxcui(rxcui))
+        if cached is not _CACHE_MISS:
+            resolved[rxcui] = cached
+        else:
+            misses.append(rxcui)
+
+    for chunk in _chunks(misses):
+        resolved |= await _crosswalk(chunk)
+    return resolved
+
+
+async def _crosswalk(rxcuis: list[str]) -> dict[str, str | None]:
+    """One resolve_rxcui_batch call; caches and returns {rxcui: drugbank_id}."""
+    result, version = await _call_tool({"method": "resolve_rxcui_batch", "rxcuis": rxcuis})
+    if result.isError:
+        raise DrugBankUnavailableError("DrugBank returned error for resolve_rxcui_batch")
+    try:
+        items = json.loads(result.content[0].text).get("results", [])
+    except (json.JSONDecodeError, IndexError):
+        logger.warning("Failed to parse resolve_rxcui_batch response")
+        items = []
+
+    resolved: dict[str, str | None] = {}
+    for i, rxcui in enumerate(rxcuis):
+        try:
+            drugbank_ids = items[i].get("drugbank_ids") or []
+            drugbank_id = drugbank_ids[0] if drugbank_ids else None
+        except (IndexError, AttributeError):
+            logger.warning("Failed to parse resolve_rxcui_batch result for %s", rxcui)
+            drugbank_id = None
+        _cache_set(f"rxcui:{rxcui}", drugbank_id, version)
+        resolved[rxcui] = drugbank_id
+    return resolved
+
+
 async def get_interactions(drug_name: str) -> list[dict]:
     """Get drug-drug interactions for a given drug name.
 
-    Returns list of {"drug": str, "description": str | None}.
+    Returns list of {"drug": str, "drugbank_id": str | None, "description": str | None}.
+    Served from the mapped interaction graph when loaded; otherwise fetched
+    over MCP and cached per DrugBank ID, so aliases share one entry.
     Raises DrugBankUnavailableError if the server is unreachable.
     """
-    cache_key = f"interactions:{drug_name.lower()}"
-    cached = _cache_get(cache_key)
-    if cached is not _CACHE_MISS:
-        return cached
-
     # Step 1: resolve name → drugbank_id
     drugbank_id = await _resolve_drugbank_id(drug_name)
     if drugbank_id is None:
         logger.info("Drug not found in DrugBank: %s", drug_name)
-        _cache_set(cache_key, [])
         return []
 
-    # Step 2: fetch interactions
-    if _session is None:
-        raise DrugBankUnavailableError("DrugBank MCP session not established")
+    graph_row = interaction_graph.interactions(drugbank_id)
+    if graph_row is not None:
+        return graph_row
 
-    try:
-        result = await _session.call_tool(
-            "drugbank_info",
-            {"method": "get_drug_interactions", "drugbank_id": drugbank_id},
-        )
-    except Exception as exc:
-        raise DrugBankUnavailableError(f"DrugBank call failed: {exc}") from exc
+    cache_key = f"interactions:{drugbank_id}"
+    cached = _cache_get(cache_key, lambda: _refresh_interactions(drugbank_id))
+    if cached is not _CACHE_MISS:
+        return cached
+
+    shared = await peer_cache.lookup("drugbank.interactions", drugbank_id)
+    if shared is not _CACHE_MISS:
+        return shared
+
+    # Step 2: fetch interactions
+    result, version = await _call_tool(
+        {"method": "get_drug_interactions", "drugbank_id": drugbank_id},
+    )
 
     if result.isError:
         raise DrugBankUnavailableError(f"DrugBank returned error for {drugbank_id}")
 
     try:
         data = json.loads(result.content[0].text)
-        raw_interactions = data.get("interactions", [])
-        # Map to same format as biomcp_client: {drug, description}
-        interactions = [
-            {"drug": entry.get("name", ""), "description": entry.get("description")}
-            for entry in raw_interactions
-        ]
+        interactions = _to_entries(data.get("drug_name"), data.get("interactions", []))
     except (json.JSONDecodeError, IndexError):
         logger.warning("Failed to parse interactions response for %s", drug_name)
         interactions = []
 
-    _cache_set(cache_key, interactions)
+    _cache_set(cache_key, interactions, version)
     return interactions
+
+
+def _to_entries(drug_name: str | None, raw_interactions: list[dict]) -> InteractionList:
+    """Map DrugBank interaction records to {drug, drugbank_id, description} entries.
+
+    Same format as biomcp_client ({drug, description}, plus the partner's ID),
+    held as an InteractionList of interned columns while cached.
+    """
+    return InteractionList(drug_name, raw_interactions)
+
+
+def _chunks(items: list, size: int = _BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def get_interactions_batch(drug_names: list[str]) -> dict[str, list[dict] | Exception]:
+    """Get drug-drug interactions for several drugs in at most two MCP round trips.
+
+    Names not in the alias index or cache are resolved with one
+    search_by_name_batch call, and uncached interaction lists fetched with one
+    get_drug_interactions_batch call (per _BATCH_SIZE drugs); aliases of the
+    same drug share one fetch. Drugs in the mapped interaction graph need no
+    fetch at all, and with the peer cache on, lists owned by other nodes are
+    asked of them first. Returns {name: interactions}; a name maps to a
+    DrugBankUnavailableError instead when its lookup failed, mirroring
+    asyncio.gather(return_exceptions=True) so callers can degrade per drug.
+    """
+    results: dict[str, list[dict] | Exception] = {}
+    drugbank_ids: dict[str, str | None] = {}
+    misses = []
+    for name in dict.fromkeys(drug_names):
+        local = _local_id(name)
+        if local is _CACHE_MISS:
+            misses.append(name)
+        else:
+            drugbank_ids[name] = local
+
+    try:
+        drugbank_ids |= await _search_drugbank_ids(misses)
+    except DrugBankUnavailableError as exc:
+        results |= {name: exc for name in misses}
+
+    interactions: dict[str, list[dict]] = {}
+    to_fetch = []
+    for drugbank_id in dict.fromkeys(i for i in drugbank_ids.values() if i is not None):
+        graph_row = interaction_graph.interactions(drugbank_id)
+        if graph_row is not None:
+            interactions[drugbank_id] = graph_row
+            continue
+        cached = _cache_get(
+            f"interactions:{drugbank_id}", lambda drugbank_id=drugbank_id: _refresh_interactions(drugbank_id),
+        )
+        if cached is not _CACHE_MISS:
+            interactions[drugbank_id] = cached
+        else:
+            to_fetch.append(drugbank_id)
+
+    # Lists owned by other nodes come from them when the peer cache is on
+    if to_fetch and peer_cache.enabled():
+        shared = await asyncio.gather(
+            *(peer_cache.lookup("drugbank.interactions", drugbank_id) for drugbank_id in to_fetch)
+        )
+        for drugbank_id, entries in zip(to_fetch, shared):
+            if entries is not _CACHE_MISS:
+                interactions[drugbank_id] = entries
+        to_fetch = [drugbank_id for drugbank_id in to_fetch if drugbank_id not in interactions]
+
+    error: DrugBankUnavailableError | None = None
+    try:
+        for chunk in _chunks(to_fetch):
+            fetched, version = await _fetch_interactions_batch(chunk)
+            for drugbank_id, entries in fetched.items():
+                _cache_set(f"interactions:{drugbank_id}", entries, version)
+            interactions |= fetched
+    except DrugBankUnavailableError as exc:
+        error = exc
+
+    for name, drugbank_id in drugbank_ids.items():
+        if drugbank_id is None:
+            logger.info("Drug not found in DrugBank: %s", name)
+            results[name] = []
+        elif drugbank_id in interactions:
+            results[name] = interactions[drugbank_id]
+        else:
+            results[name] = error
+    return results
+
+
+async def _search_drugbank_ids(drug_names: list[str]) -> dict[str, str | None]:
+    """Resolve several names to DrugBank IDs with search_by_name_batch.
+
+    Raises DrugBankUnavailableError if the session is down.
+    """
+    resolved: dict[str, str | None] = {}
+    for chunk in _chunks(drug_names):
+        result, version = await _call_tool(
+            {"method": "search_by_name_batch", "queries": chunk, "limit": 1},
+        )
+        if result.isError:
+            raise DrugBankUnavailableError("DrugBank returned error for search_by_name_batch")
+        try:
+            items = json.loads(result.content[0].text).get("results", [])
+        except (json.JSONDecodeError, IndexError):
+            logger.warning("Failed to parse search_by_name_batch response")
+            items = []
+
+        for i, name in enumerate(chunk):
+            try:
+                matches = items[i].get("results", [])
+                drugbank_id = matches[0]["drugbank_id"] if matches else None
+            except (IndexError, KeyError, AttributeError):
+                logger.warning("Failed to parse search_by_name_batch result for %s", name)
+                drugbank_id = None
+            _cache_set(f"dbid:{name.lower()}", drugbank_id, version)
+            resolved[name] = drugbank_id
+    return resolved
+
+
+async def _fetch_interactions_batch(
+    drugbank_ids: list[str],
+) -> tuple[dict[str, list[dict]], str | None]:
+    """Fetch interaction entries for several DrugBank IDs in one call.
+
+    Returns them with the data version they were served from.
+    Raises DrugBankUnavailableError if the session is down.
+    """
+    result, version = await _call_tool(
+        {"method": "get_drug_interactions_batch", "drugbank_ids": drugbank_ids},
+    )
+    if result.isError:
+        raise DrugBankUnavailableError("DrugBank returned error for get_drug_interactions_batch")
+    try:
+        items = json.loads(result.content[0].text).get("results", [])
+    except (json.JSONDecodeError, IndexError):
+        logger.warning("Failed to parse get_drug_interactions_batch response")
+        items = []
+
+    fetched = {}
+    for i, drugbank_id in enumerate(drugbank_ids):
+        try:
+            fetched[drugbank_id] = _to_entries(items[i].get("drug_name"), items[i].get("interactions", []))
+        except (IndexError, AttributeError):
+            logger.warning("Failed to parse interactions for %s", drugbank_id)
+            fetched[drugbank_id] = []
+    return fetched, version
+
+
+# Background refreshes for stale cache entries: refetch bypassing the cache
+async def _refresh_drugbank_id(drug_name: str) -> str | None:
+    return (await _search_drugbank_ids([drug_name]))[drug_name]
+
+
+async def _refresh_rxcui(rxcui: str) -> str | None:
+    return (await _crosswalk([rxcui]))[rxcui]
+
+
+async def _refresh_interactions(drugbank_id: str) -> list[dict]:
+    fetched, _ = await _fetch_interactions_batch([drugbank_id])
+    return fetched[drugbank_id]
+
+
+peer_cache.register("drugbank.interactions", get_interactions, encode=list)
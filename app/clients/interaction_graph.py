@@ -0,0 +1,354 @@
+"""Memory-mapped DrugBank interaction graph.
+
+An offline-built binary artifact (scripts/build_interaction_graph.py) holds
+the whole DrugBank interaction graph in CSR form: drugs are integer indices,
+each drug's partners are a sorted slice of one uint32 array, and every edge
+points at an interned description template plus a severity code. Workers
+mmap the file read-only, so the OS page cache keeps a single copy in RAM
+and a pair check is two binary searches.
+
+The header records the version (file_version) of the database the graph
+was built from. drugbank_client sets the version it serves with
+expect_source(); a graph built from another version is not used, so lookups
+go over MCP until the two match again.
+
+Layout (little-endian, sections 4-byte aligned):
+  header    magic, version, counts, source database version, section offsets (_HEADER)
+  ids       uint32[n_drugs]      numeric part of the DrugBank ID, ascending
+  row_ptr   uint32[n_drugs + 1]  edge range of each drug
+  cols      uint32[n_edges]      partner drug index, ascending within a row
+  edge_tmpl uint32[n_edges]      description template of each edge
+  tmpl_sev  uint8[n_templates]   severity code of each template
+  names     uint32[n_drugs + 1] offsets + UTF-8 blob
+  templates uint32[n_templates + 1] offsets + UTF-8 blob
+"""
+
+import array
+import bisect
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from collections.abc import Callable, Sequence
+
+from app.clients.interaction_records import render, templatize
+
+logger = logging.getLogger(__name__)
+
+INTERACTION_GRAPH_PATH = os.environ.get(
+    "INTERACTION_GRAPH_PATH",
+    os.path.join(
+        os.path.dirname(__file__), "..", "..", "drugbank-mcp-server", "data", "interaction_graph.bin",
+    ),
+)
+
+_MAGIC = b"PCIG"
+_VERSION = 2
+# magic, version, n_drugs, n_edges, n_templates, source version, then 9 section offsets
+_HEADER = struct.Struct("<4sIIII32s9Q")
+
+SEVERITY_CODES = {"unknown": 0, "minor": 1, "moderate": 2, "major": 3}
+_SEVERITIES = {code: label for label, code in SEVERITY_CODES.items()}
+
+
+class _Graph:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _parse(self) -> None:
+        magic, version, n_drugs, n_edges, n_templates, source, *offsets = (
+            _HEADER.unpack_from(self._mm)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"not an interaction graph v{_VERSION} file")
+        if sys.byteorder != "little":
+            raise ValueError("interaction graph requires a little-endian host")
+        ids, row_ptr, cols, edge_tmpl, tmpl_sev, name_off, name_blob, tmpl_off, tmpl_blob = offsets
+
+        buf = memoryview(self._mm)
+        u32 = lambda start, count: buf[start:start + 4 * count].cast("I")  # noqa: E731
+        self.ids = u32(ids, n_drugs)
+        self.row_ptr = u32(row_ptr, n_drugs + 1)
+        self.cols = u32(cols, n_edges)
+        self.edge_tmpl = u32(edge_tmpl, n_edges)
+        self.tmpl_sev = buf[tmpl_sev:tmpl_sev + n_templates]
+        self._name_off = u32(name_off, n_drugs + 1)
+        self._name_blob = name_blob
+        self._tmpl_off = u32(tmpl_off, n_templates + 1)
+        self._tmpl_blob = tmpl_blob
+        self.n_drugs, self.n_edges, self.n_templates = n_drugs, n_edges, n_templates
+        self.source = source.rstrip(b"\0").decode() or None
+
+    def close(self) -> None:
+        for view in (self.ids, self.row_ptr, self.cols, self.edge_tmpl, self.tmpl_sev,
+                     self._name_off, self._tmpl_off):
+            view.release()
+        self._mm.close()
+
+    def index(self, drugbank_id: str) -> int | None:
+        try:
+            number = int(drugbank_id[2:]) if drugbank_id[:2].upper() == "DB" else -1
+        except ValueError:
+            return None
+        i = bisect.bisect_left(self.ids, number)
+        return i if i < self.n_drugs and self.ids[i] == number else None
+
+    def drugbank_id(self, i: int) -> str:
+        return f"DB{self.ids[i]:05d}"
+
+    def name(self, i: int) -> str:
+        start, end = self._name_off[i], self._name_off[i + 1]
+        return self._mm[self._name_blob + start:self._name_blob + end].decode()
+
+    def edge(self, row: int, e: int) -> dict:
+        """Interaction entry for edge e of drug `row`, in drugbank_client's format."""
+        col = self.cols[e]
+        t = self.edge_tmpl[e]
+        start, end = self._tmpl_off[t], self._tmpl_off[t + 1]
+        template = self._mm[self._tmpl_blob + start:self._tmpl_blob + end].decode()
+        partner = self.name(col)
+        return {
+            "drug": partner,
+            "drugbank_id": self.drugbank_id(col),
+            "description": render(template, self.name(row), partner),
+            "severity": _SEVERITIES.get(self.tmpl_sev[t]) if self.tmpl_sev[t] else None,
+        }
+
+    def find_edge(self, row: int, col: int) -> int | None:
+        lo, hi = self.row_ptr[row], self.row_ptr[row + 1]
+        e = bisect.bisect_left(self.cols, col, lo, hi)
+        return e if e < hi and self.cols[e] == col else None
+
+
+class _Row(Sequence):
+    """A drug's interaction entries, decoded lazily from the mapped graph."""
+
+    def __init__(self, graph: _Graph, row: int):
+        self._graph = graph
+        self._row = row
+        self._start = graph.row_ptr[row]
+        self._len = graph.row_ptr[row + 1] - self._start
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        return self._graph.edge(self._row, self._start + i)
+
+
+_graph: _Graph | None = None
+# Version of the database being served; a graph built from another one is not used
+_expected_source: str | None = None
+
+
+def file_version(path: str) -> str | None:
+    """Version stamp of a data file (mtime and size), or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def expect_source(version: str | None) -> None:
+    """Use the graph only if it was built from this database version (None: any)."""
+    global _expected_source
+    if version != _expected_source:
+        _expected_source = version
+        _warn_if_stale()
+
+
+def load(path: str = INTERACTION_GRAPH_PATH) -> bool:
+    """Map the graph file read-only. Returns False (and keeps the current graph) if unavailable.
+
+    A graph already loaded is replaced, not closed: rows still being read
+    keep it mapped until they are garbage-collected.
+    """
+    global _graph
+    try:
+        graph = _Graph(path)
+    except FileNotFoundError:
+        logger.info("No interaction graph at %s — using MCP lookups", path)
+        return False
+    except Exception:
+        logger.warning("Failed to load interaction graph %s", path, exc_info=True)
+        return False
+    _graph = graph
+    logger.info(
+        "Interaction graph mapped: %d drugs, %d edges, %d templates",
+        graph.n_drugs, graph.n_edges, graph.n_templates,
+    )
+    _warn_if_stale()
+    return True
+
+
+def close() -> None:
+    global _graph
+    if _graph is not None:
+        _graph.close()
+        _graph = None
+
+
+def is_loaded() -> bool:
+    """True if a graph is mapped and built from the database being served."""
+    return _current() is not None
+
+
+def has(drugbank_id: str) -> bool:
+    """True if the drug is a node of the loaded graph."""
+    graph = _current()
+    return graph is not None and graph.index(drugbank_id) is not None
+
+
+def interactions(drugbank_id: str) -> Sequence[dict] | None:
+    """All interaction entries of a drug (lazy), or None if it is not in the graph."""
+    graph = _current()
+    if graph is None:
+        return None
+    row = graph.index(drugbank_id)
+    return None if row is None else _Row(graph, row)
+
+
+def find(drugbank_id: str, partner_id: str) -> dict | None:
+    """The entry for partner_id in drugbank_id's interaction list, if any."""
+    graph = _current()
+    if graph is None:
+        return None
+    row, col = graph.index(drugbank_id), graph.index(partner_id)
+    if row is None or col is None:
+        return None
+    e = graph.find_edge(row, col)
+    return None if e is None else graph.edge(row, e)
+
+
+def _current() -> _Graph | None:
+    if _graph is None or (_expected_source is not None and _graph.source != _expected_source):
+        return None
+    return _graph
+
+
+def _warn_if_stale() -> None:
+    if _graph is not None and _current() is None:
+        logger.warning(
+            "Interaction graph was built from database %s, serving %s — using MCP lookups",
+            _graph.source, _expected_source,
+        )
+
+
+def build(
+    db_path: str,
+    out_path: str,
+    classify: Callable[[str], str] | None = None,
+) -> dict:
+    """Build the graph file from drugbank.db.
+
+    classify, if given, assigns each template a severity label (it sees the
+    template with neutral drug names); otherwise codes are 0 and severity is
+    classified at request time as before. The database's file_version is
+    recorded in the header. Returns build statistics.
+    """
+    source = file_version(db_path) or ""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT drugbank_id, name, drug_interactions FROM drugs").fetchall()
+    finally:
+        conn.close()
+
+    names: dict[int, str] = {}
+    raw_edges: list[tuple[int, int, str]] = []
+    for drugbank_id, name, raw in rows:
+        subject = _id_number(drugbank_id)
+        if subject is None:
+            continue
+        names[subject] = name or drugbank_id
+        try:
+            entries = json.loads(raw) if raw else []
+        except json.JSONDecodeError:
+            entries = []
+        for entry in entries:
+            partner = _id_number(entry.get("drugbank_id") or "")
+            if partner is None or partner == subject:
+                continue
+            names.setdefault(partner, entry.get("name") or f"DB{partner:05d}")
+            raw_edges.append((subject, partner, entry.get("description") or ""))
+
+    ids = sorted(names)
+    index = {number: i for i, number in enumerate(ids)}
+    templates: dict[str, int] = {}
+    edges: dict[tuple[int, int], int] = {}
+    for subject, partner, description in raw_edges:
+        key = (index[subject], index[partner])
+        if key in edges:
+            continue
+        template = templatize(description, names[subject], names[partner])
+        edges[key] = templates.setdefault(template, len(templates))
+
+    row_ptr = array.array("I", [0] * (len(ids) + 1))
+    cols = array.array("I")
+    edge_tmpl = array.array("I")
+    for (row, col), t in sorted(edges.items()):
+        row_ptr[row + 1] += 1
+        cols.append(col)
+        edge_tmpl.append(t)
+    for i in range(len(ids)):
+        row_ptr[i + 1] += row_ptr[i]
+
+    template_list = list(templates)
+    tmpl_sev = bytes(
+        SEVERITY_CODES.get(classify(render(t, "Drug A", "Drug B")), 0) if classify else 0
+        for t in template_list
+    )
+    name_off, name_blob = _string_table([names[number] for number in ids])
+    tmpl_off, tmpl_blob = _string_table(template_list)
+
+    sections = [
+        array.array("I", ids).tobytes(), row_ptr.tobytes(), cols.tobytes(), edge_tmpl.tobytes(),
+        tmpl_sev, name_off, name_blob, tmpl_off, tmpl_blob,
+    ]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position += -position % 4
+        offsets.append(position)
+        position += len(section)
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(ids), len(cols), len(template_list), source.encode(), *offsets,
+        ))
+        for offset, section in zip(offsets, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, out_path)
+    return {"drugs": len(ids), "edges": len(cols), "templates": len(template_list)}
+
+
+def _id_number(drugbank_id: str) -> int | None:
+    if len(drugbank_id) == 7 and drugbank_id[:2] == "DB" and drugbank_id[2:].isdigit():
+        return int(drugbank_id[2:])
+    return None
+
+
+def _string_table(strings: list[str]) -> tuple[bytes, bytes]:
+    offsets = array.array("I", [0])
+    blob = bytearray()
+    for s in strings:
+        blob += s.encode()
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
@@ -0,0 +1,98 @@
+"""Compact interaction lists for the in-process caches.
+
+A drug's DrugBank interaction list is stored column-wise: a tuple of partner
+names, one of partner IDs and one of description templates, all interned.
+DrugBank descriptions differ mostly in the two drug names ("The risk or
+severity of bleeding can be increased when <subject> is combined with
+<partner>."), so with the names factored out a few thousand templates cover
+every entry. Entries are rendered back into {drug, drugbank_id, description}
+dicts on access.
+"""
+
+import sys
+from collections.abc import Sequence
+
+# Placeholders for the subject and partner drug names inside templates
+SUBJECT = "\x01"
+PARTNER = "\x02"
+
+
+def templatize(description: str, subject: str, partner: str) -> str:
+    """Replace the two drug names with placeholders (longer name first, in case one contains the other)."""
+    pairs = sorted([(subject, SUBJECT), (partner, PARTNER)], key=lambda p: -len(p[0]))
+    for name, placeholder in pairs:
+        if name:
+            description = description.replace(name, placeholder)
+    return description
+
+
+def render(template: str, subject: str, partner: str) -> str:
+    return template.replace(SUBJECT, subject).replace(PARTNER, partner)
+
+
+def _intern(value: object) -> object:
+    return sys.intern(value) if type(value) is str else value
+
+
+class InteractionList(Sequence):
+    """Interaction entries of one drug, stored as interned columns."""
+
+    __slots__ = ("subject", "_names", "_ids", "_templates")
+
+    def __init__(self, subject: str | None, records: list[dict]):
+        """records are DrugBank {name, drugbank_id, description} interaction records."""
+        self.subject = _intern(subject or "")
+        names, ids, templates = [], [], []
+        for record in records:
+            partner = record.get("name", "")
+            description = record.get("description")
+            names.append(_intern(partner))
+            ids.append(_intern(record.get("drugbank_id")))
+            templates.append(
+                _intern(templatize(description, self.subject, partner or ""))
+                if isinstance(description, str) else description
+            )
+        self._names = tuple(names)
+        self._ids = tuple(ids)
+        self._templates = tuple(templates)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        template = self._templates[i]
+        partner = self._names[i]
+        return {
+            "drug": partner,
+            "drugbank_id": self._ids[i],
+            "description": (
+                render(template, self.subject, partner or "") if template is not None else None
+            ),
+        }
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"InteractionList({self.subject!r}, {len(self)} entries)"
+
+    @property
+    def nbytes(self) -> int:
+        """Accounted size: the object and its columns plus each distinct string once.
+
+        Interned strings shared with other lists are counted in each of them,
+        which overestimates — the safe direction for a memory budget.
+        """
+        columns = (self._names, self._ids, self._templates)
+        strings = {id(s): s for column in columns for s in column if isinstance(s, str)}
+        return (
+            sys.getsizeof(self)
+            + sum(sys.getsizeof(column) for column in columns)
+            + sum(sys.getsizeof(s) for s in strings.values())
+        )
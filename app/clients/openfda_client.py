@@ -10,35 +10,35 @@ Docs: https://open.fda.gov/apis/drug/label/
 
 import logging
 import re
-import time
+from collections.abc import Awaitable, Callable
 from urllib.parse import quote
 
 import httpx
 
+from app.clients import peer_cache, ttl_cache
+
 logger = logging.getLogger(__name__)
 
 OPENFDA_BASE = "https://api.fda.gov/drug/label.json"
 
 # Sentinel to distinguish cache miss from cached empty string
-_CACHE_MISS = object()
+_CACHE_MISS = ttl_cache.MISS
 
-# Simple TTL cache: {key: (value, expiry_timestamp)}
-_cache: dict[str, tuple[object, float]] = {}
-_CACHE_TTL = 86400  # 24 hours
+_CACHE_TTL = 86400  # 24 hours, then served stale while refreshed in the background
+_cache = ttl_cache.TTLCache(
+    _CACHE_TTL,
+    hard_ttl=_CACHE_TTL + ttl_cache.CACHE_STALE_TTL,
+    jitter=ttl_cache.CACHE_TTL_JITTER,
+)
 
 
-def _cache_get(key: str) -> object:
-    """Return cached value or _CACHE_MISS sentinel."""
-    if key in _cache:
-        value, expiry = _cache[key]
-        if time.time() < expiry:
-            return value
-        del _cache[key]
-    return _CACHE_MISS
+def _cache_get(key: str, refresh: Callable[[], Awaitable[object]] | None = None) -> object:
+    """Return cached value or _CACHE_MISS sentinel; a stale value is refreshed in the background."""
+    return _cache.get(key, refresh=refresh)
 
 
 def _cache_set(key: str, value: object) -> None:
-    _cache[key] = (value, time.time() + _CACHE_TTL)
+    _cache.set(key, value)
 
 
 async def _fetch_label_text(drug_name: str) -> str | None:
@@ -48,33 +48,57 @@ async def _fetch_label_text(drug_name: str) -> str | None:
         Joined drug_interactions text (may be empty string if field absent),
         or None if the drug has no FDA label or a network error occurred.
     """
-    cache_key = f"openfda:label:{drug_name.lower()}"
-    cached = _cache_get(cache_key)
+    cached = _cache_get(_label_key(drug_name), lambda: _request_label_text(drug_name))
     if cached is not _CACHE_MISS:
         return cached  # type: ignore[return-value]
 
-    # Phrase-quote the name for OpenFDA's Elasticsearch syntax
-    quoted_name = f'"{quote(drug_name)}"'
-    url = f"{OPENFDA_BASE}?search=openfda.generic_name:{quoted_name}&limit=1"
+    shared = await peer_cache.lookup("openfda.label", drug_name)
+    if shared is not _CACHE_MISS:
+        return shared  # type: ignore[return-value]
 
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, timeout=10.0)
-            resp.raise_for_status()
-            data = resp.json()
+        return await _load_label_text(drug_name)
     except Exception as exc:
         logger.warning("OpenFDA request failed for %s: %s", drug_name, exc)
         return None
 
+
+def _label_key(drug_name: str) -> str:
+    return f"openfda:label:{drug_name.lower()}"
+
+
+async def _load_label_text(drug_name: str) -> str | None:
+    """Cached label text, fetched on a miss; raises on network errors (the peer-cache loader)."""
+    cached = _cache_get(_label_key(drug_name))
+    if cached is not _CACHE_MISS:
+        return cached  # type: ignore[return-value]
+    text = await _request_label_text(drug_name)
+    _cache_set(_label_key(drug_name), text)
+    return text
+
+
+async def _request_label_text(drug_name: str) -> str | None:
+    """Fetch the drug_interactions text from OpenFDA (uncached; raises on network errors)."""
+    # Phrase-quote the name for OpenFDA's Elasticsearch syntax
+    quoted_name = f'"{quote(drug_name)}"'
+    url = f"{OPENFDA_BASE}?search=openfda.generic_name:{quoted_name}&limit=1"
+
+    async with httpx.AsyncClient() as client:
+        resp = await client.get(url, timeout=10.0)
+        resp.raise_for_status()
+        data = resp.json()
+
     results = data.get("results", [])
     if not results:
-        _cache_set(cache_key, None)
         return None
 
     paragraphs = results[0].get("drug_interactions", [])
-    text = " ".join(paragraphs)  # array of strings → single searchable string
-    _cache_set(cache_key, text)
-    return text
+    return " ".join(paragraphs)  # array of strings → single searchable string
+
+
+async def warm_label(drug_name: str) -> None:
+    """Fetch drug_name's label into the cache ahead of a check_pair."""
+    await _fetch_label_text(drug_name)
 
 
 async def check_pair(drug_a: str, drug_b: str) -> dict | None:
@@ -100,3 +124,6 @@ async def check_pair(drug_a: str, drug_b: str) -> dict | None:
     description = extracted or f"Interaction with {drug_b} reported in FDA labeling."
 
     return {"drug": drug_b, "description": description}
+
+
+peer_cache.register("openfda.label", _load_label_text)
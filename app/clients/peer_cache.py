@@ -0,0 +1,172 @@
+"""Peer-to-peer cache sharing across API nodes, in the style of groupcache.
+
+Off unless CACHE_PEERS lists the base URLs of every node (this one
+included) and CACHE_SELF names this node. Each cache key is then owned by
+one node on a consistent-hash ring. A node that misses locally asks the
+owner (GET /internal/cache/{group}?key=...), and the owner answers from its
+own cache or loads the value from the backend once for the whole cluster,
+collapsing concurrent loads of one key. Values from peers are kept only in
+a small short-lived hot cache, so each value lives in one node's main
+cache. A peer that is down or slow is skipped and the value fetched
+locally.
+
+Clients register a group per cached function: a loader (the function
+itself) and, for values that are not plain JSON, an encoder and decoder.
+"""
+
+import asyncio
+import bisect
+import contextvars
+import hashlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+from app.clients import ttl_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PEERS = [p.strip().rstrip("/") for p in os.environ.get("CACHE_PEERS", "").split(",") if p.strip()]
+CACHE_SELF = os.environ.get("CACHE_SELF", "").strip().rstrip("/")
+PEER_CACHE_TIMEOUT = float(os.environ.get("PEER_CACHE_TIMEOUT", "1.0"))
+PEER_HOT_CACHE_TTL = float(os.environ.get("PEER_HOT_CACHE_TTL", "60"))
+PEER_HOT_CACHE_MAX_BYTES = int(float(os.environ.get("PEER_HOT_CACHE_MAX_MB", "8")) * 1024 * 1024)
+
+# Virtual points per node on the ring, for an even key spread
+_RING_REPLICAS = 100
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring: adding or removing a node only moves that node's keys."""
+
+    def __init__(self, nodes: list[str], replicas: int = _RING_REPLICAS):
+        points = sorted((_hash(f"{node}#{i}"), node) for node in set(nodes) for i in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> str | None:
+        if not self._nodes:
+            return None
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[i]
+
+
+def _identity(value: object) -> object:
+    return value
+
+
+@dataclass
+class _Group:
+    load: Callable[[str], Awaitable[object]]
+    encode: Callable[[object], object]
+    decode: Callable[[object], object]
+
+
+_groups: dict[str, _Group] = {}
+_ring = HashRing(CACHE_PEERS)
+_hot = ttl_cache.TTLCache(PEER_HOT_CACHE_TTL, max_bytes=PEER_HOT_CACHE_MAX_BYTES)
+_inflight: dict[str, asyncio.Future] = {}
+_client: httpx.AsyncClient | None = None
+
+# Set while answering a peer, so the owner's loaders never ask another peer
+_serving = contextvars.ContextVar("peer_cache_serving", default=False)
+
+
+def register(
+    group: str,
+    load: Callable[[str], Awaitable[object]],
+    encode: Callable[[object], object] = _identity,
+    decode: Callable[[object], object] = _identity,
+) -> None:
+    """Make `group` shareable: load(key) computes a value, encode/decode map it to and from JSON."""
+    _groups[group] = _Group(load, encode, decode)
+
+
+def is_registered(group: str) -> bool:
+    return group in _groups
+
+
+def enabled() -> bool:
+    return bool(CACHE_SELF) and len(set(CACHE_PEERS)) > 1
+
+
+def owner(group: str, key: str) -> str | None:
+    return _ring.owner(f"{group}/{key}")
+
+
+async def lookup(group: str, key: str) -> object:
+    """The value for key from its owning peer.
+
+    Returns ttl_cache.MISS when peering is off, this node owns the key, or
+    the owner failed — the caller then loads the value itself.
+    """
+    if not enabled() or _serving.get():
+        return ttl_cache.MISS
+    node = owner(group, key)
+    if node is None or node == CACHE_SELF:
+        return ttl_cache.MISS
+
+    ring_key = f"{group}/{key}"
+    hot = _hot.get(ring_key)
+    if hot is not ttl_cache.MISS:
+        return hot
+    try:
+        resp = await _http().get(
+            f"{node}/internal/cache/{group}",
+            params={"key": key},
+            headers=_headers(),
+            timeout=PEER_CACHE_TIMEOUT,
+        )
+        resp.raise_for_status()
+        value = _groups[group].decode(resp.json()["value"])
+    except Exception as exc:
+        logger.warning("Peer cache lookup of %s on %s failed: %s", ring_key, node, exc)
+        return ttl_cache.MISS
+    _hot.set(ring_key, value)
+    return value
+
+
+async def serve(group: str, key: str) -> object:
+    """Encoded value for a peer's request; concurrent requests for one key share a load.
+
+    Raises KeyError for an unregistered group; loader errors propagate.
+    """
+    spec = _groups[group]
+    ring_key = f"{group}/{key}"
+    future = _inflight.get(ring_key)
+    if future is None:
+        future = asyncio.ensure_future(_load(spec, key))
+        _inflight[ring_key] = future
+        future.add_done_callback(lambda _: _inflight.pop(ring_key, None))
+    return spec.encode(await asyncio.shield(future))
+
+
+async def _load(spec: _Group, key: str) -> object:
+    _serving.set(True)  # runs in its own task, so this stays local to the load
+    return await spec.load(key)
+
+
+def _headers() -> dict[str, str]:
+    api_key = os.environ.get("API_KEY", "")
+    return {"X-API-Key": api_key} if api_key else {}
+
+
+def _http() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient()
+    return _client
+
+
+async def close() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -4,29 +4,29 @@ Free, no API key required. Rate limit: 20 req/sec.
 Docs: https://lhncbc.nlm.nih.gov/RxNav/APIs/RxNormAPIs.html
 """
 
-import time
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
 
 import httpx
 
+from app.clients import peer_cache, ttl_cache
+
 RXNORM_BASE = "https://rxnav.nlm.nih.gov/REST"
 
-# Simple TTL cache: {key: (value, expiry_timestamp)}
-_cache: dict[str, tuple[object, float]] = {}
-_CACHE_TTL = 86400  # 24 hours
+_CACHE_TTL = 86400  # 24 hours, then served stale while refreshed in the background
+_cache = ttl_cache.TTLCache(
+    _CACHE_TTL,
+    hard_ttl=_CACHE_TTL + ttl_cache.CACHE_STALE_TTL,
+    jitter=ttl_cache.CACHE_TTL_JITTER,
+)
 
 
-def _cache_get(key: str) -> object | None:
-    if key in _cache:
-        value, expiry = _cache[key]
-        if time.time() < expiry:
-            return value
-        del _cache[key]
-    return None
+def _cache_get(key: str, refresh: Callable[[], Awaitable[object]] | None = None) -> object | None:
+    return _cache.get(key, None, refresh)
 
 
 def _cache_set(key: str, value: object) -> None:
-    _cache[key] = (value, time.time() + _CACHE_TTL)
+    _cache.set(key, value)
 
 
 @dataclass
@@ -44,10 +44,20 @@ async def get_rxcui(name: str) -> str | None:
     Returns the RxCUI string or None if not found.
     """
     cache_key = f"rxcui:{name.lower()}"
-    cached = _cache_get(cache_key)
+    cached = _cache_get(cache_key, lambda: _fetch_rxcui(name))
     if cached is not None:
         return cached
 
+    shared = await peer_cache.lookup("rxnorm.rxcui", name)
+    if shared is not ttl_cache.MISS:
+        return shared
+
+    result = await _fetch_rxcui(name)
+    _cache_set(cache_key, result)
+    return result
+
+
+async def _fetch_rxcui(name: str) -> str | None:
     async with httpx.AsyncClient() as client:
         resp = await client.get(
             f"{RXNORM_BASE}/rxcui.json",
@@ -58,9 +68,7 @@ async def get_rxcui(name: str) -> str | None:
 
     group = data.get("idGroup", {})
     rxcui_list = group.get("rxnormId")
-    result = rxcui_list[0] if rxcui_list else None
-    _cache_set(cache_key, result)
-    return result
+    return rxcui_list[0] if rxcui_list else None
 
 
 async def approximate_term(term: str) -> list[DrugInfo]:
@@ -69,10 +77,20 @@ async def approximate_term(term: str) -> list[DrugInfo]:
     Returns a list of DrugInfo candidates, best match first.
     """
     cache_key = f"approx:{term.lower()}"
-    cached = _cache_get(cache_key)
+    cached = _cache_get(cache_key, lambda: _fetch_approximate_term(term))
     if cached is not None:
         return cached
 
+    shared = await peer_cache.lookup("rxnorm.approx", term)
+    if shared is not ttl_cache.MISS:
+        return shared
+
+    results = await _fetch_approximate_term(term)
+    _cache_set(cache_key, results)
+    return results
+
+
+async def _fetch_approximate_term(term: str) -> list[DrugInfo]:
     async with httpx.AsyncClient() as client:
         resp = await client.get(
             f"{RXNORM_BASE}/approximateTerm.json",
@@ -89,17 +107,26 @@ async def approximate_term(term: str) -> list[DrugInfo]:
             name=c.get("name", ""),
             score=float(c.get("score", "0")),
         ))
-    _cache_set(cache_key, results)
     return results
 
 
 async def search_by_name(name: str) -> list[DrugInfo]:
     """Search RxNorm drugs by name. Returns matching concepts."""
     cache_key = f"search:{name.lower()}"
-    cached = _cache_get(cache_key)
+    cached = _cache_get(cache_key, lambda: _fetch_search_by_name(name))
     if cached is not None:
         return cached
 
+    shared = await peer_cache.lookup("rxnorm.search", name)
+    if shared is not ttl_cache.MISS:
+        return shared
+
+    results = await _fetch_search_by_name(name)
+    _cache_set(cache_key, results)
+    return results
+
+
+async def _fetch_search_by_name(name: str) -> list[DrugInfo]:
     async with httpx.AsyncClient() as client:
         resp = await client.get(
             f"{RXNORM_BASE}/drugs.json",
@@ -118,7 +145,6 @@ async def search_by_name(name: str) -> list[DrugInfo]:
                 synonym=prop.get("synonym", None),
                 tty=prop.get("tty", None),
             ))
-    _cache_set(cache_key, results)
     return results
 
 
@@ -128,10 +154,20 @@ async def get_drug_details(rxcui: str) -> dict | None:
     Returns the raw properties dict from RxNorm.
     """
     cache_key = f"details:{rxcui}"
-    cached = _cache_get(cache_key)
+    cached = _cache_get(cache_key, lambda: _fetch_drug_details(rxcui))
     if cached is not None:
         return cached
 
+    shared = await peer_cache.lookup("rxnorm.details", rxcui)
+    if shared is not ttl_cache.MISS:
+        return shared
+
+    props = await _fetch_drug_details(rxcui)
+    _cache_set(cache_key, props)
+    return props
+
+
+async def _fetch_drug_details(rxcui: str) -> dict | None:
     async with httpx.AsyncClient() as client:
         resp = await client.get(
             f"{RXNORM_BASE}/rxcui/{rxcui}/properties.json",
@@ -140,5 +176,18 @@ async def get_drug_details(rxcui: str) -> dict | None:
         data = resp.json()
 
     props = data.get("properties", None)
-    _cache_set(cache_key, props)
     return props
+
+
+def _encode_drug_infos(infos: list[DrugInfo]) -> list[dict]:
+    return [asdict(info) for info in infos]
+
+
+def _decode_drug_infos(records: list[dict]) -> list[DrugInfo]:
+    return [DrugInfo(**record) for record in records]
+
+
+peer_cache.register("rxnorm.rxcui", get_rxcui)
+peer_cache.register("rxnorm.approx", approximate_term, _encode_drug_infos, _decode_drug_infos)
+peer_cache.register("rxnorm.search", search_by_name, _encode_drug_infos, _decode_drug_infos)
+peer_cache.register("rxnorm.details", get_drug_details)
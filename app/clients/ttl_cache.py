@@ -0,0 +1,161 @@
+"""In-process TTL cache with stale-while-revalidate and an optional byte budget.
+
+Entries are fresh for `ttl` seconds (shortened per entry by up to `jitter`
+of the TTL, so entries written together do not all expire together). Until
+`hard_ttl` a stale entry is still served, and a `get` that passes a refresh
+coroutine function starts one background refresh for it. With `max_bytes`
+set, every entry's accounted size (approx_size of key + value) is tracked
+and the least recently used entries are evicted once the total exceeds the
+budget. Entries can be tagged (e.g. with the data version they came
+from) and a whole tag invalidated at once.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the client caches: seconds past the TTL a stale entry may be
+# served while it refreshes, and the fraction of the TTL shaved off at random
+CACHE_STALE_TTL = float(os.environ.get("CACHE_STALE_TTL", "21600"))  # 6 hours
+CACHE_TTL_JITTER = float(os.environ.get("CACHE_TTL_JITTER", "0.1"))
+
+MISS = object()  # sentinel to distinguish cache miss from cached None
+
+
+def approx_size(value: object) -> int:
+    """Approximate deep size in bytes.
+
+    Objects exposing an integer `nbytes` (compact records) report their own
+    size; builtin containers are walked recursively.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approx_size(v) for v in value)
+    return size
+
+
+class TTLCache:
+    """{key: value} with soft/hard expiry, background refresh and LRU eviction by accounted bytes."""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int | None = None,
+        hard_ttl: float | None = None,
+        jitter: float = 0.0,
+        tagger: Callable[[], object] | None = None,
+    ):
+        """tagger, if given, is called on every set and its result tags the entry."""
+        self.ttl = ttl
+        self.hard_ttl = max(ttl, hard_ttl) if hard_ttl is not None else ttl
+        self.jitter = jitter
+        self.tagger = tagger
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # {key: (value, soft_expiry, hard_expiry, size, tag)}
+        self._entries: OrderedDict[str, tuple[object, float, float, int, object]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def get(
+        self,
+        key: str,
+        default: object = MISS,
+        refresh: Callable[[], Awaitable[object]] | None = None,
+    ) -> object:
+        """Cached value, stale or not, until its hard expiry.
+
+        refresh, if given, is awaited in the background (once per key at a
+        time) when the entry is stale, and its result replaces the entry. A
+        failed refresh keeps serving the stale value.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, soft_expiry, hard_expiry, _, _ = entry
+        now = time.time()
+        if now >= hard_expiry:
+            self._discard(key)
+            return default
+        self._entries.move_to_end(key)
+        if now >= soft_expiry and refresh is not None:
+            self._schedule_refresh(key, refresh)
+        return value
+
+    def set(self, key: str, value: object) -> None:
+        self._discard(key)
+        size = sys.getsizeof(key) + approx_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # larger than the whole budget — not worth caching
+        now = time.time()
+        ttl = self.ttl * (1 - random.uniform(0, self.jitter)) if self.jitter else self.ttl
+        tag = self.tagger() if self.tagger is not None else None
+        self._entries[key] = (value, now + ttl, now + self.hard_ttl, size, tag)
+        self.nbytes += size
+        while self.max_bytes is not None and self.nbytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def delete(self, key: str) -> bool:
+        """Drop key (and any pending refresh of it); returns whether it was cached."""
+        found = key in self._entries
+        self._discard(key)
+        task = self._refreshing.pop(key, None)
+        if task is not None:
+            task.cancel()
+        return found
+
+    def invalidate_tag(self, tag: object) -> int:
+        """Drop every entry tagged `tag`; returns how many were dropped."""
+        keys = [key for key, entry in self._entries.items() if entry[4] == tag]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not MISS
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[3]
+
+    def _schedule_refresh(self, key: str, refresh: Callable[[], Awaitable[object]]) -> None:
+        if key in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop to refresh on — served stale until a caller refetches
+        self._refreshing[key] = loop.create_task(self._refresh(key, refresh))
+
+    async def _refresh(self, key: str, refresh: Callable[[], Awaitable[object]]) -> None:
+        try:
+            self.set(key, await refresh())
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Background refresh of %s failed: %s", key, exc)
+        finally:
+            if self._refreshing.get(key) is asyncio.current_task():
+                del self._refreshing[key]
@@ -6,27 +6,45 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.analyze import router as analyze_router
 from app.api.health import router as health_router
+from app.api.internal import router as internal_router
 from app.api.interactions import router as interactions_router
-from app.clients import drugbank_client
+from app.api.live_scan import router as live_scan_router
+from app.api.regimens import router as regimens_router
+from app.api.scan import router as scan_router
+from app import profile
+from app.clients import drugbank_client, interaction_graph, peer_cache
 from app.middleware.api_key import APIKeyMiddleware
+from app.middleware.degradation import DegradationMiddleware
 from app.nlp import ner_model, severity_classifier
+from app.services import cache_warmer, overload
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Loading NER model...")
-    ner_model.load_model()
-    logger.info("NER model loaded.")
-    logger.info("Loading severity classifier...")
-    severity_classifier.load_model()
-    logger.info("Severity classifier loaded: %s", severity_classifier.is_loaded())
+    if profile.is_lite():
+        logger.info("Lite profile: no NER or zero-shot severity model")
+        severity_classifier.load_model(zero_shot=False)
+    else:
+        logger.info("Loading NER model...")
+        ner_model.load_model()
+        logger.info("NER model loaded.")
+        logger.info("Loading severity classifier...")
+        severity_classifier.load_model()
+        logger.info("Severity classifier loaded: %s", severity_classifier.is_loaded())
     logger.info("Connecting to DrugBank MCP server...")
     await drugbank_client.connect()
     logger.info("DrugBank MCP connected: %s", await drugbank_client.health_check())
+    logger.info("Interaction graph mapped: %s", interaction_graph.load())
+    await cache_warmer.start()
+    await overload.start()
     yield
+    await overload.stop()
+    await cache_warmer.stop()
     await drugbank_client.close()
+    await peer_cache.close()
+    interaction_graph.close()
 
 
 app = FastAPI(
@@ -45,12 +63,18 @@ app.add_middleware(
         "http://localhost:5173",
         "http://localhost:3000",
     ],
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "X-API-Key"],
+    expose_headers=["X-Degradation-Level"],
 )
 
 app.add_middleware(APIKeyMiddleware)
+app.add_middleware(DegradationMiddleware)
 
 app.include_router(health_router)
 app.include_router(analyze_router)
-app.include_router(interactions_router)
\ No newline at end of file
+app.include_router(interactions_router)
+app.include_router(scan_router)
+app.include_router(live_scan_router)
+app.include_router(regimens_router)
+app.include_router(internal_router)
\ No newline at end of file
@@ -10,18 +10,21 @@ from starlette.middleware.base import BaseHTTPMiddleware
 PUBLIC_PATHS = {"/health", "/health/data", "/openapi.json", "/docs", "/redoc"}
 
 
+def is_authorized(provided_key: str) -> bool:
+    """True if no key is configured or provided_key matches it."""
+    api_key = os.environ.get("API_KEY", "")
+    return not api_key or provided_key == api_key
+
+
 class APIKeyMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        api_key = os.environ.get("API_KEY", "")
-        if not api_key:
-            # No key configured — auth disabled
-            return await call_next(request)
+    """Checks HTTP requests; WebSocket endpoints call is_authorized themselves."""
 
+    async def dispatch(self, request: Request, call_next):
         if request.url.path in PUBLIC_PATHS:
             return await call_next(request)
 
         provided_key = request.headers.get("X-API-Key", "")
-        if provided_key != api_key:
+        if not is_authorized(provided_key):
             return JSONResponse(
                 status_code=401,
                 content={"detail": "Invalid or missing API key"},
@@ -0,0 +1,16 @@
+"""Degradation level middleware."""
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.services import overload
+
+
+class DegradationMiddleware(BaseHTTPMiddleware):
+    """Pins the overload level for each HTTP request and reports it in X-Degradation-Level."""
+
+    async def dispatch(self, request: Request, call_next):
+        level = overload.pin()
+        response = await call_next(request)
+        response.headers["X-Degradation-Level"] = str(level)
+        return response
@@ -0,0 +1,197 @@
+"""Dictionary matcher for drug names — an Aho-Corasick automaton over the alias index.
+
+Built from drugbank_client's {normalized alias: DrugBank ID} index (names,
+synonyms, salts and product names; aliases claimed by two drugs are already
+left out). Text is normalized the same way as the aliases, keeping the
+offset of every character, and scanned once. Only whole words match, and
+overlapping matches resolve to the leftmost, then longest, one. Excipients
+and everyday words that DrugBank lists as drugs (_STOPLIST) never match.
+
+Since matches are word-bounded, the automaton runs over words rather than
+characters: each word of an alias is interned to an integer, so a trie node
+is a word prefix of some alias (about 1.5 per alias rather than one per
+character). The nodes are held in flat arrays, numbered by depth and then
+in order of their word IDs, so the children of a node are a contiguous,
+sorted run: first[node] is where the run starts, words[child] is the word
+leading to a child, and a transition is a binary search.
+"""
+
+import array
+import bisect
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from itertools import accumulate, repeat
+from operator import itemgetter
+
+# Shorter aliases ("tab", "eye") match ordinary words too often
+_MIN_ALIAS_LENGTH = 4
+
+# DrugBank entries found on packaging as excipients, allergen warnings or
+# plain words; a match on them would pass for a drug and skip NER
+_STOPLIST = frozenset({
+    "alcohol", "beeswax", "carbon", "cellulose", "citric acid", "corn starch", "dextrose",
+    "ethanol", "gelatin", "gelatine", "glucose", "gluten", "glycerin", "glycerine",
+    "glycerol", "honey", "iron oxide", "lactose", "lanolin", "lecithin", "maize starch",
+    "mannitol", "milk", "nitrogen", "oxygen", "paraffin", "peanut", "povidone", "rice",
+    "shellac", "silica", "sodium chloride", "sorbitol", "soya", "starch", "stearic acid",
+    "sucralose", "sucrose", "sugar", "talc", "titanium dioxide", "water", "wheat",
+    "xylitol", "yeast",
+})
+
+
+@dataclass
+class Match:
+    text: str          # as written in the scanned text
+    drugbank_id: str
+    start: int
+    end: int
+
+
+class Gazetteer:
+    def __init__(self, aliases: dict[str, str]):
+        keep = [
+            alias for alias in aliases
+            if len(alias) >= _MIN_ALIAS_LENGTH
+            and not alias.replace(" ", "").isdigit()
+            and alias not in _STOPLIST
+        ]
+        self._vocab: dict[str, int] = {}
+        sequences = [
+            tuple(self._vocab.setdefault(word, len(self._vocab)) for word in alias.split(" "))
+            for alias in keep
+        ]
+        self._ids = sorted({aliases[alias] for alias in keep})
+        id_index = {drugbank_id: i for i, drugbank_id in enumerate(self._ids)}
+
+        self._words, self._first, parents, ends = self._build_trie(sequences)
+        n = len(self._words)
+        self._hit_length = array.array("H", bytes(2 * n))  # in words; 0: no alias ends here
+        self._hit_id = array.array("I", bytes(4 * n))
+        for alias, sequence in zip(keep, sequences):
+            node = ends[sequence]
+            self._hit_length[node] = len(sequence)
+            self._hit_id[node] = id_index[aliases[alias]]
+        self._fail, self._link = self._build_links(parents)
+
+    def __len__(self) -> int:
+        return sum(length > 0 for length in self._hit_length)
+
+    def find(self, text: str) -> list[Match]:
+        """Whole-word alias matches in text, in order, without overlaps."""
+        normalized, origin = _normalize(text)
+        fail, link, hit_length = self._fail, self._link, self._hit_length
+        hits = []  # (start, end, DrugBank ID) in normalized
+        starts = []  # start of each word in normalized
+        position = 0
+        node = 0
+        for i, word in enumerate(normalized.split(" ") if normalized else ()):
+            starts.append(position)
+            position += len(word) + 1
+            code = self._vocab.get(word)
+            if code is None:
+                node = 0
+                continue
+            following = self._goto(node, code)
+            while following < 0 and node:
+                node = fail[node]
+                following = self._goto(node, code)
+            node = max(following, 0)
+            match = node if hit_length[node] else link[node]
+            while match:
+                hits.append((
+                    starts[i + 1 - hit_length[match]], position - 1,
+                    self._ids[self._hit_id[match]],
+                ))
+                match = link[match]
+
+        matches = []
+        last_end = 0
+        for start, end, drugbank_id in sorted(hits, key=lambda h: (h[0], -h[1])):
+            if start < last_end:
+                continue
+            first, last = origin[start], origin[end - 1] + 1
+            matches.append(Match(text[first:last], drugbank_id, first, last))
+            last_end = end
+        return matches
+
+    def _goto(self, node: int, code: int) -> int:
+        """Child of node along word code, or -1."""
+        lo, hi = self._first[node], self._first[node + 1]
+        child = bisect.bisect_left(self._words, code, lo, hi)
+        return child if child < hi and self._words[child] == code else -1
+
+    @staticmethod
+    def _build_trie(
+        sequences: list[tuple[int, ...]],
+    ) -> tuple[array.array, array.array, array.array, dict[tuple[int, ...], int]]:
+        """words, first and parent arrays of the trie, and the node each sequence ends at.
+
+        Nodes are the distinct word prefixes, numbered by length and then in
+        sorted order, so each parent's children form a sorted run.
+        """
+        words = array.array("I", [0])
+        parents = array.array("I", [0])
+        ends: dict[tuple[int, ...], int] = {}
+        level: dict[tuple[int, ...], int] = {(): 0}  # prefix → node, for the previous depth
+        # Longest first, so the sequences reaching a depth are a leading slice
+        by_length = sorted(set(sequences), key=len, reverse=True)
+        lengths = [-len(sequence) for sequence in by_length]
+        depth = 0
+        while by_length and len(by_length[0]) > depth:
+            depth += 1
+            reaching = bisect.bisect_right(lengths, -depth)
+            prefixes = sorted(set(map(itemgetter(slice(depth)), by_length[:reaching])))
+            start = len(words)
+            parents.extend(map(level.__getitem__, map(itemgetter(slice(-1)), prefixes)))
+            words.extend(map(itemgetter(-1), prefixes))
+            level = dict(zip(prefixes, range(start, start + len(prefixes))))
+            done = by_length[bisect.bisect_left(lengths, -depth):reaching]
+            ends.update(zip(done, map(level.__getitem__, done)))
+        children = Counter(parents[1:])
+        counts = map(children.get, range(len(words)), repeat(0))
+        first = array.array("I", accumulate(counts, initial=1))
+        return words, first, parents, ends
+
+    def _build_links(self, parents: array.array) -> tuple[array.array, array.array]:
+        """Failure links, and links to the nearest suffix node with a hit (breadth first)."""
+        words, first, hit_length = self._words, self._first, self._hit_length
+        n = len(words)
+        fail = array.array("I", bytes(4 * n))
+        link = array.array("I", bytes(4 * n))
+        for node in range(first[1], n):  # depth-1 nodes fail to the root
+            code = words[node]
+            fallback = fail[parents[node]]
+            while True:
+                lo, hi = first[fallback], first[fallback + 1]
+                target = bisect.bisect_left(words, code, lo, hi)
+                if target < hi and words[target] == code:
+                    break
+                if not fallback:
+                    target = 0
+                    break
+                fallback = fail[fallback]
+            fail[node] = target
+            link[node] = target if hit_length[target] else link[target]
+        return fail, link
+
+
+def _normalize(text: str) -> tuple[str, list[int]]:
+    """drug_aliases.normalize(text), plus the index in text of every character kept."""
+    chars: list[str] = []
+    origin: list[int] = []
+    for i, c in enumerate(text):
+        for part in unicodedata.normalize("NFKD", c):
+            if unicodedata.combining(part):
+                continue
+            for folded in part.casefold():
+                if folded.isalnum():
+                    chars.append(folded)
+                    origin.append(i)
+                elif chars and chars[-1] != " ":
+                    chars.append(" ")
+                    origin.append(i)
+    if chars and chars[-1] == " ":
+        chars.pop()
+        origin.pop()
+    return "".join(chars), origin
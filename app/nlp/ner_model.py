@@ -1,14 +1,27 @@
 """OpenMed PharmaDetect NER model wrapper.
 
 Loads the model once at startup and exposes a predict() function
-that extracts drug/chemical entities from text.
+that extracts drug/chemical entities from text. Lines that cannot hold a
+drug name are dropped first (see ocr_filter). Texts still longer than
+NER_WINDOW_TOKENS are split into overlapping windows that run through the
+model as one batch; each window keeps the tokens nearest its middle, so
+every token is labelled once, with context on both sides.
+
+transformers is imported by load_model() only, so the lite profile never
+pulls it (or torch) in.
 """
 
+import os
 from dataclasses import dataclass
 
-from transformers import pipeline
+from app.nlp import ocr_filter
 
 MODEL_ID = "OpenMed/OpenMed-NER-PharmaDetect-ModernClinical-149M"
+# Texts per forward pass in predict_batch
+NER_BATCH_SIZE = int(os.environ.get("NER_BATCH_SIZE", "8"))
+# Tokens per window for long texts, and tokens between window starts
+NER_WINDOW_TOKENS = int(os.environ.get("NER_WINDOW_TOKENS", "256"))
+NER_WINDOW_STRIDE = int(os.environ.get("NER_WINDOW_STRIDE", "192"))
 
 _ner_pipeline = None
 
@@ -25,6 +38,8 @@ class Entity:
 def load_model() -> None:
     """Load the NER pipeline into memory. Call once at app startup."""
     global _ner_pipeline
+    from transformers import pipeline
+
     _ner_pipeline = pipeline(
         "ner",
         model=MODEL_ID,
@@ -47,7 +62,80 @@ def predict(text: str) -> list[Entity]:
     if _ner_pipeline is None:
         raise RuntimeError("NER model not loaded — call load_model() first")
 
-    raw = _ner_pipeline(text)
+    return _predict([text])[0]
+
+
+def predict_batch(texts: list[str]) -> list[list[Entity]]:
+    """predict() for several texts, run through the model NER_BATCH_SIZE windows at a time."""
+    if _ner_pipeline is None:
+        raise RuntimeError("NER model not loaded — call load_model() first")
+    if not texts:
+        return []
+
+    return _predict(texts)
+
+
+def _predict(texts: list[str]) -> list[list[Entity]]:
+    """Entities per text, from one pipeline call over the windows of all filtered texts."""
+    filtered = [ocr_filter.prefilter(text) for text in texts]
+    windows = [_windows(f.text) for f in filtered]
+    chunks = [
+        f.text[start:end] for f, spans in zip(filtered, windows) for start, end, _, _ in spans
+    ]
+    raw = iter(_ner_pipeline(chunks, batch_size=NER_BATCH_SIZE) if chunks else [])
+
+    results = []
+    for text, f, spans in zip(texts, filtered, windows):
+        # Shift each window's tokens to offsets in the filtered text, keeping those it owns
+        tokens = []
+        for start, _, keep_from, keep_to in spans:
+            for item in next(raw):
+                item_start = item["start"] + start
+                if keep_from <= item_start < keep_to:
+                    tokens.append({**item, "start": item_start, "end": item["end"] + start})
+        results.append([_to_original(text, f, entity) for entity in _merge(f.text, tokens)])
+    return results
+
+
+def _to_original(text: str, filtered: ocr_filter.Filtered, entity: Entity) -> Entity:
+    start, end = filtered.original_span(entity.start, entity.end)
+    return Entity(
+        text=text[start:end].strip(), label=entity.label, score=entity.score, start=start, end=end,
+    )
+
+
+def _windows(text: str) -> list[tuple[int, int, int, int]]:
+    """Character spans of text's windows: (start, end, keep_from, keep_to); none for blank text.
+
+    Consecutive windows overlap by NER_WINDOW_TOKENS - NER_WINDOW_STRIDE
+    tokens; tokens starting in [keep_from, keep_to) belong to the window,
+    with the cut in the middle of each overlap.
+    """
+    if not text.strip():
+        return []
+    offsets = _ner_pipeline.tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True,
+    )["offset_mapping"]
+    size = max(1, NER_WINDOW_TOKENS)
+    if len(offsets) <= size:
+        return [(0, len(text), 0, len(text) + 1)]
+
+    stride = max(1, min(NER_WINDOW_STRIDE, size))
+    firsts = range(0, len(offsets) - size + stride, stride)
+    spans = []
+    for i, first in enumerate(firsts):
+        last = min(first + size, len(offsets)) - 1
+        keep_from = spans[-1][3] if spans else 0
+        if i + 1 < len(firsts):
+            keep_to = offsets[(firsts[i + 1] + last + 1) // 2][0]
+        else:
+            keep_to = len(text) + 1
+        spans.append((offsets[first][0], offsets[last][1], keep_from, keep_to))
+    return spans
+
+
+def _merge(text: str, raw: list[dict]) -> list[Entity]:
+    """Entities from the pipeline's per-token output for text."""
     if not raw:
         return []
 
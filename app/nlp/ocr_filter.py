@@ -0,0 +1,91 @@
+"""OCR pre-filter — drops packaging boilerplate before NER.
+
+Much of a box's text cannot hold a drug name: batch and expiry lines,
+barcodes, licence numbers, addresses, storage and legal notices. Each
+line is scored by the share of its visible characters that belong to
+candidate words (three or more letters, not in a boilerplate lexicon);
+lines below NER_PREFILTER_MIN_SCORE are dropped, and long digit runs
+(barcodes, serials) are cut from the lines kept. The filtered text is
+made of slices of the original, so offsets map back exactly.
+"""
+
+import bisect
+import os
+import re
+from dataclasses import dataclass, field
+
+# Share of a line's visible characters in candidate words needed to keep
+# it (0 disables the filter)
+NER_PREFILTER_MIN_SCORE = float(os.environ.get("NER_PREFILTER_MIN_SCORE", "0.25"))
+
+# Words common on packaging that are never drug names
+_LEXICON = frozenset("""
+    and are all any before below above batch best broken by children com
+    contents corp dispose distributed does dry enclosed exp expires expiry
+    for from gmbh gtin http https inc insert keep leaflet light limited llc
+    lot ltd made manufactured manufacturer marketed mfd mfg moisture ndc net
+    not only out package place plc pharmacist product protect reach read
+    registered reserved rights road seal see serial sight store street the
+    this trademark use www with
+""".split())
+
+_WORD = re.compile(r"[^\W\d_]+")
+_DIGIT_RUN = re.compile(r"\b\d{6,}\b")
+
+
+@dataclass
+class Filtered:
+    """Filtered text, and where each of its slices starts in the original."""
+
+    text: str
+    # (start in text, start in the original) per slice, in order
+    slices: list[tuple[int, int]] = field(default_factory=list)
+
+    def original_span(self, start: int, end: int) -> tuple[int, int]:
+        """Original offsets of text[start:end]."""
+        return self._original(start), self._original(max(start, end - 1)) + (end > start)
+
+    def _original(self, position: int) -> int:
+        i = max(bisect.bisect_right(self.slices, (position, float("inf"))) - 1, 0)
+        filtered_start, original_start = self.slices[i]
+        return original_start + position - filtered_start
+
+
+def score(line: str) -> float:
+    """Share of the line's non-space characters in candidate words."""
+    visible = sum(not c.isspace() for c in line)
+    if not visible:
+        return 0.0
+    candidate = sum(
+        len(word) for word in _WORD.findall(line)
+        if len(word) >= 3 and word.casefold() not in _LEXICON
+    )
+    return candidate / visible
+
+
+def prefilter(text: str) -> Filtered:
+    """text without the lines that cannot contain a drug name, and without long digit runs."""
+    if NER_PREFILTER_MIN_SCORE <= 0:
+        return Filtered(text, [(0, 0)])
+
+    parts: list[str] = []
+    slices: list[tuple[int, int]] = []
+    length = 0
+
+    def keep(start: int, end: int) -> None:
+        nonlocal length
+        if end > start:
+            slices.append((length, start))
+            parts.append(text[start:end])
+            length += end - start
+
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if score(line) >= NER_PREFILTER_MIN_SCORE:
+            position = offset
+            for run in _DIGIT_RUN.finditer(line):
+                keep(position, offset + run.start())
+                position = offset + run.end()
+            keep(position, offset + len(line))
+        offset += len(line)
+    return Filtered("".join(parts), slices)
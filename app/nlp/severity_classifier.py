@@ -1,19 +1,27 @@
 """Zero-shot severity classifier for drug interaction descriptions.
 
-Uses DeBERTa-v3-base-mnli for zero-shot classification.
-Falls back to regex if the model is not loaded.
+Uses DeBERTa-v3-base-mnli for zero-shot classification, behind the fast
+hashed n-gram tier (severity_tier) when its artifact is present: only
+descriptions the tier is unsure of (top-class margin below
+SEVERITY_TIER_MARGIN) reach the full model.
+Falls back to regex if neither is loaded. transformers is imported only
+when the zero-shot model is loaded.
 """
 
 import logging
+import os
 import re
 
-from transformers import pipeline as hf_pipeline
+from app.nlp import severity_tier
 
 logger = logging.getLogger(__name__)
 
 MODEL_ID = "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli"
+# Fast-tier answers with a smaller probability margin are escalated to the full model
+SEVERITY_TIER_MARGIN = float(os.environ.get("SEVERITY_TIER_MARGIN", "0.3"))
 
 _classifier = None
+_stats = {"fast": 0, "escalated": 0}
 
 _CANDIDATE_LABELS = [
     "critical dangerous interaction",
@@ -35,10 +43,18 @@ _RX_WARNING = re.compile(
 )
 
 
-def load_model() -> None:
-    """Load the zero-shot classification pipeline. Call once at app startup."""
+def load_model(zero_shot: bool = True) -> None:
+    """Load the fast tier and, unless zero_shot is False, the zero-shot pipeline.
+
+    Call once at app startup.
+    """
     global _classifier
+    severity_tier.load()
+    if not zero_shot:
+        return
     try:
+        from transformers import pipeline as hf_pipeline
+
         _classifier = hf_pipeline(
             "zero-shot-classification",
             model=MODEL_ID,
@@ -57,27 +73,50 @@ def is_loaded() -> bool:
     return _classifier is not None
 
 
-def classify(description: str | None) -> str:
+def classify(description: str | None, full_model: bool = True) -> str:
     """Classify an interaction description into major/moderate/minor.
 
-    Returns 'unknown' if description is empty or None.
+    Returns 'unknown' if description is empty or None. With full_model
+    False (under overload) the zero-shot model is never used.
     """
     if not description:
         return "unknown"
 
-    if _classifier is None:
+    classifier = _classifier if full_model else None
+    fast = severity_tier.predict(description)
+    if fast is not None and (fast[1] >= SEVERITY_TIER_MARGIN or classifier is None):
+        _stats["fast"] += 1
+        return fast[0]
+
+    if classifier is None:
         logger.debug("Severity model not loaded, using regex fallback")
         return _regex_fallback(description)
 
+    if fast is not None:
+        _stats["escalated"] += 1
     try:
-        result = _classifier(description, _CANDIDATE_LABELS)
-        top_label = result["labels"][0]
-        return _LABEL_MAP[top_label]
+        return zero_shot(description)
     except Exception:
         logger.warning("Severity classification failed, using regex fallback", exc_info=True)
         return _regex_fallback(description)
 
 
+def zero_shot(description: str) -> str:
+    """Label from the zero-shot model alone (the fast tier's teacher)."""
+    result = _classifier(description, _CANDIDATE_LABELS)
+    top_label = result["labels"][0]
+    return _LABEL_MAP[top_label]
+
+
+def status() -> dict:
+    """Which tiers are loaded and how many descriptions each answered, reported by /health/data."""
+    return {
+        "model_loaded": is_loaded(),
+        "fast_tier_loaded": severity_tier.is_loaded(),
+        **_stats,
+    }
+
+
 def _regex_fallback(text: str) -> str:
     """Simple regex-based severity inference."""
     if _RX_CRITICAL.search(text):
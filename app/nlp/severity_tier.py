@@ -0,0 +1,143 @@
+"""Fast severity tier — a linear model over hashed word n-grams.
+
+Trained offline (scripts/train_severity_tier.py) on the zero-shot model's
+labels for every DrugBank description template, and shipped as a small
+binary artifact. Each description is reduced to the set of its lowercased
+word unigrams and bigrams, hashed (CRC-32) into 2**bits buckets; a class
+score is its bias plus the weights of those buckets. predict() returns the
+top class and its softmax margin over the runner-up, so callers can send
+uncertain descriptions on to the full model.
+
+Layout (little-endian):
+  header   magic, version, bits, n_classes (_HEADER)
+  biases   float32[n_classes]
+  weights  float32[n_classes * 2**bits], one row of buckets per class
+"""
+
+import array
+import logging
+import math
+import os
+import random
+import re
+import struct
+import sys
+import zlib
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_TIER_PATH = os.environ.get(
+    "SEVERITY_TIER_PATH",
+    os.path.join(
+        os.path.dirname(__file__), "..", "..", "drugbank-mcp-server", "data", "severity_tier.bin",
+    ),
+)
+
+LABELS = ("major", "moderate", "minor")
+
+_MAGIC = b"PCST"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+_WORD = re.compile(r"[a-z]+")
+
+_model: tuple[int, array.array, array.array] | None = None  # (bits, biases, weights)
+
+
+def features(text: str, bits: int) -> set[int]:
+    """Hashed buckets of the text's word unigrams and bigrams."""
+    words = _WORD.findall(text.lower())
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    mask = (1 << bits) - 1
+    return {zlib.crc32(gram.encode()) & mask for gram in grams}
+
+
+def load(path: str = SEVERITY_TIER_PATH) -> bool:
+    """Read the artifact; returns whether the tier is available."""
+    global _model
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, bits, n_classes = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or n_classes != len(LABELS):
+            raise ValueError(f"not a version {_VERSION} severity tier with {len(LABELS)} classes")
+        biases = array.array("f")
+        biases.frombytes(data[_HEADER.size:_HEADER.size + 4 * n_classes])
+        weights = array.array("f")
+        weights.frombytes(data[_HEADER.size + 4 * n_classes:])
+        if len(weights) != n_classes << bits:
+            raise ValueError("truncated weights")
+        if sys.byteorder != "little":
+            biases.byteswap()
+            weights.byteswap()
+    except FileNotFoundError:
+        logger.info("No severity tier at %s — every description goes to the full model", path)
+        _model = None
+        return False
+    except Exception:
+        logger.warning("Could not load severity tier %s", path, exc_info=True)
+        _model = None
+        return False
+    _model = (bits, biases, weights)
+    logger.info("Severity tier loaded: %d buckets", 1 << bits)
+    return True
+
+
+def is_loaded() -> bool:
+    return _model is not None
+
+
+def predict(text: str) -> tuple[str, float] | None:
+    """(top label, probability margin over the second), or None without a model."""
+    if _model is None:
+        return None
+    bits, biases, weights = _model
+    buckets = features(text, bits)
+    scores = [
+        biases[c] + sum(weights[(c << bits) + b] for b in buckets) for c in range(len(LABELS))
+    ]
+    probabilities = _softmax(scores)
+    first, second = sorted(range(len(LABELS)), key=probabilities.__getitem__, reverse=True)[:2]
+    return LABELS[first], probabilities[first] - probabilities[second]
+
+
+def train(
+    texts: list[str],
+    labels: list[str],
+    bits: int = 16,
+    epochs: int = 20,
+    learning_rate: float = 0.5,
+    l2: float = 1e-6,
+) -> bytes:
+    """Fit multinomial logistic regression by SGD; returns the artifact bytes."""
+    n_classes = len(LABELS)
+    biases = [0.0] * n_classes
+    weights = array.array("f", bytes(4 * (n_classes << bits)))
+    samples = [(sorted(features(t, bits)), LABELS.index(label)) for t, label in zip(texts, labels)]
+    rng = random.Random(0)
+    for epoch in range(epochs):
+        rng.shuffle(samples)
+        rate = learning_rate / (1 + epoch)
+        for buckets, target in samples:
+            scores = [
+                biases[c] + sum(weights[(c << bits) + b] for b in buckets) for c in range(n_classes)
+            ]
+            for c, probability in enumerate(_softmax(scores)):
+                gradient = probability - (c == target)
+                biases[c] -= rate * gradient
+                for b in buckets:
+                    i = (c << bits) + b
+                    weights[i] -= rate * (gradient + l2 * weights[i])
+
+    header = _HEADER.pack(_MAGIC, _VERSION, bits, n_classes)
+    bias_array = array.array("f", biases)
+    if sys.byteorder != "little":
+        bias_array.byteswap()
+        weights.byteswap()
+    return header + bias_array.tobytes() + weights.tobytes()
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
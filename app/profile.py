@@ -0,0 +1,18 @@
+"""Deployment profile, from PILLCHECKER_PROFILE.
+
+full  loads the NER and zero-shot severity models at startup (default).
+lite  never imports transformers or torch: drugs are found by the
+      gazetteer, the dosage parser and the RxNorm fallback, and severity
+      comes from the interaction graph, the fast tier or regex.
+"""
+
+import os
+
+PROFILES = ("full", "lite")
+PILLCHECKER_PROFILE = os.environ.get("PILLCHECKER_PROFILE", "full").strip().lower()
+if PILLCHECKER_PROFILE not in PROFILES:
+    raise ValueError(f"PILLCHECKER_PROFILE must be one of {', '.join(PROFILES)}")
+
+
+def is_lite() -> bool:
+    return PILLCHECKER_PROFILE == "lite"
@@ -0,0 +1,247 @@
+"""Result cache in front of drug_analyzer for repeated scans of the same products.
+
+Two tiers:
+  exact  OCR text normalized (casefolded, punctuation and line breaks
+         collapsed) and hashed; a hit skips NER and RxNorm entirely.
+  near   64-bit SimHash over character 4-gram shingles of the normalized
+         text. A prior result is reused when its fingerprint is within
+         ANALYZE_NEAR_MAX_BITS (Hamming distance), found through eight 8-bit
+         band indexes (any fingerprint within 7 bits shares at least one
+         band), and every drug name in it also appears in the new text —
+         a swapped drug name moves the fingerprint about as far as OCR
+         noise does. The dosage is always re-read from the new text.
+         Empty results are not indexed: a re-scan that reads a name the
+         earlier one garbled must be analyzed.
+
+A sample of near hits (ANALYZE_AUDIT_RATE) is re-analyzed in the background
+and compared by RxCUI, so the rate of false reuse can be watched in
+/health/data; a mismatching audit replaces the reused result. Results
+computed under overload (degraded) are not stored.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import re
+from collections import OrderedDict
+
+from app.clients import ttl_cache
+from app.nlp.dosage_parser import extract_dosages
+from app.services import drug_analyzer, overload
+
+logger = logging.getLogger(__name__)
+
+ANALYZE_CACHE_TTL = float(os.environ.get("ANALYZE_CACHE_TTL", "86400"))
+ANALYZE_CACHE_MAX_BYTES = int(float(os.environ.get("ANALYZE_CACHE_MAX_MB", "16")) * 1024 * 1024)
+# Hamming distance for the near tier (0 disables it)
+ANALYZE_NEAR_MAX_BITS = int(os.environ.get("ANALYZE_NEAR_MAX_BITS", "6"))
+ANALYZE_AUDIT_RATE = float(os.environ.get("ANALYZE_AUDIT_RATE", "0.02"))
+
+# Fingerprints kept for near-duplicate search
+_NEAR_MAX_ENTRIES = 20_000
+# Shorter texts have too few shingles for a meaningful similarity
+_MIN_SHINGLES = 12
+_SHINGLE = 4
+_BANDS = 8
+_BAND_BITS = 64 // _BANDS
+
+_cache = ttl_cache.TTLCache(ANALYZE_CACHE_TTL, max_bytes=ANALYZE_CACHE_MAX_BYTES)
+_fingerprints: OrderedDict[str, int] = OrderedDict()  # exact key → SimHash, oldest first
+_bands: list[dict[int, set[str]]] = [{} for _ in range(_BANDS)]
+_audits: set[asyncio.Task] = set()
+
+_stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "audited": 0, "false_reuse": 0}
+
+_NOISE = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    return _NOISE.sub(" ", text.casefold()).strip()
+
+
+def exact_key(text: str) -> str:
+    return hashlib.blake2b(normalize(text).encode(), digest_size=16).hexdigest()
+
+
+def simhash(text: str) -> int | None:
+    """64-bit SimHash of the normalized text's character shingles, or None if too short."""
+    normalized = normalize(text)
+    shingles = {normalized[i:i + _SHINGLE] for i in range(len(normalized) - _SHINGLE + 1)}
+    if len(shingles) < _MIN_SHINGLES:
+        return None
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles
+    ]
+    half = len(hashes) / 2
+    fingerprint = 0
+    for bit in range(64):
+        if sum((h >> bit) & 1 for h in hashes) > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+async def analyze(text: str) -> list[dict]:
+    """drug_analyzer.analyze through the cache."""
+    key = exact_key(text)
+    cached = _cache.get(key)
+    if cached is not ttl_cache.MISS:
+        _stats["exact_hits"] += 1
+        return _copy(cached)
+
+    fingerprint = simhash(text) if ANALYZE_NEAR_MAX_BITS > 0 else None
+    near_key = _near(fingerprint, text) if fingerprint is not None else None
+    if near_key is not None:
+        _stats["near_hits"] += 1
+        result = _redose(_cache.get(near_key), text)
+        if random.random() < ANALYZE_AUDIT_RATE and overload.level() == overload.NORMAL:
+            task = asyncio.create_task(_audit(text, key, fingerprint, result))
+            _audits.add(task)
+            task.add_done_callback(_audits.discard)
+        return result
+
+    _stats["misses"] += 1
+    result = await drug_analyzer.analyze(text)
+    if overload.level() == overload.NORMAL:
+        _store(key, fingerprint, result)
+    return _copy(result)
+
+
+async def analyze_batch(texts: list[str]) -> list[list[dict]]:
+    """drug_analyzer.analyze_batch through the cache: only texts without a hit are analyzed."""
+    results: list[list[dict] | None] = []
+    for text in texts:
+        key = exact_key(text)
+        cached = _cache.get(key)
+        if cached is not ttl_cache.MISS:
+            _stats["exact_hits"] += 1
+            results.append(_copy(cached))
+            continue
+        fingerprint = simhash(text) if ANALYZE_NEAR_MAX_BITS > 0 else None
+        near_key = _near(fingerprint, text) if fingerprint is not None else None
+        if near_key is not None:
+            _stats["near_hits"] += 1
+            results.append(_redose(_cache.get(near_key), text))
+        else:
+            results.append(None)
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    _stats["misses"] += len(misses)
+    if misses:
+        fresh = await drug_analyzer.analyze_batch([texts[i] for i in misses])
+        degraded = overload.level() > overload.NORMAL
+        for i, result in zip(misses, fresh):
+            text = texts[i]
+            if not degraded:
+                fingerprint = simhash(text) if ANALYZE_NEAR_MAX_BITS > 0 else None
+                _store(exact_key(text), fingerprint, result)
+            results[i] = _copy(result)
+    return results  # type: ignore[return-value]
+
+
+def status() -> dict:
+    lookups = _stats["exact_hits"] + _stats["near_hits"] + _stats["misses"]
+    hits = _stats["exact_hits"] + _stats["near_hits"]
+    return {
+        **_stats,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+        "false_reuse_rate": (
+            round(_stats["false_reuse"] / _stats["audited"], 3) if _stats["audited"] else None
+        ),
+        "entries": len(_cache),
+    }
+
+
+def clear() -> None:
+    _cache.clear()
+    _fingerprints.clear()
+    for band in _bands:
+        band.clear()
+    for key in _stats:
+        _stats[key] = 0
+
+
+def _store(key: str, fingerprint: int | None, result: list[dict]) -> None:
+    _cache.set(key, _copy(result))
+    _drop_fingerprint(key)
+    if fingerprint is None or not result:
+        return
+    _fingerprints[key] = fingerprint
+    for band, value in zip(_bands, _band_values(fingerprint)):
+        band.setdefault(value, set()).add(key)
+    while len(_fingerprints) > _NEAR_MAX_ENTRIES:
+        _drop_fingerprint(next(iter(_fingerprints)))
+
+
+def _drop_fingerprint(key: str) -> None:
+    fingerprint = _fingerprints.pop(key, None)
+    if fingerprint is None:
+        return
+    for band, value in zip(_bands, _band_values(fingerprint)):
+        keys = band.get(value)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del band[value]
+
+
+def _band_values(fingerprint: int) -> list[int]:
+    mask = (1 << _BAND_BITS) - 1
+    return [(fingerprint >> (i * _BAND_BITS)) & mask for i in range(_BANDS)]
+
+
+def _near(fingerprint: int, text: str) -> str | None:
+    """Key of the closest cached fingerprint within ANALYZE_NEAR_MAX_BITS, if any.
+
+    Candidates come from the band indexes, so with more than _BANDS - 1 bits
+    allowed, some near duplicates can be missed. The closest one is only
+    reused if all of its drug names appear in text.
+    """
+    best, best_distance = None, ANALYZE_NEAR_MAX_BITS + 1
+    candidates = set().union(*(
+        band.get(value, ()) for band, value in zip(_bands, _band_values(fingerprint))
+    ))
+    for key in candidates:
+        distance = (_fingerprints[key] ^ fingerprint).bit_count()
+        if distance < best_distance:
+            best, best_distance = key, distance
+    if best is None:
+        return None
+    result = _cache.get(best)
+    if result is ttl_cache.MISS:
+        _drop_fingerprint(best)  # result expired or evicted
+        return None
+    words = f" {normalize(text)} "
+    if not all(f" {normalize(drug['name'])} " in words for drug in result):
+        return None
+    return best
+
+
+def _redose(result: list[dict], text: str) -> list[dict]:
+    """A reused result, with the dosage taken from the text actually scanned."""
+    dosages = extract_dosages(text)
+    dosage = dosages[0].raw if dosages else None
+    return [{**drug, "dosage": dosage} for drug in result]
+
+
+def _copy(result: list[dict]) -> list[dict]:
+    return [dict(drug) for drug in result]
+
+
+async def _audit(text: str, key: str, fingerprint: int, reused: list[dict]) -> None:
+    """Re-analyze a near hit; count and replace it if the drugs differ."""
+    try:
+        fresh = await drug_analyzer.analyze(text)
+    except Exception as exc:
+        logger.debug("Analyze cache audit failed: %s", exc)
+        return
+    _stats["audited"] += 1
+    if {d["rxcui"] for d in fresh} != {d["rxcui"] for d in reused}:
+        _stats["false_reuse"] += 1
+        logger.warning(
+            "Analyze cache reused a near duplicate with different drugs: %s vs %s",
+            sorted(d["name"] for d in reused), sorted(d["name"] for d in fresh),
+        )
+    _store(key, fingerprint, fresh)
@@ -0,0 +1,202 @@
+"""Cache prewarming from observed drug popularity.
+
+/interactions requests record how often each normalized drug name and
+drug pair is seen; the counts are saved to POPULARITY_PATH periodically
+and on shutdown. On startup the top drugs and pairs from the last run are
+replayed in the background at WARM_RATE operations per second: drugs
+through drugbank_client and rxnorm_client, pairs through the interaction
+checker (which fills the pair cache and, where DrugBank has no list, the
+OpenFDA label cache).
+
+/health/data reports "warming" until WARM_READY_FRACTION of the warm-up
+has run (0, the default, never waits).
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+from app.clients import drug_aliases, drugbank_client, rxnorm_client
+from app.services import interaction_checker
+
+logger = logging.getLogger(__name__)
+
+POPULARITY_PATH = os.environ.get(
+    "POPULARITY_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "popularity.json"),
+)
+POPULARITY_SAVE_INTERVAL = float(os.environ.get("POPULARITY_SAVE_INTERVAL", "300"))
+WARM_TOP_DRUGS = int(os.environ.get("WARM_TOP_DRUGS", "200"))
+WARM_TOP_PAIRS = int(os.environ.get("WARM_TOP_PAIRS", "100"))
+WARM_RATE = float(os.environ.get("WARM_RATE", "5"))  # operations per second
+WARM_READY_FRACTION = float(os.environ.get("WARM_READY_FRACTION", "0"))
+
+# Only the most frequent entries are persisted; in memory, counts are pruned
+# back to that many once they reach twice as many
+_MAX_SAVED = 5000
+# Drugs counted per request (the pairs among them grow quadratically)
+_MAX_RECORDED = 32
+# Drugs warmed per get_interactions_batch call
+_WARM_BATCH = 25
+
+_drugs: Counter[str] = Counter()
+_pairs: Counter[str] = Counter()
+
+_warm_task: asyncio.Task | None = None
+_save_task: asyncio.Task | None = None
+_warm_total = 0
+_warm_done = 0
+
+
+def record(drug_names: list[str | None]) -> None:
+    """Count one request for these drugs and each pair among them (None entries are skipped).
+
+    Only the first _MAX_RECORDED distinct names of a request are counted.
+    """
+    normalized = (drug_aliases.normalize(name) for name in drug_names if name)
+    names = sorted(list(dict.fromkeys(n for n in normalized if n))[:_MAX_RECORDED])
+    _drugs.update(names)
+    _pairs.update(
+        _pair_key(a, b) for i, a in enumerate(names) for b in names[i + 1:]
+    )
+    _prune(_drugs)
+    _prune(_pairs)
+
+
+def _prune(counts: Counter[str]) -> None:
+    """Keep only the _MAX_SAVED most frequent entries once counts holds twice as many."""
+    if len(counts) >= 2 * _MAX_SAVED:
+        top = counts.most_common(_MAX_SAVED)
+        counts.clear()
+        counts.update(dict(top))
+
+
+def _pair_key(a: str, b: str) -> str:
+    # Normalized names hold only word characters and spaces
+    return f"{a}|{b}"
+
+
+def load(path: str = POPULARITY_PATH) -> None:
+    """Replace the in-memory counts with those saved at path (if any)."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, json.JSONDecodeError):
+        logger.warning("Failed to read popularity counts from %s", path, exc_info=True)
+        return
+    _drugs.clear()
+    _pairs.clear()
+    _drugs.update(data.get("drugs", {}))
+    _pairs.update(data.get("pairs", {}))
+    _prune(_drugs)
+    _prune(_pairs)
+
+
+def save(path: str = POPULARITY_PATH) -> None:
+    """Write the most frequent drugs and pairs to path atomically."""
+    data = {
+        "drugs": dict(_drugs.most_common(_MAX_SAVED)),
+        "pairs": dict(_pairs.most_common(_MAX_SAVED)),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+async def warm(
+    top_drugs: int = WARM_TOP_DRUGS,
+    top_pairs: int = WARM_TOP_PAIRS,
+    rate: float = WARM_RATE,
+) -> None:
+    """Replay the top drugs and pairs through the clients, `rate` operations per second."""
+    await _run(_plan(top_drugs, top_pairs), rate)
+
+
+def _plan(top_drugs: int, top_pairs: int) -> list[Callable[[], Awaitable[object]]]:
+    """Warm-up operations for the top drugs and pairs; resets progress."""
+    global _warm_total, _warm_done
+    drugs = [name for name, _ in _drugs.most_common(top_drugs)]
+    pairs = [key.split("|", 1) for key, _ in _pairs.most_common(top_pairs)]
+    batches = [drugs[i:i + _WARM_BATCH] for i in range(0, len(drugs), _WARM_BATCH)]
+
+    operations = (
+        [lambda batch=batch: drugbank_client.get_interactions_batch(batch) for batch in batches]
+        + [lambda name=name: rxnorm_client.get_rxcui(name) for name in drugs]
+        + [lambda pair=pair: interaction_checker.check(pair) for pair in pairs]
+    )
+    _warm_total, _warm_done = len(operations), 0
+    logger.info("Warming caches: %d drugs, %d pairs", len(drugs), len(pairs))
+    return operations
+
+
+async def _run(operations: list[Callable[[], Awaitable[object]]], rate: float) -> None:
+    global _warm_done
+    for operation in operations:
+        try:
+            await operation()
+        except Exception as exc:
+            logger.debug("Warm-up operation failed: %s", exc)
+        _warm_done += 1
+        if rate > 0:
+            await asyncio.sleep(1 / rate)
+    if operations:
+        logger.info("Cache warm-up finished")
+
+
+def progress() -> float:
+    """Fraction of the warm-up that has run (1.0 when there is nothing to warm)."""
+    return _warm_done / _warm_total if _warm_total else 1.0
+
+
+def is_warm() -> bool:
+    return progress() >= WARM_READY_FRACTION
+
+
+def status() -> dict:
+    return {
+        "progress": round(progress(), 3),
+        "ready_fraction": WARM_READY_FRACTION,
+        "tracked_drugs": len(_drugs),
+        "tracked_pairs": len(_pairs),
+    }
+
+
+async def _save_periodically() -> None:
+    while True:
+        await asyncio.sleep(POPULARITY_SAVE_INTERVAL)
+        try:
+            save()
+        except OSError:
+            logger.warning("Failed to save popularity counts", exc_info=True)
+
+
+async def start() -> None:
+    """Load saved counts, then start warming and periodic saving in the background."""
+    global _warm_task, _save_task
+    load()
+    _warm_task = asyncio.create_task(_run(_plan(WARM_TOP_DRUGS, WARM_TOP_PAIRS), WARM_RATE))
+    _save_task = asyncio.create_task(_save_periodically())
+
+
+async def stop() -> None:
+    """Cancel background work and save the counts one last time."""
+    global _warm_task, _save_task
+    for task in (_warm_task, _save_task):
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _warm_task = _save_task = None
+    try:
+        save()
+    except OSError:
+        logger.warning("Failed to save popularity counts", exc_info=True)
@@ -1,20 +1,45 @@
 """Drug analyzer — the two-pass identification pipeline.
 
+Fast path: DrugBank names found verbatim by the gazetteer (on word
+         boundaries) are returned without running the NER model.
 Pass 1: NER extracts chemical entities from OCR text.
 Pass 2 (fallback): If NER finds 0 drugs, try RxNorm /approximateTerm
          on the largest text blocks.
 
 Both passes enrich results with dosage regex and RxNorm normalization.
+
+analyze_batch runs the same pipeline over several texts (e.g. every box in
+one cabinet scan) with one batched NER pass and one RxNorm lookup per
+distinct entity name across the batch.
+
+analyze_incremental serves successive OCR frames of one package: NER runs
+only on lines not seen in the previous frame, and names already resolved
+are not looked up again.
+
+Under overload (see overload) NER is skipped at the MINIMAL level, with
+lines of a live scan matched by the gazetteer instead, and the fallback
+tries fewer words from REDUCED on. The lite profile never runs NER.
 """
 
+import asyncio
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
-from app.clients import rxnorm_client
+from app import profile
+from app.clients import drugbank_client, rxnorm_client
 from app.nlp import ner_model
 from app.nlp.dosage_parser import extract_dosages
+from app.nlp.gazetteer import Match
+from app.services import overload
 
 logger = logging.getLogger(__name__)
 
+# RxNorm lookups in flight at once for a batch
+_RXNORM_CONCURRENCY = 8
+# Label of live-scan entities that come from the gazetteer rather than NER
+_GAZETTEER = "GAZETTEER"
+
 
 async def analyze(text: str) -> list[dict]:
     """Analyze OCR text and return enriched drug profiles.
@@ -24,19 +49,28 @@ async def analyze(text: str) -> list[dict]:
       - name: str
       - dosage: str | None
       - form: str | None
-      - source: "ner" | "rxnorm_fallback"
+      - source: "gazetteer" | "ner" | "rxnorm_fallback"
       - confidence: float
     """
     # Extract dosages from the full text (used for both passes)
-    dosages = extract_dosages(text)
-    dosage_str = dosages[0].raw if dosages else None
+    dosage_str = _dosage(text)
 
-    # Pass 1: NER
-    entities = ner_model.predict(text)
-    drug_entities = [
-        e for e in entities
-        if e.label in ("CHEM", "Chemical", "CHEMICAL") and not e.text.isdigit()
-    ]
+    # Fast path: exact dictionary matches
+    matches = _gazetteer_matches(text)
+    if matches:
+        rxcuis: dict[str, str | None] = {}
+        for match in matches:
+            if match.text.lower() not in rxcuis:
+                rxcuis[match.text.lower()] = await rxnorm_client.get_rxcui(match.text)
+        found = _gazetteer_results(matches, dosage_str, rxcuis)
+        if found:
+            logger.info("Gazetteer found %d drugs, skipping NER", len(found))
+            return found
+
+    # Pass 1: NER (skipped under heavy overload)
+    drug_entities = []
+    if _ner_enabled():
+        drug_entities = _drug_entities(await overload.run_inference(ner_model.predict, text))
 
     if drug_entities:
         logger.info("NER found %d drug entities", len(drug_entities))
@@ -50,21 +84,212 @@ async def analyze(text: str) -> list[dict]:
     return await _rxnorm_fallback(text, dosage_str)
 
 
+async def analyze_batch(
+    texts: list[str],
+    on_identified: Callable[[str, str], None] | None = None,
+) -> list[list[dict]]:
+    """analyze() for several texts; results are returned per text, in order.
+
+    on_identified(name, rxcui), if given, is called as soon as each drug is
+    resolved, before the rest of the batch finishes, so callers can start
+    work on it early. It may see names that end up filtered from a text.
+    """
+    rxcuis: dict[str, str | None] = {}
+    semaphore = asyncio.Semaphore(_RXNORM_CONCURRENCY)
+
+    async def resolve(name: str) -> str | None:
+        async with semaphore:
+            rxcui = await rxnorm_client.get_rxcui(name)
+        if rxcui is not None and on_identified is not None:
+            on_identified(name, rxcui)
+        return rxcui
+
+    async def resolve_all(found_names: list[str]) -> None:
+        """Resolve each distinct name not resolved yet, once for the whole batch."""
+        names: dict[str, str] = {}
+        for name in found_names:
+            if name.lower() not in rxcuis:
+                names.setdefault(name.lower(), name)
+        resolved = await asyncio.gather(*(resolve(name) for name in names.values()))
+        rxcuis.update(zip(names, resolved))
+
+    # Fast path per text; only texts without a resolved gazetteer match go to NER
+    matches = [_gazetteer_matches(text) for text in texts]
+    await resolve_all([match.text for found in matches for match in found])
+    results = [
+        _gazetteer_results(found, _dosage(text), rxcuis) for text, found in zip(texts, matches)
+    ]
+    pending = [i for i, result in enumerate(results) if not result]
+
+    entities = [[] for _ in pending]
+    if pending and _ner_enabled():
+        entities = await overload.run_inference(
+            ner_model.predict_batch, [texts[i] for i in pending],
+        )
+    drug_entities = [_drug_entities(found) for found in entities]
+    await resolve_all([_entity_name(entity) for found in drug_entities for entity in found])
+    logger.info(
+        "Batch of %d texts: %d by gazetteer, %d distinct names resolved",
+        len(texts), len(texts) - len(pending), len(rxcuis),
+    )
+
+    async def finish(text: str, found: list[ner_model.Entity]) -> list[dict]:
+        dosage_str = _dosage(text)
+        enriched = _ner_results(found, dosage_str, rxcuis)
+        if enriched:
+            return enriched
+        fallback = await _rxnorm_fallback(text, dosage_str)
+        if on_identified is not None:
+            for drug in fallback:
+                on_identified(drug["name"], drug["rxcui"])
+        return fallback
+
+    finished = await asyncio.gather(*(
+        finish(texts[i], found) for i, found in zip(pending, drug_entities)
+    ))
+    for i, result in zip(pending, finished):
+        results[i] = result
+    return results
+
+
+@dataclass
+class ScanState:
+    """What analyze_incremental keeps between frames: only for lines and names still on screen."""
+
+    line_entities: dict[str, list[ner_model.Entity]] = field(default_factory=dict)
+    rxcuis: dict[str, str | None] = field(default_factory=dict)
+    fallback_text: str | None = None
+    fallback: list[dict] = field(default_factory=list)
+
+
+async def analyze_incremental(text: str, state: ScanState) -> list[dict]:
+    """analyze() for the next OCR frame of a scan, reusing state from earlier frames.
+
+    The frame is diffed against the previous one line by line: NER runs (in
+    one batch) only on new or changed lines, so entities are found per line
+    rather than across line breaks. Without NER (lite profile, or overload)
+    lines are matched by the gazetteer instead; under overload those lines
+    are not kept, so NER sees them once it is back. The RxNorm fallback
+    reruns only when the text changed.
+    """
+    lines = list(dict.fromkeys(line.strip() for line in text.splitlines() if line.strip()))
+    new_lines = [line for line in lines if line not in state.line_entities]
+    fresh: dict[str, list[ner_model.Entity]] = {}
+    ner = _ner_enabled()
+    if new_lines and not ner:
+        for line in new_lines:
+            fresh[line] = [
+                ner_model.Entity(text=m.text, label=_GAZETTEER, score=1.0, start=m.start, end=m.end)
+                for m in _gazetteer_matches(line)
+            ]
+    elif new_lines:
+        found = await overload.run_inference(ner_model.predict_batch, new_lines)
+        fresh = {line: _drug_entities(entities) for line, entities in zip(new_lines, found)}
+    line_entities = {line: state.line_entities.get(line) or fresh.get(line, []) for line in lines}
+    state.line_entities = {
+        line: entities for line, entities in line_entities.items()
+        if ner or profile.is_lite() or line not in fresh
+    }
+
+    entities = [entity for line in lines for entity in line_entities[line]]
+    names: dict[str, str] = {}
+    for entity in entities:
+        names.setdefault(_entity_name(entity).lower(), _entity_name(entity))
+    state.rxcuis = {key: state.rxcuis[key] for key in names if key in state.rxcuis}
+    for key, name in names.items():
+        if key not in state.rxcuis:
+            state.rxcuis[key] = await rxnorm_client.get_rxcui(name)
+
+    dosage_str = _dosage(text)
+    results = _ner_results(entities, dosage_str, state.rxcuis)
+    if results:
+        return results
+    if text != state.fallback_text:
+        state.fallback = await _rxnorm_fallback(text, dosage_str)
+        state.fallback_text = text
+    return state.fallback
+
+
+def _ner_enabled() -> bool:
+    return not profile.is_lite() and overload.level() < overload.MINIMAL
+
+
+def _dosage(text: str) -> str | None:
+    dosages = extract_dosages(text)
+    return dosages[0].raw if dosages else None
+
+
+def _gazetteer_matches(text: str) -> list[Match]:
+    """Gazetteer matches in text, one per DrugBank ID; none until the alias index has loaded."""
+    matcher = drugbank_client.gazetteer()
+    if matcher is None:
+        return []
+    unique: dict[str, Match] = {}
+    for match in matcher.find(text):
+        unique.setdefault(match.drugbank_id, match)
+    return list(unique.values())
+
+
+def _gazetteer_results(
+    matches: list[Match],
+    dosage_str: str | None,
+    rxcuis: dict[str, str | None],
+) -> list[dict]:
+    """Drug profiles for the gazetteer matches whose lowercased names resolved in rxcuis."""
+    return [
+        {
+            "rxcui": rxcuis[match.text.lower()],
+            "name": match.text,
+            "dosage": dosage_str,
+            "form": None,
+            "source": "gazetteer",
+            "confidence": 1.0,  # exact DrugBank name
+        }
+        for match in matches
+        if rxcuis.get(match.text.lower()) is not None
+    ]
+
+
+def _drug_entities(entities: list[ner_model.Entity]) -> list[ner_model.Entity]:
+    return [
+        e for e in entities
+        if e.label in ("CHEM", "Chemical", "CHEMICAL") and not e.text.isdigit()
+    ]
+
+
+def _entity_name(entity: ner_model.Entity) -> str:
+    return entity.text.strip()
+
+
 async def _enrich_ner_results(
     entities: list[ner_model.Entity],
     dosage_str: str | None,
 ) -> list[dict]:
     """Enrich NER entities with RxNorm data."""
+    rxcuis: dict[str, str | None] = {}
+    for entity in entities:
+        name = _entity_name(entity)
+        if name.lower() not in rxcuis:
+            rxcuis[name.lower()] = await rxnorm_client.get_rxcui(name)
+    return _ner_results(entities, dosage_str, rxcuis)
+
+
+def _ner_results(
+    entities: list[ner_model.Entity],
+    dosage_str: str | None,
+    rxcuis: dict[str, str | None],
+) -> list[dict]:
+    """Drug profiles for the entities whose lowercased names resolved in rxcuis."""
     results = []
     seen_names = set()
 
     for entity in entities:
-        name = entity.text.strip()
+        name = _entity_name(entity)
         if name.lower() in seen_names:
             continue
         seen_names.add(name.lower())
 
-        rxcui = await rxnorm_client.get_rxcui(name)
+        rxcui = rxcuis.get(name.lower())
 
         if rxcui is None:
             logger.info("Skipping NER entity '%s' — not found in RxNorm", name)
@@ -75,7 +300,7 @@ async def _enrich_ner_results(
             "name": name,
             "dosage": dosage_str,
             "form": None,
-            "source": "ner",
+            "source": "gazetteer" if entity.label == _GAZETTEER else "ner",
             "confidence": entity.score,
         })
 
@@ -94,6 +319,8 @@ async def _rxnorm_fallback(text: str, dosage_str: str | None) -> list[dict]:
     """Try to identify drugs by sending text blocks to RxNorm approximate search."""
     # Split into words, try the longest blocks first
     words = text.split()
+    if overload.level() > overload.NORMAL:
+        words = words[:overload.FALLBACK_WORDS_DEGRADED]
     results = []
     tried = set()
 
@@ -2,18 +2,93 @@
 
 import asyncio
 import logging
+import os
+from collections.abc import AsyncIterator
 
-from app.clients import drugbank_client, openfda_client
+from app.clients import drugbank_client, interaction_graph, openfda_client, ttl_cache
 from app.nlp import severity_classifier
+from app.services import overload
 
 logger = logging.getLogger(__name__)
 
 _MANAGEMENT = "Consult a healthcare professional for guidance."
 
+# Formatted pair results (and "no interaction" outcomes), keyed by the unordered canonical ID pair
+PAIR_CACHE_TTL = float(os.environ.get("PAIR_CACHE_TTL", "21600"))  # 6 hours
+PAIR_CACHE_MAX_BYTES = int(float(os.environ.get("PAIR_CACHE_MAX_MB", "16")) * 1024 * 1024)
+# Pairs checked at once when streaming results
+STREAM_PAIR_CONCURRENCY = int(os.environ.get("STREAM_PAIR_CONCURRENCY", "8"))
 
-async def check(drug_names: list[str]) -> dict:
+_UNAVAILABLE = "Drug interaction data temporarily unavailable"
+_INCOMPLETE = "Some drug pairs could not be checked"
+
+_pair_cache = ttl_cache.TTLCache(
+    PAIR_CACHE_TTL, max_bytes=PAIR_CACHE_MAX_BYTES, tagger=drugbank_client.data_version,
+)
+# Results computed from a replaced DrugBank database are dropped with it
+drugbank_client.on_data_swap(lambda old, new: _pair_cache.invalidate_tag(old))
+
+
+async def check_refs(drugs: list[str | dict]) -> dict:
+    """Check interactions for drug references.
+
+    Each reference is a name, a bare DrugBank ID, or a dict with any of
+    name / rxcui / drugbank_id. RxCUIs are mapped to DrugBank IDs through the
+    crosswalk in one call; references with an ID skip name resolution. The
+    name (else the ID) labels the drug in the response.
+    """
+    return await check(*await resolve_refs(drugs))
+
+
+async def stream_refs(drugs: list[str | dict]) -> AsyncIterator[tuple[str, dict]]:
+    """check_refs, streamed: see stream()."""
+    drug_names, drug_ids = await resolve_refs(drugs)
+    async for event in stream(drug_names, drug_ids):
+        yield event
+
+
+async def resolve_refs(drugs: list[str | dict]) -> tuple[list[str], dict[str, str]]:
+    """Labels of the references, and the DrugBank IDs pinned to them."""
+    drug_names: list[str] = []
+    drug_ids: dict[str, str] = {}
+    rxcuis: dict[str, str] = {}
+    for ref in drugs:
+        if isinstance(ref, str):
+            drug_names.append(ref)
+            continue
+        label = ref.get("name") or ref.get("drugbank_id") or ref.get("rxcui")
+        drug_names.append(label)
+        if ref.get("drugbank_id"):
+            drug_ids[label] = ref["drugbank_id"]
+        elif ref.get("rxcui"):
+            rxcuis[label] = ref["rxcui"]
+
+    if rxcuis:
+        try:
+            crosswalk = await drugbank_client.resolve_rxcuis(list(rxcuis.values()))
+        except drugbank_client.DrugBankUnavailableError as exc:
+            logger.warning("RxCUI crosswalk failed: %s", exc)
+            crosswalk = {}
+        for label, rxcui in rxcuis.items():
+            if crosswalk.get(rxcui):
+                drug_ids[label] = crosswalk[rxcui]
+
+    return drug_names, drug_ids
+
+
+async def check(
+    drug_names: list[str],
+    drug_ids: dict[str, str] | None = None,
+    pair_results: dict[tuple[str, str], dict | None] | None = None,
+) -> dict:
     """Check interactions between all pairs of drugs.
 
+    drug_ids optionally pins names to known DrugBank IDs, which are then
+    looked up directly instead of by name. pair_results, if given, holds
+    outcomes of earlier checks keyed by pair_id(): those pairs are reused,
+    and new outcomes are added when _cacheable and neither drug's DrugBank
+    fetch failed.
+
     Returns dict with:
       - interactions: list of interaction dicts
       - safe: bool | None (None if data source unavailable)
@@ -25,72 +100,237 @@ async def check(drug_names: list[str]) -> dict:
     if len(drug_names) < 2:
         return {"interactions": [], "safe": True, "error": None}
 
-    # Fetch interaction lists for each drug (cached per drug)
-    unique_names = list(dict.fromkeys(drug_names))  # deduplicate, preserve order
-    results = await asyncio.gather(
-        *[drugbank_client.get_interactions(name) for name in unique_names],
-        return_exceptions=True,
+    prepared = await _prepare(drug_names, drug_ids)
+    if prepared is None:
+        return {"interactions": [], "safe": None, "error": _UNAVAILABLE}
+    unique_names, drug_interactions, drug_ids, failed, version = prepared
+
+    # Check all pairs (use deduplicated list to avoid self-pairs)
+    interactions = []
+    for drug_a, drug_b in _pairs(unique_names):
+        key = pair_id(drug_a, drug_b)
+        if pair_results is not None and key in pair_results:
+            result = pair_results[key]
+        else:
+            result = await _check_pair(drug_a, drug_b, drug_interactions, drug_ids, version)
+            if (
+                pair_results is not None
+                and not {drug_a, drug_b} & failed
+                and _cacheable(drug_a, drug_b, result, drug_interactions)
+            ):
+                pair_results[key] = result
+        if result:
+            _log_found(result)
+            interactions.append(result)
+
+    return {
+        "interactions": interactions,
+        "safe": len(interactions) == 0,
+        "error": None,
+    }
+
+
+async def stream(
+    drug_names: list[str], drug_ids: dict[str, str] | None = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """check(), yielding each interaction as soon as its pair resolves.
+
+    Pairs are checked concurrently (STREAM_PAIR_CONCURRENCY at a time), so
+    a slow OpenFDA fallback or classification does not hold back the rest.
+    Yields ("interaction", result) per interaction found, in completion
+    order, then ("summary", {"safe", "error"}), also when a pair check
+    failed (safe None). Closing the iterator early cancels the pairs still
+    running.
+    """
+    if len(drug_names) < 2:
+        yield "summary", {"safe": True, "error": None}
+        return
+
+    prepared = await _prepare(drug_names, drug_ids)
+    if prepared is None:
+        yield "summary", {"safe": None, "error": _UNAVAILABLE}
+        return
+    unique_names, drug_interactions, drug_ids, _, version = prepared
+
+    semaphore = asyncio.Semaphore(max(1, STREAM_PAIR_CONCURRENCY))
+
+    async def check_one(drug_a: str, drug_b: str) -> dict | None:
+        async with semaphore:
+            return await _check_pair(drug_a, drug_b, drug_interactions, drug_ids, version)
+
+    tasks = [asyncio.create_task(check_one(a, b)) for a, b in _pairs(unique_names)]
+    found = failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+            except Exception:
+                logger.warning("Pair check failed while streaming", exc_info=True)
+                failed += 1
+                continue
+            if result:
+                _log_found(result)
+                found += 1
+                yield "interaction", result
+    finally:
+        for task in tasks:
+            task.cancel()
+    if failed:
+        yield "summary", {"safe": None, "error": _INCOMPLETE}
+    else:
+        yield "summary", {"safe": found == 0, "error": None}
+
+
+def _pairs(names: list[str]) -> list[tuple[str, str]]:
+    return [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+
+
+def pair_id(drug_a: str, drug_b: str) -> tuple[str, str]:
+    """Order-independent key of a pair of drug labels."""
+    return (drug_a, drug_b) if drug_a <= drug_b else (drug_b, drug_a)
+
+
+def _log_found(result: dict) -> None:
+    logger.info(
+        "Interaction found: %s + %s = %s",
+        result["drug_a"], result["drug_b"], result["severity"],
     )
 
+
+async def _prepare(
+    drug_names: list[str], drug_ids: dict[str, str] | None,
+) -> tuple[list[str], dict[str, list[dict]], dict[str, str | None], set[str], str | None] | None:
+    """Fetch every drug's interaction list and collapse aliases.
+
+    Returns the distinct drug labels, their interaction lists and canonical
+    IDs, the labels whose fetch failed (their lists are empty) and the
+    DrugBank data version current before the fetch, or None if DrugBank
+    failed for every drug.
+    """
+    # Fetch interaction lists for all drugs in one or two MCP round trips (cached per drug)
+    unique_names = list(dict.fromkeys(drug_names))  # deduplicate, preserve order
+    pinned = drug_ids or {}
+    lookup = {name: pinned.get(name, name) for name in unique_names}
+    version = drugbank_client.data_version()
+    batch = await drugbank_client.get_interactions_batch(list(dict.fromkeys(lookup.values())))
+
+    # Collapse aliases of one drug ("Advil", "ibuprofen") so they are not paired
+    drug_ids = {name: drugbank_client.canonical_id(lookup[name]) for name in unique_names}
+    first_names: dict[str, str] = {}
+    for name, drugbank_id in drug_ids.items():
+        first_names.setdefault(drugbank_id or name.lower(), name)
+    unique_names = list(first_names.values())
+    results = [batch[lookup[name]] for name in unique_names]
+
     # Handle per-drug failures gracefully
     all_failed = True
+    failed: set[str] = set()
     drug_interactions: dict[str, list[dict]] = {}
     for name, result in zip(unique_names, results):
         if isinstance(result, Exception):
             logger.warning("DrugBank failed for %s: %s", name, result)
             drug_interactions[name] = []
+            failed.add(name)
         else:
             all_failed = False
             drug_interactions[name] = result
 
     if all_failed and len(unique_names) > 0:
         logger.error("DrugBank unavailable — cannot check interactions")
-        return {
-            "interactions": [],
-            "safe": None,
-            "error": "Drug interaction data temporarily unavailable",
-        }
+        return None
+    return unique_names, drug_interactions, drug_ids, failed, version
 
-    # Check all pairs (use deduplicated list to avoid self-pairs)
-    interactions = []
-    for i, drug_a in enumerate(unique_names):
-        for drug_b in unique_names[i + 1:]:
-            result = await _find_interaction(drug_a, drug_b, drug_interactions)
-            if result:
-                logger.info(
-                    "Interaction found: %s + %s = %s",
-                    drug_a, drug_b, result["severity"],
-                )
-                interactions.append(result)
 
-    return {
-        "interactions": interactions,
-        "safe": len(interactions) == 0,
-        "error": None,
-    }
+async def _check_pair(
+    drug_a: str,
+    drug_b: str,
+    drug_interactions: dict[str, list[dict]],
+    drug_ids: dict[str, str | None],
+    version: str | None,
+) -> dict | None:
+    """_find_interaction through the pair cache.
+
+    Only pairs with both canonical IDs are cached, and only _cacheable
+    outcomes of lists from `version` while it is still the served data (a
+    check straddling a database swap is not cached under the new version).
+    """
+    key = _pair_key(drug_ids.get(drug_a), drug_ids.get(drug_b))
+    if key is None:
+        return await _find_interaction(drug_a, drug_b, drug_interactions, drug_ids)
+
+    cached = _pair_cache.get(key)
+    if cached is not ttl_cache.MISS:
+        return {"drug_a": drug_a, "drug_b": drug_b, **cached} if cached else None
+
+    result = await _find_interaction(drug_a, drug_b, drug_interactions, drug_ids)
+    if (
+        _cacheable(drug_a, drug_b, result, drug_interactions)
+        and version == drugbank_client.data_version()
+    ):
+        _pair_cache.set(key, _without_labels(result) if result else None)
+    return result
+
+
+def _without_labels(result: dict) -> dict:
+    return {k: v for k, v in result.items() if k not in ("drug_a", "drug_b")}
+
+
+def _cacheable(
+    drug_a: str, drug_b: str, result: dict | None, drug_interactions: dict[str, list[dict]],
+) -> bool:
+    """Whether a pair outcome may be kept (pair cache, regimen and live-scan pair results).
+
+    Not when checked degraded (cheaper severity tier, see overload). A
+    negative outcome only when both drugs have non-empty DrugBank lists: an
+    empty list means a failed fetch or the OpenFDA fallback, whose network
+    errors look like misses.
+    """
+    if overload.level() > overload.NORMAL:
+        return False
+    return bool(result) or bool(drug_interactions.get(drug_a) and drug_interactions.get(drug_b))
+
+
+def _pair_key(id_a: str | None, id_b: str | None) -> str | None:
+    if not id_a or not id_b:
+        return None
+    return "|".join(sorted((id_a, id_b)))
 
 
 async def _find_interaction(
     drug_a: str,
     drug_b: str,
     drug_interactions: dict[str, list[dict]],
+    drug_ids: dict[str, str | None] | None = None,
 ) -> dict | None:
     """Check if drug_b appears in drug_a's interaction list, or vice versa.
 
-    Falls back to OpenFDA if at least one drug has an empty DrugBank list.
+    Entries match on DrugBank ID when both are known (so brand names and
+    synonyms match), else on name; when both drugs are in the mapped
+    interaction graph the pair is a direct edge lookup. Falls back to
+    OpenFDA if at least one drug has an empty DrugBank list.
     """
-    # Check A's list for B
-    match = _match_in_list(drug_b, drug_interactions.get(drug_a, []))
-    if match:
-        return await _format(drug_a, drug_b, match)
-
-    # Check B's list for A
-    match = _match_in_list(drug_a, drug_interactions.get(drug_b, []))
-    if match:
-        return await _format(drug_a, drug_b, match)
-
-    # At least one empty DrugBank list → cap-hit or error; try OpenFDA
-    if not drug_interactions.get(drug_a) or not drug_interactions.get(drug_b):
+    drug_ids = drug_ids or {}
+    id_a, id_b = drug_ids.get(drug_a), drug_ids.get(drug_b)
+
+    if id_a and id_b and interaction_graph.has(id_a) and interaction_graph.has(id_b):
+        match = interaction_graph.find(id_a, id_b) or interaction_graph.find(id_b, id_a)
+        if match:
+            return await _format(drug_a, drug_b, match)
+    else:
+        # Check A's list for B
+        match = _match_in_list(drug_b, drug_interactions.get(drug_a, []), id_b)
+        if match:
+            return await _format(drug_a, drug_b, match)
+
+        # Check B's list for A
+        match = _match_in_list(drug_a, drug_interactions.get(drug_b, []), id_a)
+        if match:
+            return await _format(drug_a, drug_b, match)
+
+    # At least one empty DrugBank list → cap-hit or error; try OpenFDA (skipped under overload)
+    if overload.level() == overload.NORMAL and (
+        not drug_interactions.get(drug_a) or not drug_interactions.get(drug_b)
+    ):
         try:
             fda_match = await openfda_client.check_pair(drug_a, drug_b)
             if fda_match is None:
@@ -103,10 +343,14 @@ async def _find_interaction(
     return None
 
 
-def _match_in_list(target: str, interactions: list[dict]) -> dict | None:
-    """Find target drug name in a list of interaction entries (case-insensitive)."""
+def _match_in_list(
+    target: str, interactions: list[dict], target_id: str | None = None,
+) -> dict | None:
+    """Find target drug in a list of interaction entries (by ID, else case-insensitive name)."""
     target_lower = target.lower()
     for entry in interactions:
+        if target_id is not None and entry.get("drugbank_id") == target_id:
+            return entry
         if entry.get("drug", "").lower() == target_lower:
             return entry
     return None
@@ -115,8 +359,12 @@ def _match_in_list(target: str, interactions: list[dict]) -> dict | None:
 async def _format(drug_a: str, drug_b: str, match: dict) -> dict:
     """Format an interaction entry for the API response."""
     description = match.get("description", "")
-    loop = asyncio.get_running_loop()
-    severity = await loop.run_in_executor(None, severity_classifier.classify, description)
+    # Graph entries may carry a severity precomputed per description template
+    severity = match.get("severity")
+    if severity is None and overload.level() > overload.NORMAL:
+        severity = severity_classifier.classify(description, full_model=False)
+    elif severity is None:
+        severity = await overload.run_inference(severity_classifier.classify, description)
     return {
         "drug_a": drug_a,
         "drug_b": drug_b,
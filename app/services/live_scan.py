@@ -0,0 +1,69 @@
+"""Live scan — drugs and interaction deltas for a stream of OCR frames.
+
+A client scanning one package sends successive OCR frames of it. Each frame
+goes through drug_analyzer.analyze_incremental (NER only on changed lines);
+when the set of drugs changes, they are checked against each other and the
+drugs of an optional regimen session, reusing pair outcomes from earlier
+frames. Updates report the interactions that appeared or disappeared since
+the previous frame.
+"""
+
+import logging
+
+from app.services import drug_analyzer, interaction_checker
+
+logger = logging.getLogger(__name__)
+
+LIVE_SCAN_MAX_CHARS = 10_000
+
+
+class LiveScan:
+    """State of one scan session."""
+
+    def __init__(self, regimen_refs: list[dict] | None = None):
+        self._regimen_refs = regimen_refs or []
+        self._state = drug_analyzer.ScanState()
+        self._drug_key: tuple | None = None
+        self._pairs: dict[tuple[str, str], dict | None] = {}
+        self._interactions: dict[tuple[str, str], dict] = {}
+        self._summary = {"safe": True, "error": None}
+
+    async def frame(self, text: str) -> dict:
+        """Analyze the next frame.
+
+        Returns dict with:
+          - drugs: drug profiles found in this frame
+          - added: interactions (involving a scanned drug) new since the last frame
+          - removed: [drug_a, drug_b] of interactions no longer present
+          - changed: whether the set of drugs changed
+          - safe, error: as interaction_checker.check, for the current frame
+        """
+        drugs = await drug_analyzer.analyze_incremental(text[:LIVE_SCAN_MAX_CHARS], self._state)
+        drug_key = tuple(sorted((d["rxcui"], d["name"].lower()) for d in drugs))
+        if drug_key == self._drug_key:
+            return {"drugs": drugs, "added": [], "removed": [], "changed": False, **self._summary}
+        self._drug_key = drug_key
+
+        scanned = {d["name"] for d in drugs}
+        refs = self._regimen_refs + [{"name": d["name"], "rxcui": d["rxcui"]} for d in drugs]
+        labels, pinned = await interaction_checker.resolve_refs(refs)
+        result = await interaction_checker.check(labels, pinned, self._pairs)
+        current = {
+            interaction_checker.pair_id(r["drug_a"], r["drug_b"]): r
+            for r in result["interactions"]
+            if r["drug_a"] in scanned or r["drug_b"] in scanned
+        }
+        # Keep pair outcomes only for drugs still present
+        self._pairs = {
+            key: value for key, value in self._pairs.items()
+            if key[0] in labels and key[1] in labels
+        }
+
+        added = [r for key, r in current.items() if key not in self._interactions]
+        removed = [list(key) for key in self._interactions if key not in current]
+        self._interactions = current
+        self._summary = {
+            "safe": None if result["safe"] is None else not current,
+            "error": result["error"],
+        }
+        return {"drugs": drugs, "added": added, "removed": removed, "changed": True, **self._summary}
@@ -0,0 +1,140 @@
+"""Load-adaptive quality tiers.
+
+Inference jobs (NER, zero-shot severity) are counted while queued or
+running in the executor, and a monitor samples event-loop lag. Above the
+DEGRADE_QUEUE_DEPTH or DEGRADE_LOOP_LAG_MS thresholds (one per level) the
+service switches to cheaper tiers:
+  1  severity from the fast tier or regex only, no OpenFDA fallback, and
+     the RxNorm fallback tries only the first FALLBACK_WORDS_DEGRADED words
+  2  also no NER: drugs are found by the gazetteer and that fallback
+The level rises as soon as a threshold is crossed and falls one step at a
+time once load has stayed below the current level's thresholds for
+DEGRADE_RECOVERY_SECONDS. An HTTP request keeps the level it started with
+(reported in X-Degradation-Level). Results computed degraded are not cached.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+NORMAL, REDUCED, MINIMAL = 0, 1, 2
+
+
+def _thresholds(name: str, default: str) -> list[float]:
+    """Per-level thresholds from "level1,level2" (0 disables a level's threshold)."""
+    values = [float(v) for v in os.environ.get(name, default).split(",") if v.strip()]
+    return (values + [0.0, 0.0])[:MINIMAL]
+
+
+DEGRADE_QUEUE_DEPTH = _thresholds("DEGRADE_QUEUE_DEPTH", "16,48")
+DEGRADE_LOOP_LAG_MS = _thresholds("DEGRADE_LOOP_LAG_MS", "100,400")
+DEGRADE_RECOVERY_SECONDS = float(os.environ.get("DEGRADE_RECOVERY_SECONDS", "5"))
+FALLBACK_WORDS_DEGRADED = int(os.environ.get("FALLBACK_WORDS_DEGRADED", "5"))
+
+_SAMPLE_INTERVAL = 0.1  # seconds between loop-lag samples
+
+_level = NORMAL
+_pending = 0  # inference jobs queued or running
+_lag = 0.0  # smoothed event-loop lag, seconds
+_calm_since: float | None = None
+_monitor: asyncio.Task | None = None
+
+# Level pinned for the current request
+_request_level: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "degradation_level", default=None,
+)
+
+
+def level() -> int:
+    """Level for the current request, or the service's current level outside one."""
+    pinned = _request_level.get()
+    return _level if pinned is None else pinned
+
+
+def pin() -> int:
+    """Fix the current level for the rest of this request (context) and return it."""
+    _request_level.set(_level)
+    return _level
+
+
+async def run_inference(fn: Callable, *args: object) -> object:
+    """fn(*args) in the default executor, counted in the inference queue depth."""
+    global _pending
+    _pending += 1
+    _update()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn, *args)
+    finally:
+        _pending -= 1
+
+
+def status() -> dict:
+    return {
+        "level": _level,
+        "inference_queue": _pending,
+        "loop_lag_ms": round(_lag * 1000, 1),
+    }
+
+
+def _target() -> int:
+    lag_ms = _lag * 1000
+    for target in (MINIMAL, REDUCED):
+        depth, lag = DEGRADE_QUEUE_DEPTH[target - 1], DEGRADE_LOOP_LAG_MS[target - 1]
+        if (depth > 0 and _pending >= depth) or (lag > 0 and lag_ms >= lag):
+            return target
+    return NORMAL
+
+
+def _update() -> None:
+    """Move the level towards the load: up at once, down one step per calm period."""
+    global _level, _calm_since
+    target = _target()
+    if target > _level:
+        logger.warning(
+            "Overload: degradation level %d → %d (queue %d, loop lag %.0fms)",
+            _level, target, _pending, _lag * 1000,
+        )
+        _level, _calm_since = target, None
+    elif target < _level:
+        now = time.monotonic()
+        if _calm_since is None:
+            _calm_since = now
+        elif now - _calm_since >= DEGRADE_RECOVERY_SECONDS:
+            logger.info("Load eased: degradation level %d → %d", _level, _level - 1)
+            _level, _calm_since = _level - 1, now
+    else:
+        _calm_since = None
+
+
+async def _watch() -> None:
+    global _lag
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(_SAMPLE_INTERVAL)
+        lag = max(0.0, loop.time() - started - _SAMPLE_INTERVAL)
+        # Rise at once, decay smoothly, so one quick sample does not end an overload
+        _lag = lag if lag > _lag else 0.7 * _lag + 0.3 * lag
+        _update()
+
+
+async def start() -> None:
+    global _monitor
+    _monitor = asyncio.create_task(_watch())
+
+
+async def stop() -> None:
+    global _monitor
+    if _monitor is not None:
+        _monitor.cancel()
+        try:
+            await _monitor
+        except asyncio.CancelledError:
+            pass
+    _monitor = None
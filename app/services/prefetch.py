@@ -0,0 +1,58 @@
+"""Speculative cache warming for drugs a client is about to check.
+
+/analyze is almost always followed by /interactions with the drugs it
+returned. Once the /analyze response is sent, each identified drug's
+DrugBank name and RxCUI resolution and interaction list are fetched into
+the caches, plus its OpenFDA label when DrugBank has no list (that is when
+the checker falls back to OpenFDA). Prefetching is speculative work, so it
+is bounded: at most PREFETCH_MAX_DRUGS drugs per response, and drugs beyond
+PREFETCH_BUDGET prefetches in flight across requests are skipped, not queued.
+"""
+
+import asyncio
+import logging
+import os
+
+from app.clients import drugbank_client, openfda_client
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_BUDGET = int(os.environ.get("PREFETCH_BUDGET", "16"))
+PREFETCH_MAX_DRUGS = int(os.environ.get("PREFETCH_MAX_DRUGS", "8"))
+
+# Drugs being prefetched, by RxCUI or lowercased name
+_inflight: set[str] = set()
+
+
+async def prefetch(drugs: list[dict]) -> None:
+    """Warm the caches for drug profiles from drug_analyzer (within the budget)."""
+    picked = []
+    for drug in drugs[:PREFETCH_MAX_DRUGS]:
+        key = drug.get("rxcui") or (drug.get("name") or "").lower()
+        if not key or key in _inflight:
+            continue
+        if len(_inflight) >= PREFETCH_BUDGET:
+            logger.debug("Prefetch budget exhausted, skipping %s", drug.get("name"))
+            continue
+        _inflight.add(key)
+        picked.append((key, drug))
+
+    try:
+        results = await asyncio.gather(*(_warm(drug) for _, drug in picked), return_exceptions=True)
+        for (_, drug), result in zip(picked, results):
+            if isinstance(result, Exception):
+                logger.debug("Prefetch failed for %s: %s", drug.get("name"), result)
+    finally:
+        for key, _ in picked:
+            _inflight.discard(key)
+
+
+async def _warm(drug: dict) -> None:
+    name, rxcui = drug.get("name"), drug.get("rxcui")
+    if rxcui:
+        await drugbank_client.resolve_rxcuis([rxcui])
+    if not name:
+        return
+    # Resolves the name and caches the list under its DrugBank ID
+    if not await drugbank_client.get_interactions(name):
+        await openfda_client.warm_label(name)
@@ -0,0 +1,126 @@
+"""Regimen sessions — a medication list built up one drug at a time.
+
+A session keeps the drugs added so far (with their resolved DrugBank IDs)
+and the outcome of every pair already checked, so adding the Nth drug
+checks only its N−1 new pairs. Sessions live in a TTLCache: each change
+renews the TTL, and the least recently used sessions are evicted once
+REGIMEN_MAX_MB is exceeded.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import uuid
+from dataclasses import dataclass, field
+
+from app.clients import ttl_cache
+from app.services import interaction_checker
+
+logger = logging.getLogger(__name__)
+
+REGIMEN_TTL = float(os.environ.get("REGIMEN_TTL", "3600"))
+REGIMEN_MAX_BYTES = int(float(os.environ.get("REGIMEN_MAX_MB", "16")) * 1024 * 1024)
+REGIMEN_MAX_DRUGS = int(os.environ.get("REGIMEN_MAX_DRUGS", "50"))
+
+
+class RegimenFullError(Exception):
+    """Adding the drugs would exceed REGIMEN_MAX_DRUGS."""
+
+
+@dataclass(eq=False)
+class Regimen:
+    id: str
+    drugs: dict[str, str | None] = field(default_factory=dict)  # label → pinned DrugBank ID
+    pairs: dict[tuple[str, str], dict | None] = field(default_factory=dict)
+    result: dict = field(default_factory=lambda: {"interactions": [], "safe": True, "error": None})
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def nbytes(self) -> int:
+        """Accounted size for the session store's byte budget."""
+        return (
+            sys.getsizeof(self)
+            + ttl_cache.approx_size(self.drugs)
+            + ttl_cache.approx_size(self.pairs)
+            + ttl_cache.approx_size(self.result)
+        )
+
+    def view(self) -> dict:
+        return {"id": self.id, "drugs": list(self.drugs), **self.result}
+
+
+_sessions = ttl_cache.TTLCache(REGIMEN_TTL, max_bytes=REGIMEN_MAX_BYTES)
+
+
+async def create(drugs: list[str | dict] | None = None) -> dict:
+    """Start a session, optionally with initial drug references."""
+    regimen = Regimen(id=uuid.uuid4().hex)
+    _sessions.set(regimen.id, regimen)
+    if drugs:
+        return await add(regimen.id, drugs)
+    return regimen.view()
+
+
+def get(regimen_id: str) -> dict | None:
+    regimen = _sessions.get(regimen_id)
+    return None if regimen is ttl_cache.MISS else regimen.view()
+
+
+def refs(regimen_id: str) -> list[dict] | None:
+    """The session's drugs as check_refs references (with resolved IDs), or None if it does not exist."""
+    regimen = _sessions.get(regimen_id)
+    if regimen is ttl_cache.MISS:
+        return None
+    return [
+        {"name": label, "drugbank_id": drugbank_id} if drugbank_id else {"name": label}
+        for label, drugbank_id in regimen.drugs.items()
+    ]
+
+
+async def add(regimen_id: str, drugs: list[str | dict]) -> dict | None:
+    """Add drug references (as accepted by check_refs); only pairs with a new drug are checked.
+
+    Returns None if the session does not exist (or expired). Raises
+    RegimenFullError past REGIMEN_MAX_DRUGS.
+    """
+    regimen = _sessions.get(regimen_id)
+    if regimen is ttl_cache.MISS:
+        return None
+    async with regimen.lock:
+        labels, pinned = await interaction_checker.resolve_refs(drugs)
+        new = [label for label in dict.fromkeys(labels) if label not in regimen.drugs]
+        if len(regimen.drugs) + len(new) > REGIMEN_MAX_DRUGS:
+            raise RegimenFullError(f"a regimen holds at most {REGIMEN_MAX_DRUGS} drugs")
+        for label in new:
+            regimen.drugs[label] = pinned.get(label)
+        await _recheck(regimen)
+    return regimen.view()
+
+
+async def remove(regimen_id: str, label: str) -> dict | None:
+    """Remove a drug and its pairs. Returns None if the session does not exist."""
+    regimen = _sessions.get(regimen_id)
+    if regimen is ttl_cache.MISS:
+        return None
+    async with regimen.lock:
+        if regimen.drugs.pop(label, ttl_cache.MISS) is not ttl_cache.MISS:
+            regimen.pairs = {key: value for key, value in regimen.pairs.items() if label not in key}
+            await _recheck(regimen)
+    return regimen.view()
+
+
+def delete(regimen_id: str) -> bool:
+    return _sessions.delete(regimen_id)
+
+
+async def _recheck(regimen: Regimen) -> None:
+    """Check the regimen, reusing known pairs, and renew the session (re-accounting its size)."""
+    known = len(regimen.pairs)
+    pinned = {label: drugbank_id for label, drugbank_id in regimen.drugs.items() if drugbank_id}
+    regimen.result = await interaction_checker.check(list(regimen.drugs), pinned, regimen.pairs)
+    logger.info(
+        "Regimen %s: %d drugs, %d new pairs checked",
+        regimen.id, len(regimen.drugs), len(regimen.pairs) - known,
+    )
+    _sessions.set(regimen.id, regimen)
@@ -0,0 +1,66 @@
+"""Scan checker — OCR texts to drugs and their interactions in one pass.
+
+Runs drug_analyzer.analyze_batch over the texts and, as each drug is
+identified, starts fetching its DrugBank interaction list (RxCUI → DrugBank
+ID through the crosswalk, then the list), overlapping those round trips with
+the rest of the enrichment. Drugs the client already knows are prefetched
+up front. The interaction check then runs against warm caches.
+"""
+
+import asyncio
+import logging
+
+from app.clients import drugbank_client
+from app.services import drug_analyzer, interaction_checker
+
+logger = logging.getLogger(__name__)
+
+
+async def analyze_and_check(texts: list[str], known_drugs: list[str | dict] | None = None) -> dict:
+    """Identify drugs in texts and check them, together with known_drugs, for interactions.
+
+    known_drugs are references as accepted by interaction_checker.check_refs.
+    Returns dict with:
+      - drugs: one list of drug profiles (see drug_analyzer.analyze) per text
+      - interactions, safe, error: as interaction_checker.check
+    """
+    prefetches: dict[str, asyncio.Task] = {}
+
+    def prefetch(ref: dict) -> None:
+        key = ref.get("drugbank_id") or ref.get("rxcui") or (ref.get("name") or "").lower()
+        if key and key not in prefetches:
+            prefetches[key] = asyncio.create_task(_prefetch(ref))
+
+    known_refs = [{"name": ref} if isinstance(ref, str) else ref for ref in known_drugs or []]
+    for ref in known_refs:
+        prefetch(ref)
+
+    try:
+        drugs = await drug_analyzer.analyze_batch(
+            texts, on_identified=lambda name, rxcui: prefetch({"name": name, "rxcui": rxcui}),
+        )
+        # Failures surface (and are handled) in the check itself
+        await asyncio.gather(*prefetches.values(), return_exceptions=True)
+    finally:
+        for task in prefetches.values():
+            task.cancel()
+
+    refs = list(known_refs)
+    seen = {ref.get("rxcui") for ref in refs if ref.get("rxcui")}
+    for drug in (drug for found in drugs for drug in found):
+        if drug["rxcui"] not in seen:
+            seen.add(drug["rxcui"])
+            refs.append({"name": drug["name"], "rxcui": drug["rxcui"]})
+
+    result = await interaction_checker.check_refs(refs)
+    return {"drugs": drugs, **result}
+
+
+async def _prefetch(ref: dict) -> None:
+    """Warm the DrugBank caches for one reference."""
+    drugbank_id = ref.get("drugbank_id")
+    if drugbank_id is None and ref.get("rxcui"):
+        drugbank_id = (await drugbank_client.resolve_rxcuis([ref["rxcui"]])).get(ref["rxcui"])
+    target = drugbank_id or ref.get("name")
+    if target:
+        await drugbank_client.get_interactions(target)
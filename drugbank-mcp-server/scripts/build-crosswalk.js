@@ -0,0 +1,26 @@
+#!/usr/bin/env node
+
+/**
+ * Migration script to add the RxCUI ↔ DrugBank ID crosswalk to an existing database
+ * (e.g. the pre-built one fetched by download-db.js); build-db.js creates it directly
+ */
+
+import Database from 'better-sqlite3';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { buildCrosswalk } from './crosswalk.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const DB_FILE = path.join(__dirname, '..', 'data', 'drugbank.db');
+
+console.log('[Crosswalk] Building RxCUI ↔ DrugBank ID crosswalk...');
+
+const db = new Database(DB_FILE);
+const count = buildCrosswalk(db);
+
+console.log(`[Crosswalk] Mapped ${count} RxCUIs`);
+
+db.close();
+console.log('[Crosswalk] Done!');
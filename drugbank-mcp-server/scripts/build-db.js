@@ -17,6 +17,7 @@ import XmlStream from 'xml-stream';
 import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { CROSSWALK_SCHEMA, buildCrosswalk } from './crosswalk.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -177,6 +178,7 @@ db.exec(`
   );
   CREATE INDEX idx_salt_name ON drug_salts(salt_name COLLATE NOCASE);
 `);
+db.exec(CROSSWALK_SCHEMA);
 
 console.log('[DB Builder] Streaming and parsing XML...');
 
@@ -598,6 +600,7 @@ xml.on('endElement: drug', function(drug) {
 
 xml.on('end', function() {
   console.log(`[DB Builder] Inserted ${count} drugs`);
+  console.log(`[DB Builder] Crosswalk: mapped ${buildCrosswalk(db)} RxCUIs`);
   console.log('[DB Builder] Optimizing database...');
 
   // Optimize
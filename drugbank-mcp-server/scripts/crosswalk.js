@@ -0,0 +1,31 @@
+/**
+ * RxCUI ↔ DrugBank ID crosswalk
+ * Precomputed from the RxCUI entry of each drug's external_identifiers
+ */
+
+export const CROSSWALK_SCHEMA = `
+  CREATE TABLE IF NOT EXISTS drug_crosswalk (
+    rxcui TEXT NOT NULL,
+    drugbank_id TEXT NOT NULL,
+    PRIMARY KEY (rxcui, drugbank_id)
+  ) WITHOUT ROWID;
+  CREATE INDEX IF NOT EXISTS idx_crosswalk_drugbank_id ON drug_crosswalk(drugbank_id);
+`;
+
+/**
+ * (Re)build the drug_crosswalk table, returns the number of mappings
+ */
+export function buildCrosswalk(db) {
+  db.exec(CROSSWALK_SCHEMA);
+  const rebuild = db.transaction(() => {
+    db.exec('DELETE FROM drug_crosswalk');
+    return db.prepare(`
+      INSERT OR IGNORE INTO drug_crosswalk (rxcui, drugbank_id)
+      SELECT TRIM(json_extract(external_identifiers, '$.RxCUI')), drugbank_id
+      FROM drugs
+      WHERE json_valid(external_identifiers)
+        AND json_extract(external_identifiers, '$.RxCUI') IS NOT NULL
+    `).run().changes;
+  });
+  return rebuild();
+}
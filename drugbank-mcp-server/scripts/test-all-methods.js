@@ -88,6 +88,15 @@ test('get_drug_details: returns clinical info', async () => {
   assert('pharmacodynamics' in drug, 'Should have pharmacodynamics field');
 });
 
+test('get_drug_details: returns the whole record, not just interactions', async () => {
+  const result = await handleDrugBankInfo({ method: 'get_drug_details', drugbank_id: 'DB00001' });
+  const drug = result.drug;
+  assert(drug.description, 'Should have a description');
+  assert(drug.groups.length > 0, 'Should have groups');
+  assert(drug.categories.length > 0, 'Should have categories');
+  assert(drug.indication, 'Should have an indication');
+});
+
 test('get_drug_details: handles non-existent drug', async () => {
   const result = await handleDrugBankInfo({ method: 'get_drug_details', drugbank_id: 'DB99999999' });
   assert(result.error, 'Should return error for non-existent drug');
@@ -15,9 +15,12 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
 // Check if SQLite database exists, otherwise fall back to XML parser
-const DB_FILE = path.join(__dirname, '..', 'data', 'drugbank.db');
+const DB_FILE = process.env.DRUGBANK_DB_PATH || path.join(__dirname, '..', 'data', 'drugbank.db');
 const USE_SQLITE = fs.existsSync(DB_FILE);
 
+// Upper bound on items per batch call (search_by_name_batch, get_drug_interactions_batch)
+const MAX_BATCH_SIZE = 100;
+
 let parser;
 if (USE_SQLITE) {
   console.error('[DrugBank API] Using SQLite database (fast mode)');
@@ -85,6 +88,18 @@ export async function handleDrugBankInfo(params) {
       case 'get_salts':
         return await getSalts(params);
 
+      case 'search_by_name_batch':
+        return await searchByNameBatch(params);
+
+      case 'get_drug_interactions_batch':
+        return await getDrugInteractionsBatch(params);
+
+      case 'get_alias_index':
+        return await getAliasIndex();
+
+      case 'resolve_rxcui_batch':
+        return await resolveRxcuiBatch(params);
+
       default:
         return {
           error: `Unknown method: ${method}`,
@@ -104,7 +119,11 @@ export async function handleDrugBankInfo(params) {
             'get_similar_drugs',
             'search_by_carrier',
             'search_by_transporter',
-            'get_salts'
+            'get_salts',
+            'search_by_name_batch',
+            'get_drug_interactions_batch',
+            'get_alias_index',
+            'resolve_rxcui_batch'
           ]
         };
     }
@@ -218,7 +237,10 @@ async function getDrugInteractions(params) {
     return { error: 'Missing required parameter: drugbank_id' };
   }
 
-  const drug = await parser.getDrugById(drugbank_id);
+  // The SQLite backend can fetch just the interaction column; the XML parser cannot
+  const drug = parser.getDrugInteractionsById
+    ? await parser.getDrugInteractionsById(drugbank_id)
+    : await parser.getDrugById(drugbank_id);
 
   if (!drug) {
     return {
@@ -245,6 +267,115 @@ async function getDrugInteractions(params) {
   };
 }
 
+/**
+ * Search drugs by name for several queries in one call
+ * Resolving a whole regimen costs one MCP round trip instead of one per drug
+ */
+async function searchByNameBatch(params) {
+  const { queries, limit = 20 } = params;
+
+  const invalid = validateBatch(queries, 'queries');
+  if (invalid) return invalid;
+
+  const results = [];
+  for (const query of queries) {
+    try {
+      results.push(await searchByName({ query, limit }));
+    } catch (error) {
+      // e.g. FTS5 syntax errors — fail the item, not the batch
+      results.push({ query: query, error: error.message });
+    }
+  }
+
+  return {
+    method: 'search_by_name_batch',
+    count: results.length,
+    results: results
+  };
+}
+
+/**
+ * Get drug interactions for several DrugBank IDs in one call
+ * Results keep the order of drugbank_ids; unknown IDs carry an error entry
+ */
+async function getDrugInteractionsBatch(params) {
+  const { drugbank_ids } = params;
+
+  const invalid = validateBatch(drugbank_ids, 'drugbank_ids');
+  if (invalid) return invalid;
+
+  const results = [];
+  for (const drugbank_id of drugbank_ids) {
+    try {
+      results.push(await getDrugInteractions({ drugbank_id }));
+    } catch (error) {
+      results.push({ drugbank_id: drugbank_id, error: error.message });
+    }
+  }
+
+  return {
+    method: 'get_drug_interactions_batch',
+    count: results.length,
+    results: results
+  };
+}
+
+/**
+ * Dump every drug's names, synonyms, salts and product names
+ * Loaded once by API clients to canonicalize drug names locally
+ */
+async function getAliasIndex() {
+  if (!parser.getAliasIndex) {
+    return { error: 'get_alias_index requires the SQLite database (run "npm run build:db")' };
+  }
+
+  const drugs = await parser.getAliasIndex();
+
+  return {
+    method: 'get_alias_index',
+    count: drugs.length,
+    drugs: drugs
+  };
+}
+
+/**
+ * Map several RxCUIs to DrugBank IDs through the crosswalk
+ */
+async function resolveRxcuiBatch(params) {
+  const { rxcuis } = params;
+
+  const invalid = validateBatch(rxcuis, 'rxcuis');
+  if (invalid) return invalid;
+
+  if (!parser.getDrugBankIdsByRxcui) {
+    return { error: 'resolve_rxcui_batch requires the SQLite database (run "npm run build:db")' };
+  }
+
+  const results = [];
+  for (const rxcui of rxcuis) {
+    results.push({ rxcui: rxcui, drugbank_ids: await parser.getDrugBankIdsByRxcui(rxcui) });
+  }
+
+  return {
+    method: 'resolve_rxcui_batch',
+    count: results.length,
+    results: results
+  };
+}
+
+/**
+ * Validate a batch parameter: non-empty array within MAX_BATCH_SIZE
+ */
+function validateBatch(items, name) {
+  if (!Array.isArray(items) || items.length === 0) {
+    return { error: `Missing required parameter: ${name} (non-empty array)` };
+  }
+  if (items.length > MAX_BATCH_SIZE) {
+    return { error: `Too many ${name}: ${items.length} (max ${MAX_BATCH_SIZE})` };
+  }
+  return null;
+}
+
 /**
  * Search drugs by ATC code
  */
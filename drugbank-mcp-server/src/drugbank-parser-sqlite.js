@@ -14,126 +14,223 @@ import { fileURLToPath } from 'url';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-// Path to the SQLite database
-const DB_FILE = path.join(__dirname, '..', 'data', 'drugbank.db');
+// Path to the SQLite database (DRUGBANK_DB_PATH, set by the API, overrides the bundled copy)
+const DB_FILE = process.env.DRUGBANK_DB_PATH || path.join(__dirname, '..', 'data', 'drugbank.db');
+
+// Read-only connection tuning: memory-map the file and keep a larger page cache
+const MMAP_SIZE = parseInt(process.env.DRUGBANK_MMAP_SIZE || String(512 * 1024 * 1024), 10);
+const CACHE_SIZE_KB = parseInt(process.env.DRUGBANK_CACHE_SIZE_KB || '65536', 10);
+
+// Columns needed by extractDrugSummary — avoids reading and parsing the large JSON columns
+const SUMMARY_COLUMNS = 'drugs.drugbank_id, drugs.name, drugs.description, drugs.groups, drugs.cas_number, drugs.state';
 
 let db = null;
+let stmts = null;
 
 /**
- * Initialize database connection (lazy)
+ * Initialize database connection (lazy) and prepare all fixed statements once
  */
 function getDb() {
   if (!db) {
     db = new Database(DB_FILE, { readonly: true });
     db.pragma('journal_mode = WAL');
+    db.pragma(`mmap_size = ${MMAP_SIZE}`);
+    db.pragma(`cache_size = -${CACHE_SIZE_KB}`);
+    db.pragma('temp_store = MEMORY');
+    stmts = prepareStatements(db);
     console.error('[DrugBank Parser] Connected to SQLite database');
   }
   return db;
 }
 
+/**
+ * Prepared statements, compiled once per connection
+ */
+function prepareStatements(database) {
+  const halfLife = (where) => database.prepare(`
+    SELECT * FROM drugs
+    WHERE half_life_hours IS NOT NULL${where}
+    ORDER BY half_life_hours ASC
+    LIMIT ?
+  `);
+
+  // Databases downloaded before the crosswalk existed fall back to scanning external_identifiers
+  const hasCrosswalk = database.prepare(
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'drug_crosswalk'"
+  ).get();
+
+  return {
+    drugById: database.prepare('SELECT * FROM drugs WHERE drugbank_id = ?'),
+    idsByRxcui: database.prepare(hasCrosswalk
+      ? 'SELECT drugbank_id FROM drug_crosswalk WHERE rxcui = ? ORDER BY drugbank_id'
+      : "SELECT drugbank_id FROM drugs WHERE json_extract(external_identifiers, '$.RxCUI') = ? ORDER BY drugbank_id"
+    ),
+    // Lean projection for get_drug_interactions
+    interactionsById: database.prepare(
+      'SELECT drugbank_id, name, drug_interactions FROM drugs WHERE drugbank_id = ?'
+    ),
+    // Lean projection for search_by_name (FTS5)
+    summaryByName: database.prepare(`
+      SELECT ${SUMMARY_COLUMNS} FROM drugs_fts
+      JOIN drugs ON drugs_fts.drugbank_id = drugs.drugbank_id
+      WHERE drugs_fts.name MATCH ?
+      LIMIT ?
+    `),
+    summaryByIndication: database.prepare(`
+      SELECT ${SUMMARY_COLUMNS} FROM drugs_fts
+      JOIN drugs ON drugs_fts.drugbank_id = drugs.drugbank_id
+      WHERE drugs_fts.indication MATCH ?
+      LIMIT ?
+    `),
+    summaryByTarget: database.prepare(`
+      SELECT DISTINCT ${SUMMARY_COLUMNS} FROM drug_targets
+      JOIN drugs ON drug_targets.drug_id = drugs.drugbank_id
+      WHERE LOWER(REPLACE(drug_targets.target_name, '-', ' ')) LIKE ?
+      LIMIT ?
+    `),
+    summaryByCategory: database.prepare(`
+      SELECT DISTINCT ${SUMMARY_COLUMNS} FROM drug_categories
+      JOIN drugs ON drug_categories.drug_id = drugs.drugbank_id
+      WHERE drug_categories.category LIKE ?
+      LIMIT ?
+    `),
+    summaryByCarrier: database.prepare(`
+      SELECT DISTINCT ${SUMMARY_COLUMNS}, dc.carrier_name, dc.organism, dc.known_action
+      FROM drug_carriers dc
+      JOIN drugs ON dc.drug_id = drugs.drugbank_id
+      WHERE dc.carrier_name LIKE ?
+      LIMIT ?
+    `),
+    summaryByTransporter: database.prepare(`
+      SELECT DISTINCT ${SUMMARY_COLUMNS}, dt.transporter_name, dt.organism, dt.known_action
+      FROM drug_transporters dt
+      JOIN drugs ON dt.drug_id = drugs.drugbank_id
+      WHERE dt.transporter_name LIKE ?
+      LIMIT ?
+    `),
+    saltsByDrug: database.prepare('SELECT * FROM drug_salts WHERE drug_id = ?'),
+    // Full scans for the client-side alias index
+    aliasColumns: database.prepare('SELECT drugbank_id, name, synonyms, products FROM drugs'),
+    saltNames: database.prepare('SELECT drug_id, salt_name FROM drug_salts WHERE salt_name IS NOT NULL'),
+    byAtcCode: database.prepare('SELECT * FROM drugs WHERE atc_codes LIKE ? LIMIT ?'),
+    byStructure: database.prepare('SELECT * FROM drugs WHERE calculated_properties LIKE ? LIMIT ?'),
+    halfLifeRange: halfLife(' AND half_life_hours >= ? AND half_life_hours <= ?'),
+    halfLifeMin: halfLife(' AND half_life_hours >= ?'),
+    halfLifeMax: halfLife(' AND half_life_hours <= ?'),
+    halfLifeAny: halfLife('')
+  };
+}
+
 /**
  * Get drug by DrugBank ID
  */
 export async function getDrugById(drugbankId) {
-  const database = getDb();
-  const stmt = database.prepare('SELECT * FROM drugs WHERE drugbank_id = ?');
-  const drug = stmt.get(drugbankId);
+  getDb();
+  const drug = stmts.drugById.get(drugbankId);
 
   return drug ? parseDrugRow(drug) : null;
 }
 
 /**
- * Search drugs by name (case-insensitive, using FTS5)
+ * Get only the name and drug_interactions of a drug by DrugBank ID
+ * Skips the other JSON columns (products, targets, pathways, ...)
  */
-export async function searchDrugsByName(query, limit = 20) {
-  const database = getDb();
+export async function getDrugInteractionsById(drugbankId) {
+  getDb();
+  const row = stmts.interactionsById.get(drugbankId);
+  if (!row) return null;
 
-  // Use FTS5 for fast full-text search
-  const stmt = database.prepare(`
-    SELECT drugs.* FROM drugs_fts
-    JOIN drugs ON drugs_fts.drugbank_id = drugs.drugbank_id
-    WHERE drugs_fts.name MATCH ?
-    LIMIT ?
-  `);
+  return {
+    drugbank_id: row.drugbank_id,
+    name: row.name,
+    drug_interactions: safeJsonParse(row.drug_interactions)
+  };
+}
 
-  const drugs = stmt.all(query, limit);
-  return drugs.map(drug => extractDrugSummary(parseDrugRow(drug)));
+/**
+ * DrugBank IDs mapped to an RxCUI by the crosswalk
+ */
+export async function getDrugBankIdsByRxcui(rxcui) {
+  getDb();
+  return stmts.idsByRxcui.all(String(rxcui)).map(row => row.drugbank_id);
 }
 
 /**
- * Search drugs by indication
+ * Every name each drug is known by: name, synonyms, salt forms and product names
+ * Product names are deduplicated per drug (the same brand repeats per labeller/strength)
  */
-export async function searchDrugsByIndication(query, limit = 20) {
-  const database = getDb();
+export async function getAliasIndex() {
+  getDb();
+  const salts = new Map();
+  for (const row of stmts.saltNames.iterate()) {
+    if (!salts.has(row.drug_id)) salts.set(row.drug_id, []);
+    salts.get(row.drug_id).push(row.salt_name);
+  }
 
-  // Use FTS5 for fast search
-  const stmt = database.prepare(`
-    SELECT drugs.* FROM drugs_fts
-    JOIN drugs ON drugs_fts.drugbank_id = drugs.drugbank_id
-    WHERE drugs_fts.indication MATCH ?
-    LIMIT ?
-  `);
+  const drugs = [];
+  for (const row of stmts.aliasColumns.iterate()) {
+    const products = safeJsonParse(row.products).map(p => p?.name).filter(Boolean);
+    drugs.push({
+      drugbank_id: row.drugbank_id,
+      name: row.name,
+      synonyms: safeJsonParse(row.synonyms),
+      salts: salts.get(row.drugbank_id) || [],
+      products: [...new Set(products)]
+    });
+  }
+  return drugs;
+}
+
+/**
+ * Search drugs by name (case-insensitive, using FTS5)
+ */
+export async function searchDrugsByName(query, limit = 20) {
+  getDb();
+  const drugs = stmts.summaryByName.all(query, limit);
+  return drugs.map(drug => extractDrugSummary(parseSummaryRow(drug)));
+}
 
-  const drugs = stmt.all(query, limit);
-  return drugs.map(drug => extractDrugSummary(parseDrugRow(drug)));
+/**
+ * Search drugs by indication
+ */
+export async function searchDrugsByIndication(query, limit = 20) {
+  getDb();
+  const drugs = stmts.summaryByIndication.all(query, limit);
+  return drugs.map(drug => extractDrugSummary(parseSummaryRow(drug)));
 }
 
 /**
  * Search drugs by target
  */
 export async function searchDrugsByTarget(target, limit = 20) {
-  const database = getDb();
+  getDb();
 
   // Normalize the search term: lowercase and replace hyphens with spaces
   // This matches Open Targets format ("glucagon like peptide 1 receptor")
   // with DrugBank format ("Glucagon-like peptide 1 receptor")
   const normalizedTarget = target.toLowerCase().replace(/-/g, ' ');
 
-  const stmt = database.prepare(`
-    SELECT DISTINCT drugs.* FROM drug_targets
-    JOIN drugs ON drug_targets.drug_id = drugs.drugbank_id
-    WHERE LOWER(REPLACE(drug_targets.target_name, '-', ' ')) LIKE ?
-    LIMIT ?
-  `);
-
-  const drugs = stmt.all(`%${normalizedTarget}%`, limit);
-  return drugs.map(drug => extractDrugSummary(parseDrugRow(drug)));
+  const drugs = stmts.summaryByTarget.all(`%${normalizedTarget}%`, limit);
+  return drugs.map(drug => extractDrugSummary(parseSummaryRow(drug)));
 }
 
 /**
  * Search drugs by category
  */
 export async function searchDrugsByCategory(category, limit = 20) {
-  const database = getDb();
-
-  const stmt = database.prepare(`
-    SELECT DISTINCT drugs.* FROM drug_categories
-    JOIN drugs ON drug_categories.drug_id = drugs.drugbank_id
-    WHERE drug_categories.category LIKE ?
-    LIMIT ?
-  `);
-
-  const drugs = stmt.all(`%${category}%`, limit);
-  return drugs.map(drug => extractDrugSummary(parseDrugRow(drug)));
+  getDb();
+  const drugs = stmts.summaryByCategory.all(`%${category}%`, limit);
+  return drugs.map(drug => extractDrugSummary(parseSummaryRow(drug)));
 }
 
 /**
  * Search drugs by carrier protein
  */
 export async function searchDrugsByCarrier(carrier, limit = 20) {
-  const database = getDb();
-
-  const stmt = database.prepare(`
-    SELECT DISTINCT drugs.*, dc.carrier_name, dc.organism, dc.known_action
-    FROM drug_carriers dc
-    JOIN drugs ON dc.drug_id = drugs.drugbank_id
-    WHERE dc.carrier_name LIKE ?
-    LIMIT ?
-  `);
-
-  const results = stmt.all(`%${carrier}%`, limit);
+  getDb();
+  const results = stmts.summaryByCarrier.all(`%${carrier}%`, limit);
   return results.map(row => {
-    const drug = parseDrugRow(row);
+    const drug = parseSummaryRow(row);
     return {
       ...extractDrugSummary(drug),
       matched_carrier: {
@@ -149,19 +246,10 @@ export async function searchDrugsByCarrier(carrier, limit = 20) {
  * Search drugs by transporter protein
  */
 export async function searchDrugsByTransporter(transporter, limit = 20) {
-  const database = getDb();
-
-  const stmt = database.prepare(`
-    SELECT DISTINCT drugs.*, dt.transporter_name, dt.organism, dt.known_action
-    FROM drug_transporters dt
-    JOIN drugs ON dt.drug_id = drugs.drugbank_id
-    WHERE dt.transporter_name LIKE ?
-    LIMIT ?
-  `);
-
-  const results = stmt.all(`%${transporter}%`, limit);
+  getDb();
+  const results = stmts.summaryByTransporter.all(`%${transporter}%`, limit);
   return results.map(row => {
-    const drug = parseDrugRow(row);
+    const drug = parseSummaryRow(row);
     return {
       ...extractDrugSummary(drug),
       matched_transporter: {
@@ -177,14 +265,8 @@ export async function searchDrugsByTransporter(transporter, limit = 20) {
  * Get salts for a drug
  */
 export async function getDrugSalts(drugbankId) {
-  const database = getDb();
-
-  const stmt = database.prepare(`
-    SELECT * FROM drug_salts
-    WHERE drug_id = ?
-  `);
-
-  const salts = stmt.all(drugbankId);
+  getDb();
+  const salts = stmts.saltsByDrug.all(drugbankId);
   return salts.map(s => ({
     salt_id: s.salt_id,
     name: s.salt_name,
@@ -199,15 +281,8 @@ export async function getDrugSalts(drugbankId) {
  * Search drugs by ATC code
  */
 export async function searchDrugsByAtcCode(code, limit = 20) {
-  const database = getDb();
-
-  const stmt = database.prepare(`
-    SELECT * FROM drugs
-    WHERE atc_codes LIKE ?
-    LIMIT ?
-  `);
-
-  const drugs = stmt.all(`%${code}%`, limit);
+  getDb();
+  const drugs = stmts.byAtcCode.all(`%${code}%`, limit);
   return drugs.map(drug => parseDrugRow(drug));
 }
 
@@ -216,16 +291,9 @@ export async function searchDrugsByAtcCode(code, limit = 20) {
  * Note: This is a simplified substring search
  */
 export async function searchDrugsByStructure(smiles, inchi, limit = 20) {
-  const database = getDb();
+  getDb();
   const searchQuery = smiles || inchi;
-
-  const stmt = database.prepare(`
-    SELECT * FROM drugs
-    WHERE calculated_properties LIKE ?
-    LIMIT ?
-  `);
-
-  const drugs = stmt.all(`%${searchQuery}%`, limit);
+  const drugs = stmts.byStructure.all(`%${searchQuery}%`, limit);
   return drugs.map(drug => parseDrugRow(drug));
 }
 
@@ -233,48 +301,19 @@ export async function searchDrugsByStructure(smiles, inchi, limit = 20) {
  * Search drugs by half-life range (in hours)
  */
 export async function searchDrugsByHalfLife(minHours, maxHours, limit = 20) {
-  const database = getDb();
+  getDb();
 
-  let stmt;
   let drugs;
 
   if (minHours !== null && maxHours !== null) {
-    stmt = database.prepare(`
-      SELECT * FROM drugs
-      WHERE half_life_hours IS NOT NULL
-        AND half_life_hours >= ?
-        AND half_life_hours <= ?
-      ORDER BY half_life_hours ASC
-      LIMIT ?
-    `);
-    drugs = stmt.all(minHours, maxHours, limit);
+    drugs = stmts.halfLifeRange.all(minHours, maxHours, limit);
   } else if (minHours !== null) {
-    stmt = database.prepare(`
-      SELECT * FROM drugs
-      WHERE half_life_hours IS NOT NULL
-        AND half_life_hours >= ?
-      ORDER BY half_life_hours ASC
-      LIMIT ?
-    `);
-    drugs = stmt.all(minHours, limit);
+    drugs = stmts.halfLifeMin.all(minHours, limit);
   } else if (maxHours !== null) {
-    stmt = database.prepare(`
-      SELECT * FROM drugs
-      WHERE half_life_hours IS NOT NULL
-        AND half_life_hours <= ?
-      ORDER BY half_life_hours ASC
-      LIMIT ?
-    `);
-    drugs = stmt.all(maxHours, limit);
+    drugs = stmts.halfLifeMax.all(maxHours, limit);
   } else {
     // No range specified, return drugs with known half-life
-    stmt = database.prepare(`
-      SELECT * FROM drugs
-      WHERE half_life_hours IS NOT NULL
-      ORDER BY half_life_hours ASC
-      LIMIT ?
-    `);
-    drugs = stmt.all(limit);
+    drugs = stmts.halfLifeAny.all(limit);
   }
 
   return drugs.map(drug => parseDrugRow(drug));
@@ -304,6 +343,16 @@ function parseDrugRow(row) {
   };
 }
 
+/**
+ * Parse a SUMMARY_COLUMNS row (only groups is a JSON column)
+ */
+function parseSummaryRow(row) {
+  return {
+    ...row,
+    groups: safeJsonParse(row.groups)
+  };
+}
+
 /**
  * Safely parse JSON (return empty array/object on error)
  */
@@ -487,6 +536,9 @@ function jaccardSimilarity(setA, setB) {
 export default {
   loadDatabase,
   getDrugById,
+  getDrugInteractionsById,
+  getAliasIndex,
+  getDrugBankIdsByRxcui,
   searchDrugsByName,
   searchDrugsByIndication,
   searchDrugsByTarget,
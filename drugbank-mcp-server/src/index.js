@@ -105,7 +105,23 @@ Available methods:
 
 16. get_salts - Get salt forms for a drug (e.g., hydrochloride, sulfate)
     Parameters: drugbank_id (required)
-    Example: { "method": "get_salts", "drugbank_id": "DB00945" }`,
+    Example: { "method": "get_salts", "drugbank_id": "DB00945" }
+
+17. search_by_name_batch - Run search_by_name for several queries in one call (max 100)
+    Parameters: queries (required), limit (optional, per query, default: 20)
+    Example: { "method": "search_by_name_batch", "queries": ["aspirin", "warfarin"], "limit": 1 }
+
+18. get_drug_interactions_batch - Run get_drug_interactions for several drugs in one call (max 100)
+    Parameters: drugbank_ids (required)
+    Example: { "method": "get_drug_interactions_batch", "drugbank_ids": ["DB00945", "DB00682"] }
+
+19. get_alias_index - Dump names, synonyms, salt names and product names of every drug (SQLite only)
+    Parameters: none
+    Example: { "method": "get_alias_index" }
+
+20. resolve_rxcui_batch - Map RxNorm RxCUIs to DrugBank IDs via the crosswalk (max 100, SQLite only)
+    Parameters: rxcuis (required)
+    Example: { "method": "resolve_rxcui_batch", "rxcuis": ["5640", "11289"] }`,
   inputSchema: {
     type: 'object',
     properties: {
@@ -127,7 +143,11 @@ Available methods:
           'get_similar_drugs',
           'search_by_carrier',
           'search_by_transporter',
-          'get_salts'
+          'get_salts',
+          'search_by_name_batch',
+          'get_drug_interactions_batch',
+          'get_alias_index',
+          'resolve_rxcui_batch'
         ],
         description: 'Method to execute'
       },
@@ -139,6 +159,21 @@ Available methods:
         type: 'string',
         description: 'DrugBank ID (e.g., DB00945) - for get_drug_details, get_drug_interactions, get_pathways, get_products'
       },
+      queries: {
+        type: 'array',
+        items: { type: 'string' },
+        description: 'Search queries (for search_by_name_batch)'
+      },
+      drugbank_ids: {
+        type: 'array',
+        items: { type: 'string' },
+        description: 'DrugBank IDs (for get_drug_interactions_batch)'
+      },
+      rxcuis: {
+        type: 'array',
+        items: { type: 'string' },
+        description: 'RxNorm RxCUIs (for resolve_rxcui_batch)'
+      },
       target: {
         type: 'string',
         description: 'Target protein/enzyme name (for search_by_target)'
@@ -222,7 +257,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
       content: [
         {
           type: 'text',
-          text: JSON.stringify(result, null, 2)
+          text: JSON.stringify(result)
         }
       ]
     };
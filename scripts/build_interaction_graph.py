@@ -0,0 +1,47 @@
+"""Build the memory-mapped interaction graph from the DrugBank SQLite database.
+
+Usage: python scripts/build_interaction_graph.py [--db PATH] [--out PATH] [--classify]
+
+--classify precomputes a severity code per description template with the
+zero-shot model (slow: one inference per template). Without it severity is
+classified at request time, as for MCP lookups.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.clients import interaction_graph  # noqa: E402
+
+DEFAULT_DB = os.path.join(
+    os.path.dirname(__file__), "..", "drugbank-mcp-server", "data", "drugbank.db",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--out", default=interaction_graph.INTERACTION_GRAPH_PATH)
+    parser.add_argument("--classify", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    classify = None
+    if args.classify:
+        from app.nlp import severity_classifier
+        severity_classifier.load_model()
+        classify = severity_classifier.classify
+
+    stats = interaction_graph.build(args.db, args.out, classify=classify)
+    size_mb = os.path.getsize(args.out) / (1024 * 1024)
+    print(
+        f"Interaction graph: {stats['drugs']} drugs, {stats['edges']} edges, "
+        f"{stats['templates']} templates ({size_mb:.1f}MB) -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env bash
+#
+# Run several local API nodes sharing caches through the peer cache.
+# Each node owns a slice of the keys; stop all nodes with Ctrl-C.
+#
+# Usage: ./scripts/peer-cache-cluster.sh [NODES] [BASE_PORT]
+#   e.g. ./scripts/peer-cache-cluster.sh 3 8001
+#   then: curl -X POST localhost:8001/interactions -H 'Content-Type: application/json' \
+#           -d '{"drugs": ["ibuprofen", "warfarin"]}'
+
+set -euo pipefail
+
+NODES="${1:-3}"
+BASE_PORT="${2:-8001}"
+
+PEERS=""
+for i in $(seq 0 $((NODES - 1))); do
+    PEERS="${PEERS:+$PEERS,}http://127.0.0.1:$((BASE_PORT + i))"
+done
+
+trap 'kill 0' EXIT INT TERM
+
+for i in $(seq 0 $((NODES - 1))); do
+    PORT=$((BASE_PORT + i))
+    echo "Starting node on :$PORT (peers: $PEERS)"
+    CACHE_PEERS="$PEERS" CACHE_SELF="http://127.0.0.1:$PORT" \
+        uvicorn app.main:app --host 127.0.0.1 --port "$PORT" &
+done
+
+wait
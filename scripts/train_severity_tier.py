@@ -0,0 +1,80 @@
+"""Train the fast severity tier on the zero-shot model's labels.
+
+Usage: python scripts/train_severity_tier.py [--db PATH] [--out PATH] [--bits N] [--epochs N]
+
+Every distinct DrugBank description template (drug names factored out, as
+in the interaction graph) is labelled once by the zero-shot model, and a
+hashed n-gram linear model is fitted to those labels. Slow (one inference
+per template); run offline and ship the artifact at SEVERITY_TIER_PATH.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.clients.interaction_records import render, templatize  # noqa: E402
+from app.nlp import severity_classifier, severity_tier  # noqa: E402
+
+DEFAULT_DB = os.path.join(
+    os.path.dirname(__file__), "..", "drugbank-mcp-server", "data", "drugbank.db",
+)
+
+
+def templates(db_path: str) -> list[str]:
+    """Distinct description templates, rendered with neutral drug names."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT name, drug_interactions FROM drugs").fetchall()
+    finally:
+        conn.close()
+
+    found: dict[str, None] = {}
+    for name, raw in rows:
+        try:
+            entries = json.loads(raw) if raw else []
+        except json.JSONDecodeError:
+            entries = []
+        for entry in entries:
+            description = entry.get("description")
+            if description:
+                found[templatize(description, name or "", entry.get("name") or "")] = None
+    return [render(t, "Drug A", "Drug B") for t in found]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--out", default=severity_tier.SEVERITY_TIER_PATH)
+    parser.add_argument("--bits", type=int, default=16)
+    parser.add_argument("--epochs", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    severity_classifier.load_model()
+    if not severity_classifier.is_loaded():
+        sys.exit("The zero-shot model is needed to label the training set")
+
+    texts = templates(args.db)
+    labels = [severity_classifier.zero_shot(text) for text in texts]
+    artifact = severity_tier.train(texts, labels, bits=args.bits, epochs=args.epochs)
+
+    tmp_path = f"{args.out}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(artifact)
+    os.replace(tmp_path, args.out)
+
+    severity_tier.load(args.out)
+    agreement = sum(severity_tier.predict(t)[0] == label for t, label in zip(texts, labels))
+    print(
+        f"Severity tier: {len(texts)} templates, {agreement / max(len(texts), 1):.1%} agreement "
+        f"with the zero-shot labels ({len(artifact) / 1024:.0f}KB) -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
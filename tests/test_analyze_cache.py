@@ -0,0 +1,109 @@
+"""Tests for the /analyze result cache."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import analyze_cache
+
+TEXT = (
+    "BRUFEN Ibuprofen 400 mg Film-Coated Tablets. Each tablet contains 400 mg ibuprofen. "
+    "For the relief of mild to moderate pain. Do not exceed the stated dose. "
+    "Keep out of the sight and reach of children. Abbott Healthcare, batch 2391A"
+)
+IBUPROFEN = {
+    "rxcui": "5640", "name": "Ibuprofen", "dosage": "400 mg",
+    "form": None, "source": "ner", "confidence": 0.95,
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    analyze_cache.clear()
+    yield
+    analyze_cache.clear()
+
+
+@pytest.fixture
+def mock_analyze():
+    with patch(
+        "app.services.analyze_cache.drug_analyzer.analyze",
+        new=AsyncMock(return_value=[IBUPROFEN]),
+    ) as mock:
+        yield mock
+
+
+class TestExactTier:
+    async def test_noise_in_case_punctuation_and_line_breaks_hits(self, mock_analyze):
+        await analyze_cache.analyze(TEXT)
+        result = await analyze_cache.analyze(TEXT.upper().replace(" ", "\n").replace(".", ""))
+        assert result == [IBUPROFEN]
+        mock_analyze.assert_awaited_once()
+        assert analyze_cache.status()["exact_hits"] == 1
+
+    async def test_results_are_copies(self, mock_analyze):
+        first = await analyze_cache.analyze(TEXT)
+        first[0]["name"] = "changed"
+        assert (await analyze_cache.analyze(TEXT))[0]["name"] == "Ibuprofen"
+
+
+class TestNearTier:
+    async def test_near_duplicate_reuses_result_with_new_dosage(self, mock_analyze):
+        await analyze_cache.analyze(TEXT)
+        noisy = TEXT.replace("400 mg Film", "200 mg Film")
+        assert analyze_cache.simhash(noisy) != analyze_cache.simhash(TEXT)
+        with patch("app.services.analyze_cache.ANALYZE_AUDIT_RATE", 0):
+            result = await analyze_cache.analyze(noisy)
+        mock_analyze.assert_awaited_once()
+        assert result[0]["rxcui"] == "5640"
+        assert result[0]["dosage"] == "200 mg"
+        assert analyze_cache.status()["near_hits"] == 1
+
+    async def test_swapped_drug_name_is_not_reused(self, mock_analyze):
+        await analyze_cache.analyze(TEXT)
+        swapped = TEXT.replace("Ibuprofen", "Naproxen").replace("ibuprofen", "naproxen")
+        with patch("app.services.analyze_cache.ANALYZE_NEAR_MAX_BITS", 12):
+            await analyze_cache.analyze(swapped)
+        assert mock_analyze.await_count == 2
+        assert analyze_cache.status()["near_hits"] == 0
+
+    async def test_empty_result_is_not_reused(self, mock_analyze):
+        garbled = TEXT.replace("Ibuprofen", "lbupr0fen", 1)
+        mock_analyze.return_value = []
+        await analyze_cache.analyze(garbled)
+        mock_analyze.return_value = [IBUPROFEN]
+        result = await analyze_cache.analyze(TEXT)
+        assert result == [IBUPROFEN]
+        assert mock_analyze.await_count == 2
+        assert analyze_cache.status()["near_hits"] == 0
+
+    async def test_unrelated_text_misses(self, mock_analyze):
+        await analyze_cache.analyze(TEXT)
+        await analyze_cache.analyze("Warfarin Sodium 5 mg Tablets, Teva UK Limited, PL 00289/0210")
+        assert mock_analyze.await_count == 2
+        assert analyze_cache.status()["misses"] == 2
+
+    async def test_short_texts_have_no_fingerprint(self):
+        assert analyze_cache.simhash("Advil") is None
+
+    async def test_audit_counts_and_replaces_false_reuse(self, mock_analyze):
+        await analyze_cache.analyze(TEXT)
+        noisy = TEXT.replace("Abbott", "Abb0tt")
+        naproxen = {**IBUPROFEN, "rxcui": "7258", "name": "Naproxen"}
+        mock_analyze.return_value = [naproxen]
+        with patch("app.services.analyze_cache.ANALYZE_AUDIT_RATE", 1.0):
+            await analyze_cache.analyze(noisy)
+            await asyncio.gather(*analyze_cache._audits)
+            assert (await analyze_cache.analyze(noisy))[0]["name"] == "Naproxen"
+        status = analyze_cache.status()
+        assert status["audited"] == 1
+        assert status["false_reuse_rate"] == 1.0
+
+
+class TestBatch:
+    async def test_only_misses_are_analyzed(self):
+        await_batch = AsyncMock(return_value=[[IBUPROFEN]])
+        with patch("app.services.analyze_cache.drug_analyzer.analyze_batch", await_batch):
+            await analyze_cache.analyze_batch([TEXT])
+            results = await analyze_cache.analyze_batch([TEXT, "Warfarin Sodium 5 mg Tablets, Teva UK"])
+        assert await_batch.await_args_list[-1].args[0] == ["Warfarin Sodium 5 mg Tablets, Teva UK"]
+        assert results[0] == [IBUPROFEN]
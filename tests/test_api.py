@@ -4,17 +4,24 @@ Tests /interactions and /health endpoints directly.
 /analyze requires the NER model loaded — tested via Docker or manual run.
 """
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
 
+from tests.test_interaction_checker import batch_via
+
 
 @pytest.fixture
 def mock_drugbank():
     """Mock drugbank_client in every module that imports it."""
     mock = MagicMock()
     mock.get_interactions = AsyncMock()
+    mock.get_interactions_batch = AsyncMock(side_effect=batch_via(mock.get_interactions))
+    mock.canonical_id.return_value = None
     mock.health_check = AsyncMock(return_value=True)
+    mock.status.return_value = {"circuit_breaker": "closed", "restarts": 0}
     mock.connect = AsyncMock()
     mock.close = AsyncMock()
     mock.DrugBankUnavailableError = Exception
@@ -83,6 +90,162 @@ class TestInteractionsEndpoint:
         resp = client.post("/interactions", json={})
         assert resp.status_code == 422
 
+    def test_accepts_rxcui_and_drugbank_id_refs(self, client, mock_drugbank):
+        mock_drugbank.resolve_rxcuis = AsyncMock(return_value={"5640": "DB01050"})
+        mock_drugbank.canonical_id.side_effect = lambda name: name if name.startswith("DB") else None
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "x"}],
+            [{"drug": "Ibuprofen", "drugbank_id": "DB01050", "description": "x"}],
+        ]
+        resp = client.post("/interactions", json={
+            "drugs": [{"rxcui": "5640", "name": "Ibuprofen"}, {"drugbank_id": "DB00682"}],
+        })
+        assert resp.status_code == 200
+        interaction = resp.json()["interactions"][0]
+        assert (interaction["drug_a"], interaction["drug_b"]) == ("Ibuprofen", "DB00682")
+        mock_drugbank.get_interactions_batch.assert_awaited_once_with(["DB01050", "DB00682"])
+
+    def test_validation_rejects_empty_drug_ref(self, client):
+        resp = client.post("/interactions", json={"drugs": [{}, "warfarin"]})
+        assert resp.status_code == 422
+
+
+class TestInteractionsStreaming:
+    def test_ndjson_emits_interactions_then_summary(self, client, mock_drugbank):
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Warfarin", "description": "Increases bleeding risk."}],
+            [{"drug": "Ibuprofen", "description": "Increases bleeding risk."}],
+        ]
+        resp = client.post(
+            "/interactions",
+            json={"drugs": ["ibuprofen", "warfarin"]},
+            headers={"Accept": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert lines[0]["type"] == "interaction"
+        assert (lines[0]["drug_a"], lines[0]["drug_b"]) == ("ibuprofen", "warfarin")
+        assert lines[-1] == {"type": "summary", "safe": False, "error": None}
+
+    def test_sse_events(self, client, mock_drugbank):
+        mock_drugbank.get_interactions.side_effect = [[], []]
+        with patch("app.services.interaction_checker.openfda_client") as openfda:
+            openfda.check_pair = AsyncMock(return_value=None)
+            resp = client.post(
+                "/interactions",
+                json={"drugs": ["ibuprofen", "amoxicillin"]},
+                headers={"Accept": "text/event-stream"},
+            )
+        assert resp.status_code == 200
+        assert resp.text == 'event: summary\ndata: {"safe": true, "error": null}\n\n'
+
+    def test_json_by_default(self, client, mock_drugbank):
+        mock_drugbank.get_interactions.side_effect = [[], []]
+        with patch("app.services.interaction_checker.openfda_client") as openfda:
+            openfda.check_pair = AsyncMock(return_value=None)
+            resp = client.post(
+                "/interactions",
+                json={"drugs": ["ibuprofen", "amoxicillin"]},
+                headers={"Accept": "application/json, application/x-ndjson"},
+            )
+        assert resp.json()["safe"] is True
+
+
+class TestAnalyzeBatchEndpoint:
+    def test_results_follow_text_order(self, client):
+        drug = {
+            "rxcui": "5640", "name": "Ibuprofen", "dosage": "400 mg",
+            "form": None, "source": "ner", "confidence": 0.9,
+        }
+        with patch("app.api.analyze.analyze_cache.analyze_batch", AsyncMock(return_value=[[drug], []])), \
+             patch("app.api.analyze.prefetch.prefetch", AsyncMock()) as prefetch:
+            resp = client.post("/analyze/batch", json={"texts": ["Ibuprofen 400 mg", "zzz"]})
+        assert resp.status_code == 200
+        prefetch.assert_awaited_once_with([drug])
+        results = resp.json()["results"]
+        assert [r["raw_text"] for r in results] == ["Ibuprofen 400 mg", "zzz"]
+        assert results[0]["drugs"][0]["rxcui"] == "5640"
+        assert results[1]["drugs"] == []
+
+    def test_validation_rejects_empty_batch(self, client):
+        assert client.post("/analyze/batch", json={"texts": []}).status_code == 422
+        assert client.post("/analyze/batch", json={"texts": [""]}).status_code == 422
+
+
+class TestScanEndpoint:
+    def test_returns_drugs_and_interactions(self, client):
+        drug = {
+            "rxcui": "5640", "name": "Ibuprofen", "dosage": "400 mg",
+            "form": None, "source": "ner", "confidence": 0.9,
+        }
+        interaction = {
+            "drug_a": "warfarin", "drug_b": "Ibuprofen", "severity": "major",
+            "description": "Bleeding.", "management": "Consult.",
+        }
+        result = {"drugs": [[drug]], "interactions": [interaction], "safe": False, "error": None}
+        with patch("app.api.scan.scan_checker.analyze_and_check", AsyncMock(return_value=result)) as scan:
+            resp = client.post("/scan", json={"texts": ["Ibuprofen 400 mg"], "drugs": ["warfarin"]})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["results"][0]["drugs"][0]["name"] == "Ibuprofen"
+        assert data["interactions"][0]["severity"] == "major"
+        assert data["safe"] is False
+        scan.assert_awaited_once_with(["Ibuprofen 400 mg"], ["warfarin"])
+
+
+class TestRegimensEndpoint:
+    def test_create_add_remove_delete(self, client, mock_drugbank):
+        lists = {
+            "ibuprofen": [{"drug": "Warfarin", "description": "x"}],
+            "warfarin": [{"drug": "Ibuprofen", "description": "x"}],
+        }
+        mock_drugbank.get_interactions.side_effect = lambda name: lists[name]
+
+        resp = client.post("/regimens", json={"drugs": ["ibuprofen"]})
+        assert resp.status_code == 201
+        regimen_id = resp.json()["id"]
+
+        resp = client.post(f"/regimens/{regimen_id}/drugs", json={"drugs": ["warfarin"]})
+        assert resp.json()["drugs"] == ["ibuprofen", "warfarin"]
+        assert resp.json()["safe"] is False
+
+        resp = client.delete(f"/regimens/{regimen_id}/drugs/warfarin")
+        assert resp.json()["safe"] is True
+
+        assert client.delete(f"/regimens/{regimen_id}").status_code == 204
+        assert client.get(f"/regimens/{regimen_id}").status_code == 404
+
+
+class TestLiveScanEndpoint:
+    def test_frame_gets_update(self, client):
+        update = {
+            "drugs": [], "added": [], "removed": [["Ibuprofen", "Warfarin"]],
+            "changed": True, "safe": True, "error": None,
+        }
+        with patch("app.api.live_scan.live_scan.LiveScan.frame", AsyncMock(return_value=update)):
+            with client.websocket_connect("/scan/live") as ws:
+                ws.send_text(json.dumps({"text": "Ibuprofen 200 mg"}))
+                message = ws.receive_json()
+        assert message["type"] == "update"
+        assert message["removed"] == [["Ibuprofen", "Warfarin"]]
+
+    def test_malformed_frame_gets_error(self, client):
+        with client.websocket_connect("/scan/live") as ws:
+            ws.send_text("not json")
+            assert ws.receive_json()["type"] == "error"
+
+    def test_requires_api_key_when_configured(self, client):
+        from starlette.websockets import WebSocketDisconnect
+
+        with patch.dict("os.environ", {"API_KEY": "secret"}):
+            with pytest.raises(WebSocketDisconnect):
+                with client.websocket_connect("/scan/live") as ws:
+                    ws.receive_json()
+            with client.websocket_connect("/scan/live?api_key=secret") as ws:
+                ws.send_text("not json")
+                assert ws.receive_json()["type"] == "error"
+
 
 class TestHealthEndpoint:
     def test_health_returns_ok(self, client):
@@ -92,6 +255,13 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert data["version"] == "0.1.0"
 
+    def test_responses_report_degradation_level(self, client):
+        resp = client.get("/health")
+        assert resp.headers["X-Degradation-Level"] == "0"
+        with patch("app.services.overload._level", 2):
+            resp = client.post("/interactions", json={"drugs": ["ibuprofen"]})
+        assert resp.headers["X-Degradation-Level"] == "2"
+
     def test_data_health_connected(self, client, mock_drugbank):
         mock_drugbank.health_check.return_value = True
         resp = client.get("/health/data")
@@ -107,3 +277,48 @@ class TestHealthEndpoint:
         data = resp.json()
         assert data["status"] == "degraded"
         assert data["drugbank"] == "unreachable"
+
+    def test_data_health_warming(self, client, mock_drugbank):
+        with patch("app.api.health.cache_warmer.is_warm", return_value=False):
+            resp = client.get("/health/data")
+        data = resp.json()
+        assert data["status"] == "warming"
+        assert "progress" in data["warmup"]
+
+    def test_data_health_reports_supervisor_state(self, client, mock_drugbank):
+        mock_drugbank.status.return_value = {
+            "circuit_breaker": "open",
+            "consecutive_failures": 5,
+            "restarts": 2,
+            "last_recovery_seconds": 1.25,
+            "down_for_seconds": 3.0,
+        }
+        resp = client.get("/health/data")
+        data = resp.json()
+        assert data["supervisor"]["circuit_breaker"] == "open"
+        assert data["supervisor"]["restarts"] == 2
+        assert data["supervisor"]["last_recovery_seconds"] == 1.25
+
+
+class TestInternalCacheEndpoint:
+    def test_not_found_when_peering_disabled(self, client):
+        resp = client.get("/internal/cache/rxnorm.rxcui", params={"key": "ibuprofen"})
+        assert resp.status_code == 404
+
+    def test_serves_registered_group(self, client):
+        with patch("app.api.internal.peer_cache") as mock:
+            mock.enabled.return_value = True
+            mock.is_registered.return_value = True
+            mock.serve = AsyncMock(return_value="5640")
+            resp = client.get("/internal/cache/rxnorm.rxcui", params={"key": "ibuprofen"})
+        assert resp.status_code == 200
+        assert resp.json() == {"value": "5640"}
+        mock.serve.assert_awaited_once_with("rxnorm.rxcui", "ibuprofen")
+
+    def test_load_failure_is_bad_gateway(self, client):
+        with patch("app.api.internal.peer_cache") as mock:
+            mock.enabled.return_value = True
+            mock.is_registered.return_value = True
+            mock.serve = AsyncMock(side_effect=Exception("RxNorm down"))
+            resp = client.get("/internal/cache/rxnorm.rxcui", params={"key": "ibuprofen"})
+        assert resp.status_code == 502
@@ -0,0 +1,105 @@
+"""Tests for popularity recording and cache prewarming."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services import cache_warmer
+
+
+@pytest.fixture(autouse=True)
+def reset_counts():
+    cache_warmer._drugs.clear()
+    cache_warmer._pairs.clear()
+    cache_warmer._warm_total = cache_warmer._warm_done = 0
+    yield
+    cache_warmer._drugs.clear()
+    cache_warmer._pairs.clear()
+    cache_warmer._warm_total = cache_warmer._warm_done = 0
+
+
+@pytest.fixture
+def mock_clients():
+    with patch("app.services.cache_warmer.drugbank_client") as drugbank, \
+         patch("app.services.cache_warmer.rxnorm_client") as rxnorm, \
+         patch("app.services.cache_warmer.interaction_checker") as checker:
+        drugbank.get_interactions_batch = AsyncMock(return_value={})
+        rxnorm.get_rxcui = AsyncMock(return_value=None)
+        checker.check = AsyncMock(return_value={})
+        yield drugbank, rxnorm, checker
+
+
+class TestRecord:
+    def test_counts_normalized_drugs_and_unordered_pairs(self):
+        cache_warmer.record(["Ibuprofen", "warfarin"])
+        cache_warmer.record(["WARFARIN", "ibuprofen®", None])
+        assert cache_warmer._drugs == {"ibuprofen": 2, "warfarin": 2}
+        assert cache_warmer._pairs == {"ibuprofen|warfarin": 2}
+
+    def test_memory_stays_bounded_and_keeps_frequent_entries(self):
+        with patch("app.services.cache_warmer._MAX_SAVED", 10):
+            for _ in range(5):
+                cache_warmer.record(["ibuprofen", "warfarin"])
+            for i in range(200):
+                cache_warmer.record([f"drug{i} a", f"drug{i} b", f"drug{i} c"])
+                assert len(cache_warmer._drugs) < 20
+                assert len(cache_warmer._pairs) < 20
+        assert cache_warmer._drugs["ibuprofen"] == 5
+        assert cache_warmer._pairs["ibuprofen|warfarin"] == 5
+
+    def test_large_request_counts_a_bounded_number_of_pairs(self):
+        cache_warmer.record([f"drug {i}" for i in range(1000)])
+        assert len(cache_warmer._drugs) == cache_warmer._MAX_RECORDED
+        assert len(cache_warmer._pairs) == 32 * 31 // 2
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = str(tmp_path / "stats" / "popularity.json")
+        cache_warmer.record(["ibuprofen", "warfarin", "aspirin"])
+        cache_warmer.save(path)
+        cache_warmer._drugs.clear()
+        cache_warmer._pairs.clear()
+
+        cache_warmer.load(path)
+        assert cache_warmer._drugs["aspirin"] == 1
+        assert cache_warmer._pairs["aspirin|warfarin"] == 1
+
+    def test_load_missing_file_keeps_counts(self, tmp_path):
+        cache_warmer.record(["ibuprofen"])
+        cache_warmer.load(str(tmp_path / "missing.json"))
+        assert cache_warmer._drugs["ibuprofen"] == 1
+
+
+class TestWarm:
+    async def test_warms_top_drugs_and_pairs(self, mock_clients):
+        drugbank, rxnorm, checker = mock_clients
+        for _ in range(3):
+            cache_warmer.record(["ibuprofen", "warfarin"])
+        cache_warmer.record(["aspirin"])
+
+        await cache_warmer.warm(top_drugs=2, top_pairs=1, rate=0)
+
+        drugbank.get_interactions_batch.assert_awaited_once_with(["ibuprofen", "warfarin"])
+        assert rxnorm.get_rxcui.await_count == 2
+        checker.check.assert_awaited_once_with(["ibuprofen", "warfarin"])
+        assert cache_warmer.progress() == 1.0
+
+    async def test_failures_do_not_stop_warm_up(self, mock_clients):
+        drugbank, rxnorm, checker = mock_clients
+        drugbank.get_interactions_batch.side_effect = Exception("down")
+        cache_warmer.record(["ibuprofen", "warfarin"])
+
+        await cache_warmer.warm(rate=0)
+        checker.check.assert_awaited_once()
+        assert cache_warmer.progress() == 1.0
+
+    async def test_rate_limits_operations(self, mock_clients):
+        cache_warmer.record(["ibuprofen"])
+        with patch("app.services.cache_warmer.asyncio.sleep", new=AsyncMock()) as sleep:
+            await cache_warmer.warm(rate=4)
+        sleep.assert_awaited_with(0.25)
+
+    def test_readiness_waits_for_fraction(self):
+        cache_warmer._warm_total, cache_warmer._warm_done = 10, 4
+        with patch.object(cache_warmer, "WARM_READY_FRACTION", 0.5):
+            assert cache_warmer.is_warm() is False
+            cache_warmer._warm_done = 5
+            assert cache_warmer.is_warm() is True
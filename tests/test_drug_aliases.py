@@ -0,0 +1,53 @@
+"""Tests for the local drug alias index."""
+
+from app.clients import drug_aliases
+
+
+class TestNormalize:
+    def test_casefolds_and_collapses_punctuation(self):
+        assert drug_aliases.normalize("  Advil® Liqui-Gels ") == "advil liqui gels"
+
+    def test_strips_accents(self):
+        assert drug_aliases.normalize("Paracétamol") == "paracetamol"
+
+    def test_stereo_prefix_reduces_to_name(self):
+        assert drug_aliases.normalize("(±)-Ibuprofen") == "ibuprofen"
+
+
+class TestBuildIndex:
+    def test_indexes_all_alias_kinds(self):
+        index = drug_aliases.build_index([{
+            "drugbank_id": "DB01050",
+            "name": "Ibuprofen",
+            "synonyms": ["Ibuprofeno"],
+            "salts": ["Ibuprofen sodium"],
+            "products": ["Advil"],
+        }])
+        assert index == {
+            "ibuprofen": "DB01050",
+            "ibuprofeno": "DB01050",
+            "ibuprofen sodium": "DB01050",
+            "advil": "DB01050",
+        }
+
+    def test_higher_ranked_alias_wins(self):
+        index = drug_aliases.build_index([
+            {"drugbank_id": "DB00945", "name": "Acetylsalicylic acid", "products": ["Aspirin"]},
+            {"drugbank_id": "DB99999", "name": "Aspirin"},
+        ])
+        assert index["aspirin"] == "DB99999"
+
+    def test_ambiguous_alias_is_dropped(self):
+        index = drug_aliases.build_index([
+            {"drugbank_id": "DB01050", "name": "Ibuprofen", "products": ["Combo Pain"]},
+            {"drugbank_id": "DB00945", "name": "Acetylsalicylic acid", "products": ["Combo Pain"]},
+        ])
+        assert "combo pain" not in index
+        assert index["ibuprofen"] == "DB01050"
+
+    def test_skips_malformed_records(self):
+        index = drug_aliases.build_index([
+            {"name": "No ID"},
+            {"drugbank_id": "DB00682", "name": "Warfarin", "synonyms": [None, ""]},
+        ])
+        assert index == {"warfarin": "DB00682"}
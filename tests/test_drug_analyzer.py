@@ -12,6 +12,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from app.clients.rxnorm_client import DrugInfo
 from app.services import drug_analyzer
 from app.nlp import ner_model
+from app.nlp.gazetteer import Gazetteer
 
 
 def _no_ner(text):
@@ -247,3 +248,242 @@ async def test_ner_results_sorted_by_confidence_descending():
     assert len(results) == 2
     assert results[0]["name"] == "Ibuprofen", "Highest confidence drug should be first"
     assert results[1]["name"] == "Aspirin"
+
+
+# ─── Batch tests ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_one_ner_pass_and_dedupes_lookups():
+    """Entities shared across texts are resolved once; results keep text order."""
+    per_text = [
+        [ner_model.Entity(text="Ibuprofen", label="CHEM", score=0.9, start=0, end=9)],
+        [
+            ner_model.Entity(text="ibuprofen", label="CHEM", score=0.8, start=0, end=9),
+            ner_model.Entity(text="Warfarin", label="CHEM", score=0.95, start=10, end=18),
+        ],
+    ]
+    predict_batch = MagicMock(return_value=per_text)
+    get_rxcui = AsyncMock(side_effect=lambda name: {"ibuprofen": "5640", "warfarin": "11289"}[name.lower()])
+
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict_batch", predict_batch),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", get_rxcui),
+    ):
+        results = await drug_analyzer.analyze_batch(["Ibuprofen 400 mg", "ibuprofen Warfarin 5 mg"])
+
+    predict_batch.assert_called_once_with(["Ibuprofen 400 mg", "ibuprofen Warfarin 5 mg"])
+    assert get_rxcui.await_count == 2
+    assert [r["name"] for r in results[0]] == ["Ibuprofen"]
+    assert results[0][0]["dosage"] == "400 mg"
+    assert [r["name"] for r in results[1]] == ["Warfarin", "ibuprofen"]
+
+
+@pytest.mark.asyncio
+async def test_batch_text_without_entities_uses_fallback():
+    fallback_candidate = DrugInfo(rxcui="10689", name="Trimethoprim", score=10.5)
+
+    with (
+        patch(
+            "app.services.drug_analyzer.ner_model.predict_batch",
+            return_value=[[], []],
+        ),
+        patch(
+            "app.services.drug_analyzer.rxnorm_client.approximate_term",
+            new=AsyncMock(side_effect=[[fallback_candidate], []]),
+        ),
+        patch(
+            "app.services.drug_analyzer.rxnorm_client.get_drug_details",
+            new=AsyncMock(return_value={"name": "trimethoprim"}),
+        ),
+    ):
+        results = await drug_analyzer.analyze_batch(["Trimethoprim", "zzz"])
+
+    assert [r["name"] for r in results[0]] == ["trimethoprim"]
+    assert results[1] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_each_drug_as_it_is_identified():
+    entity = ner_model.Entity(text="Ibuprofen", label="CHEM", score=0.9, start=0, end=9)
+    identified = []
+
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict_batch", return_value=[[entity]]),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", new=AsyncMock(return_value="5640")),
+    ):
+        await drug_analyzer.analyze_batch(
+            ["Ibuprofen"], on_identified=lambda name, rxcui: identified.append((name, rxcui)),
+        )
+
+    assert identified == [("Ibuprofen", "5640")]
+
+
+# ─── Gazetteer fast path tests ────────────────────────────────────────────────
+
+
+@pytest.fixture
+def gazetteer():
+    matcher = Gazetteer({"ibuprofen": "DB01050", "advil": "DB01050", "warfarin": "DB00682"})
+    with patch("app.services.drug_analyzer.drugbank_client.gazetteer", return_value=matcher):
+        yield matcher
+
+
+@pytest.mark.asyncio
+async def test_gazetteer_hit_skips_ner(gazetteer):
+    """Known names are returned by the gazetteer, one per drug, without a model pass."""
+    predict = MagicMock()
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict", predict),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", new=AsyncMock(return_value="5640")),
+    ):
+        results = await drug_analyzer.analyze("ADVIL Ibuprofen 200 mg")
+
+    predict.assert_not_called()
+    assert results == [{
+        "rxcui": "5640", "name": "ADVIL", "dosage": "200 mg",
+        "form": None, "source": "gazetteer", "confidence": 1.0,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_gazetteer_needs_word_boundaries(gazetteer):
+    """A name inside a longer word is not a match, so NER runs."""
+    predict = MagicMock(return_value=[])
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict", predict),
+        patch(
+            "app.services.drug_analyzer.rxnorm_client.approximate_term",
+            new=AsyncMock(return_value=[]),
+        ),
+    ):
+        await drug_analyzer.analyze("Advilon 200 mg")
+
+    predict.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_gazetteer_match_not_in_rxnorm_falls_through_to_ner(gazetteer):
+    entity = ner_model.Entity(text="Warfarin", label="CHEM", score=0.9, start=0, end=8)
+    get_rxcui = AsyncMock(side_effect=[None, "11289"])
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict", return_value=[entity]),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", get_rxcui),
+    ):
+        results = await drug_analyzer.analyze("Warfarin 5 mg")
+
+    assert [(r["name"], r["source"]) for r in results] == [("Warfarin", "ner")]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_ner_only_on_texts_without_gazetteer_hits(gazetteer):
+    entity = ner_model.Entity(text="Codeine", label="CHEM", score=0.9, start=0, end=7)
+    predict_batch = MagicMock(return_value=[[entity]])
+    get_rxcui = AsyncMock(side_effect=lambda name: {"warfarin": "11289", "codeine": "2670"}[name.lower()])
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict_batch", predict_batch),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", get_rxcui),
+    ):
+        results = await drug_analyzer.analyze_batch(["Warfarin 5 mg", "Codeine 30 mg"])
+
+    predict_batch.assert_called_once_with(["Codeine 30 mg"])
+    assert [[(r["name"], r["source"]) for r in result] for result in results] == [
+        [("Warfarin", "gazetteer")], [("Codeine", "ner")],
+    ]
+
+
+# ─── Overload tests ───────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_minimal_level_skips_ner_and_caps_fallback_words():
+    predict = MagicMock()
+    approximate_term = AsyncMock(return_value=[])
+    with (
+        patch("app.services.drug_analyzer.overload.level", return_value=2),
+        patch("app.services.drug_analyzer.ner_model.predict", predict),
+        patch("app.services.drug_analyzer.rxnorm_client.approximate_term", approximate_term),
+    ):
+        await drug_analyzer.analyze("one two three four five six seven eight nine")
+
+    predict.assert_not_called()
+    assert approximate_term.await_count == 5
+
+
+# ─── Lite profile tests ───────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_lite_profile_never_runs_ner(gazetteer):
+    predict, predict_batch = MagicMock(), MagicMock()
+    with (
+        patch("app.services.drug_analyzer.profile.PILLCHECKER_PROFILE", "lite"),
+        patch("app.services.drug_analyzer.ner_model.predict", predict),
+        patch("app.services.drug_analyzer.ner_model.predict_batch", predict_batch),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", new=AsyncMock(return_value="11289")),
+        patch(
+            "app.services.drug_analyzer.rxnorm_client.approximate_term",
+            new=AsyncMock(return_value=[]),
+        ),
+    ):
+        assert await drug_analyzer.analyze("Unknownol 5 mg") == []
+        batch = await drug_analyzer.analyze_batch(["Unknownol 5 mg"])
+        live = await drug_analyzer.analyze_incremental("Warfarin\n5 mg", drug_analyzer.ScanState())
+
+    predict.assert_not_called()
+    predict_batch.assert_not_called()
+    assert batch == [[]]
+    assert [(d["name"], d["source"]) for d in live] == [("Warfarin", "gazetteer")]
+
+
+# ─── Incremental (live scan) tests ────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_incremental_uses_gazetteer_under_minimal_overload(gazetteer):
+    """At MINIMAL live scans skip NER too; lines matched then get NER once load eases."""
+    predict_batch = MagicMock(return_value=[[], []])
+    state = drug_analyzer.ScanState()
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict_batch", predict_batch),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", new=AsyncMock(return_value="11289")),
+        patch(
+            "app.services.drug_analyzer.rxnorm_client.approximate_term",
+            new=AsyncMock(return_value=[]),
+        ),
+    ):
+        with patch("app.services.drug_analyzer.overload.level", return_value=2):
+            degraded = await drug_analyzer.analyze_incremental("Warfarin\n5 mg", state)
+        predict_batch.assert_not_called()
+        assert [(d["name"], d["source"]) for d in degraded] == [("Warfarin", "gazetteer")]
+        assert state.line_entities == {}
+
+        await drug_analyzer.analyze_incremental("Warfarin\n5 mg", state)
+    predict_batch.assert_called_once_with(["Warfarin", "5 mg"])
+
+
+@pytest.mark.asyncio
+async def test_incremental_runs_ner_only_on_changed_lines():
+    """Unchanged lines reuse their entities; names already resolved are not looked up again."""
+    def predict_batch(lines):
+        return [
+            [ner_model.Entity(text=word, label="CHEM", score=0.9, start=0, end=len(word))]
+            for word in (line.split()[0] for line in lines)
+        ]
+
+    predict = MagicMock(side_effect=predict_batch)
+    get_rxcui = AsyncMock(side_effect=lambda name: {"Ibuprofen": "5640", "Codeine": "2670"}.get(name))
+    state = drug_analyzer.ScanState()
+
+    with (
+        patch("app.services.drug_analyzer.ner_model.predict_batch", predict),
+        patch("app.services.drug_analyzer.rxnorm_client.get_rxcui", get_rxcui),
+    ):
+        first = await drug_analyzer.analyze_incremental("Ibuprofen 200 mg\nTabl", state)
+        second = await drug_analyzer.analyze_incremental("Ibuprofen 200 mg\nCodeine 10 mg", state)
+
+    assert [d["name"] for d in first] == ["Ibuprofen"]
+    assert sorted(d["name"] for d in second) == ["Codeine", "Ibuprofen"]
+    assert [c.args[0] for c in predict.call_args_list] == [["Ibuprofen 200 mg", "Tabl"], ["Codeine 10 mg"]]
+    assert [c.args[0] for c in get_rxcui.await_args_list] == ["Ibuprofen", "Tabl", "Codeine"]
+    assert set(state.line_entities) == {"Ibuprofen 200 mg", "Codeine 10 mg"}
@@ -1,9 +1,29 @@
 """Tests for the DrugBank MCP client."""
 
+import asyncio
 import time
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from app.clients import drugbank_client
+from app.clients import drugbank_client, interaction_graph
+from app.nlp.gazetteer import Gazetteer
+
+
+@pytest.fixture(autouse=True)
+def reset_breaker():
+    drugbank_client._breaker = drugbank_client._CircuitBreaker(
+        drugbank_client.DRUGBANK_BREAKER_THRESHOLD, drugbank_client.DRUGBANK_BREAKER_RESET,
+    )
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_aliases():
+    drugbank_client._aliases = {}
+    drugbank_client._gazetteer = None
+    yield
+    drugbank_client._aliases = {}
+    drugbank_client._gazetteer = None
+    interaction_graph.expect_source(None)
 
 
 class TestResolveId:
@@ -159,12 +179,27 @@ class TestGetInteractions:
             ),
         ]
         await drugbank_client.get_interactions("ibuprofen")
-        # Expire all cache entries
-        for key in drugbank_client._cache:
-            drugbank_client._cache[key] = (drugbank_client._cache[key][0], time.time() - 1)
-        await drugbank_client.get_interactions("ibuprofen")
+        # Expire all cache entries past their hard TTL
+        later = time.time() + drugbank_client._cache.hard_ttl + 1
+        with patch("app.clients.ttl_cache.time.time", return_value=later):
+            await drugbank_client.get_interactions("ibuprofen")
         assert mock_session.call_tool.call_count == 4
 
+    async def test_stale_entry_served_while_refreshed(self, mock_session):
+        drugbank_client._aliases = {"ibuprofen": "DB01050"}
+        drugbank_client._cache_set("interactions:DB01050", [{"drug": "Old", "drugbank_id": None, "description": None}], drugbank_client._data_version)
+        mock_session.call_tool.return_value = MagicMock(
+            content=[MagicMock(text='{"method":"get_drug_interactions_batch","results":[{"drugbank_id":"DB01050","drug_name":"Ibuprofen","interactions":[{"drugbank_id":"DB00682","name":"Warfarin","description":"bleeding"}]}]}')],
+            isError=False,
+        )
+        stale = time.time() + drugbank_client._CACHE_TTL + 1
+        with patch("app.clients.ttl_cache.time.time", return_value=stale):
+            result = await drugbank_client.get_interactions("ibuprofen")
+            assert result[0]["drug"] == "Old"
+            await asyncio.gather(*drugbank_client._cache._refreshing.values())
+        refreshed = await drugbank_client.get_interactions("ibuprofen")
+        assert refreshed[0]["drug"] == "Warfarin"
+
     async def test_raises_on_connection_error(self, mock_session):
         mock_session.call_tool.side_effect = Exception("Connection refused")
         with pytest.raises(drugbank_client.DrugBankUnavailableError):
@@ -184,16 +219,186 @@ class TestGetInteractions:
             await drugbank_client.get_interactions("ibuprofen")
 
 
+def _tool_result(text, is_error=False):
+    return MagicMock(content=[MagicMock(text=text)], isError=is_error)
+
+
+class TestGetInteractionsBatch:
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        drugbank_client._cache.clear()
+        yield
+        drugbank_client._cache.clear()
+
+    @pytest.fixture
+    def mock_session(self):
+        session = AsyncMock()
+        drugbank_client._session = session
+        yield session
+        drugbank_client._session = None
+
+    async def test_two_round_trips_for_whole_regimen(self, mock_session):
+        mock_session.call_tool.side_effect = [
+            _tool_result('{"method":"search_by_name_batch","count":3,"results":['
+                         '{"query":"ibuprofen","count":1,"results":[{"drugbank_id":"DB01050"}]},'
+                         '{"query":"warfarin","count":1,"results":[{"drugbank_id":"DB00682"}]},'
+                         '{"query":"notadrug","count":0,"results":[]}]}'),
+            _tool_result('{"method":"get_drug_interactions_batch","count":2,"results":['
+                         '{"drugbank_id":"DB01050","interactions":[{"drugbank_id":"DB00682","name":"Warfarin","description":"Bleeding."}]},'
+                         '{"drugbank_id":"DB00682","interactions":[{"drugbank_id":"DB01050","name":"Ibuprofen","description":"Bleeding."}]}]}'),
+        ]
+        result = await drugbank_client.get_interactions_batch(["ibuprofen", "warfarin", "notadrug"])
+
+        assert result["ibuprofen"] == [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "Bleeding."}]
+        assert result["warfarin"] == [{"drug": "Ibuprofen", "drugbank_id": "DB01050", "description": "Bleeding."}]
+        assert result["notadrug"] == []
+        assert mock_session.call_tool.call_count == 2
+        mock_session.call_tool.assert_any_call(
+            "drugbank_info",
+            {"method": "search_by_name_batch", "queries": ["ibuprofen", "warfarin", "notadrug"], "limit": 1},
+        )
+        mock_session.call_tool.assert_any_call(
+            "drugbank_info",
+            {"method": "get_drug_interactions_batch", "drugbank_ids": ["DB01050", "DB00682"]},
+        )
+
+    async def test_cached_drugs_skip_round_trips(self, mock_session):
+        drugbank_client._cache_set("dbid:ibuprofen", "DB01050", drugbank_client._data_version)
+        drugbank_client._cache_set("interactions:DB01050", [{"drug": "Warfarin", "description": "x"}], drugbank_client._data_version)
+        drugbank_client._cache_set("dbid:warfarin", "DB00682", drugbank_client._data_version)
+        mock_session.call_tool.return_value = _tool_result(
+            '{"results":[{"drugbank_id":"DB00682","interactions":[]}]}'
+        )
+        result = await drugbank_client.get_interactions_batch(["ibuprofen", "warfarin"])
+
+        assert result == {"ibuprofen": [{"drug": "Warfarin", "description": "x"}], "warfarin": []}
+        mock_session.call_tool.assert_called_once_with(
+            "drugbank_info",
+            {"method": "get_drug_interactions_batch", "drugbank_ids": ["DB00682"]},
+        )
+        await drugbank_client.get_interactions_batch(["ibuprofen", "warfarin"])
+        assert mock_session.call_tool.call_count == 1
+
+    async def test_per_item_errors_degrade_to_empty(self, mock_session):
+        mock_session.call_tool.side_effect = [
+            _tool_result('{"results":[{"query":"a(b","error":"fts5: syntax error"},'
+                         '{"query":"warfarin","results":[{"drugbank_id":"DB00682"}]}]}'),
+            _tool_result('{"results":[{"drugbank_id":"DB00682","error":"Drug not found: DB00682"}]}'),
+        ]
+        result = await drugbank_client.get_interactions_batch(["a(b", "warfarin"])
+        assert result == {"a(b": [], "warfarin": []}
+
+    async def test_unavailable_maps_every_pending_name_to_error(self, mock_session):
+        drugbank_client._cache_set("dbid:ibuprofen", "DB01050", drugbank_client._data_version)
+        drugbank_client._cache_set("interactions:DB01050", [], drugbank_client._data_version)
+        mock_session.call_tool.side_effect = Exception("broken pipe")
+        result = await drugbank_client.get_interactions_batch(["ibuprofen", "warfarin", "aspirin"])
+
+        assert result["ibuprofen"] == []
+        assert isinstance(result["warfarin"], drugbank_client.DrugBankUnavailableError)
+        assert isinstance(result["aspirin"], drugbank_client.DrugBankUnavailableError)
+
+    async def test_fetch_failure_keeps_resolved_not_found_names(self, mock_session):
+        mock_session.call_tool.side_effect = [
+            _tool_result('{"results":[{"results":[{"drugbank_id":"DB00682"}]},{"results":[]}]}'),
+            _tool_result('{}', is_error=True),
+        ]
+        result = await drugbank_client.get_interactions_batch(["warfarin", "notadrug"])
+        assert isinstance(result["warfarin"], drugbank_client.DrugBankUnavailableError)
+        assert result["notadrug"] == []
+
+
+class TestAliasIndex:
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        drugbank_client._cache.clear()
+        yield
+        drugbank_client._cache.clear()
+
+    @pytest.fixture
+    def mock_session(self):
+        session = AsyncMock()
+        drugbank_client._session = session
+        yield session
+        drugbank_client._session = None
+
+    async def test_load_builds_index(self):
+        session = AsyncMock()
+        session.call_tool.return_value = _tool_result(
+            '{"method":"get_alias_index","count":1,"drugs":[{"drugbank_id":"DB01050",'
+            '"name":"Ibuprofen","synonyms":[],"salts":["Ibuprofen sodium"],"products":["Advil"]}]}'
+        )
+        aliases, gazetteer = await drugbank_client._load_aliases(session)
+        assert aliases == {
+            "ibuprofen": "DB01050", "ibuprofen sodium": "DB01050", "advil": "DB01050",
+        }
+        assert [m.drugbank_id for m in gazetteer.find("ADVIL 200 mg")] == ["DB01050"]
+        assert drugbank_client._aliases == {}  # installed by _run_session with the session
+
+    async def test_load_failure_leaves_index_empty(self):
+        session = AsyncMock()
+        session.call_tool.return_value = _tool_result(
+            '{"error":"get_alias_index requires the SQLite database"}'
+        )
+        assert await drugbank_client._load_aliases(session) == ({}, None)
+
+    async def test_aliases_share_one_fetch_and_cache_entry(self, mock_session):
+        drugbank_client._aliases = {"advil": "DB01050", "ibuprofen": "DB01050"}
+        mock_session.call_tool.return_value = _tool_result(
+            '{"results":[{"drugbank_id":"DB01050","interactions":[]}]}'
+        )
+        result = await drugbank_client.get_interactions_batch(["Advil", "IBUPROFEN"])
+
+        assert result == {"Advil": [], "IBUPROFEN": []}
+        mock_session.call_tool.assert_called_once_with(
+            "drugbank_info",
+            {"method": "get_drug_interactions_batch", "drugbank_ids": ["DB01050"]},
+        )
+        assert await drugbank_client.get_interactions("advil") == []
+        assert mock_session.call_tool.call_count == 1
+
+    async def test_bare_drugbank_id_skips_search(self, mock_session):
+        mock_session.call_tool.return_value = _tool_result(
+            '{"results":[{"drugbank_id":"DB01050","interactions":[]}]}'
+        )
+        result = await drugbank_client.get_interactions_batch(["db01050"])
+        assert result == {"db01050": []}
+        mock_session.call_tool.assert_called_once_with(
+            "drugbank_info",
+            {"method": "get_drug_interactions_batch", "drugbank_ids": ["DB01050"]},
+        )
+
+    async def test_resolve_rxcuis_through_crosswalk(self, mock_session):
+        mock_session.call_tool.return_value = _tool_result(
+            '{"method":"resolve_rxcui_batch","count":2,"results":['
+            '{"rxcui":"5640","drugbank_ids":["DB01050"]},{"rxcui":"99999","drugbank_ids":[]}]}'
+        )
+        assert await drugbank_client.resolve_rxcuis(["5640", "99999"]) == {
+            "5640": "DB01050", "99999": None,
+        }
+        # Cached, including the unmapped RxCUI
+        await drugbank_client.resolve_rxcuis(["5640", "99999"])
+        mock_session.call_tool.assert_called_once_with(
+            "drugbank_info", {"method": "resolve_rxcui_batch", "rxcuis": ["5640", "99999"]},
+        )
+
+    async def test_canonical_id(self):
+        drugbank_client._aliases = {"advil": "DB01050"}
+        drugbank_client._cache_set("dbid:coumadin 5mg", "DB00682", drugbank_client._data_version)
+        assert drugbank_client.canonical_id("ADVIL®") == "DB01050"
+        assert drugbank_client.canonical_id("Coumadin 5mg") == "DB00682"
+        assert drugbank_client.canonical_id("notadrug") is None
+        assert drugbank_client.canonical_id(" db00945 ") == "DB00945"
+
+
 class TestConnect:
     @pytest.fixture(autouse=True)
-    def reset_state(self):
+    async def reset_state(self):
         orig_session = drugbank_client._session
-        orig_streams = drugbank_client._streams
         drugbank_client._session = None
-        drugbank_client._streams = None
         yield
+        await drugbank_client.close()
         drugbank_client._session = orig_session
-        drugbank_client._streams = orig_streams
 
     async def test_connect_discovers_drugbank_info_tool(self):
         mock_session = AsyncMock()
@@ -249,3 +454,317 @@ class TestHealthCheck:
         session.list_tools.side_effect = Exception("broken pipe")
         drugbank_client._session = session
         assert await drugbank_client.health_check() is False
+
+
+def _tools_result():
+    tools_result = MagicMock()
+    tool_mock = MagicMock()
+    tool_mock.name = "drugbank_info"
+    tools_result.tools = [tool_mock]
+    return tools_result
+
+
+def _mock_streams():
+    streams = AsyncMock()
+    streams.__aenter__.return_value = (AsyncMock(), AsyncMock())
+    streams.__aexit__.return_value = None
+    return streams
+
+
+class TestSupervisor:
+    @pytest.fixture(autouse=True)
+    async def reset_state(self):
+        drugbank_client._session = None
+        drugbank_client._restarts = 0
+        drugbank_client._down_since = None
+        drugbank_client._last_recovery = None
+        yield
+        await drugbank_client.close()
+        drugbank_client._restarts = 0
+        drugbank_client._down_since = None
+        drugbank_client._last_recovery = None
+
+    async def test_respawns_dead_session(self):
+        first, second = AsyncMock(), AsyncMock()
+        first.list_tools.return_value = _tools_result()
+        second.list_tools.return_value = _tools_result()
+        first.call_tool.side_effect = Exception("broken pipe")
+
+        with patch("app.clients.drugbank_client.stdio_client", side_effect=[_mock_streams(), _mock_streams()]), \
+             patch("app.clients.drugbank_client.ClientSession", side_effect=[first, second]):
+            await drugbank_client.connect()
+            assert drugbank_client._session is first
+
+            with pytest.raises(drugbank_client.DrugBankUnavailableError):
+                await drugbank_client._call_tool({"method": "search_by_name", "query": "x"})
+
+            await asyncio.wait_for(drugbank_client._ready.wait(), 1)
+
+        assert drugbank_client._session is second
+        second.initialize.assert_called_once()
+        status = drugbank_client.status()
+        assert status["restarts"] == 1
+        assert status["last_recovery_seconds"] is not None
+        assert status["down_for_seconds"] is None
+
+    async def test_caller_waits_for_restart_in_progress(self):
+        session = AsyncMock()
+        session.list_tools.return_value = _tools_result()
+        session.call_tool.return_value = MagicMock(isError=False)
+        streams = _mock_streams()
+        attempts = 0
+
+        async def slow_enter():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise Exception("node not found")
+            return (AsyncMock(), AsyncMock())
+
+        streams.__aenter__.side_effect = slow_enter
+
+        with patch("app.clients.drugbank_client.stdio_client", return_value=streams), \
+             patch("app.clients.drugbank_client.ClientSession", return_value=session), \
+             patch("app.clients.drugbank_client._RESTART_BACKOFF_MIN", 0.01):
+            await drugbank_client.connect()
+            assert drugbank_client._session is None
+            result, _ = await drugbank_client._call_tool({"method": "search_by_name", "query": "x"})
+
+        assert result.isError is False
+        session.call_tool.assert_called_with("drugbank_info", {"method": "search_by_name", "query": "x"})
+
+
+class TestDataSwap:
+    @pytest.fixture(autouse=True)
+    async def reset_state(self):
+        drugbank_client._session = None
+        drugbank_client._data_version = None
+        drugbank_client._cache.clear()
+        yield
+        await drugbank_client.close()
+        drugbank_client._data_version = None
+        drugbank_client._cache.clear()
+
+    async def test_new_version_swaps_session_and_drops_old_entries(self):
+        old, new = AsyncMock(), AsyncMock()
+        old.list_tools.return_value = _tools_result()
+        new.list_tools.return_value = _tools_result()
+        swapped = []
+        drugbank_client.on_data_swap(lambda before, after: swapped.append((before, after)))
+
+        with patch("app.clients.drugbank_client.stdio_client", side_effect=[_mock_streams(), _mock_streams()]), \
+             patch("app.clients.drugbank_client.ClientSession", side_effect=[old, new]), \
+             patch("app.clients.drugbank_client.DRUGBANK_DB_WATCH_INTERVAL", 0), \
+             patch("app.clients.drugbank_client.DRUGBANK_CALL_TIMEOUT", 0.01), \
+             patch("app.clients.interaction_graph.file_version", return_value="v1"):
+            await drugbank_client.connect()
+            assert drugbank_client._session is old
+            assert drugbank_client.data_version() == "v1"
+            drugbank_client._cache_set("dbid:ibuprofen", "DB01050", drugbank_client._data_version)
+            old_supervisor = drugbank_client._supervisor
+
+            with patch("app.clients.interaction_graph.file_version", return_value="v2"):
+                assert await drugbank_client._swap() is True
+
+        assert drugbank_client._session is new
+        assert drugbank_client.data_version() == "v2"
+        assert old_supervisor.done()
+        assert drugbank_client._cache_get("dbid:ibuprofen") is drugbank_client._CACHE_MISS
+        assert swapped[-1] == ("v1", "v2")
+        drugbank_client._swap_listeners.pop()
+
+    async def test_failed_swap_keeps_current_session(self):
+        old = AsyncMock()
+        old.list_tools.return_value = _tools_result()
+        broken = _mock_streams()
+        broken.__aenter__.side_effect = Exception("database is locked")
+
+        with patch("app.clients.drugbank_client.stdio_client", side_effect=[_mock_streams(), broken]), \
+             patch("app.clients.drugbank_client.ClientSession", return_value=old), \
+             patch("app.clients.drugbank_client.DRUGBANK_DB_WATCH_INTERVAL", 0), \
+             patch("app.clients.interaction_graph.file_version", return_value="v1"):
+            await drugbank_client.connect()
+            drugbank_client._cache_set("dbid:ibuprofen", "DB01050", drugbank_client._data_version)
+            with patch("app.clients.interaction_graph.file_version", return_value="v2"):
+                assert await drugbank_client._swap() is False
+
+        assert drugbank_client._session is old
+        assert drugbank_client.data_version() == "v1"
+        assert drugbank_client._cache_get("dbid:ibuprofen") == "DB01050"
+
+    async def test_alias_index_switches_with_the_session(self):
+        old, new = AsyncMock(), AsyncMock()
+        old.list_tools.return_value = _tools_result()
+        new.list_tools.return_value = _tools_result()
+        old.call_tool.return_value = _tool_result(
+            '{"drugs":[{"drugbank_id":"DB01050","name":"Ibuprofen"}]}'
+        )
+        new.call_tool.return_value = _tool_result(
+            '{"drugs":[{"drugbank_id":"DB99999","name":"Ibuprofen"}]}'
+        )
+        seen_while_loading = []
+
+        def build(aliases):
+            seen_while_loading.append((drugbank_client._session, dict(drugbank_client._aliases)))
+            return Gazetteer(aliases)
+
+        with patch("app.clients.drugbank_client.stdio_client", side_effect=[_mock_streams(), _mock_streams()]), \
+             patch("app.clients.drugbank_client.ClientSession", side_effect=[old, new]), \
+             patch("app.clients.drugbank_client.DRUGBANK_DB_WATCH_INTERVAL", 0), \
+             patch("app.clients.drugbank_client.DRUGBANK_CALL_TIMEOUT", 0.01), \
+             patch("app.clients.interaction_graph.file_version", return_value="v1"):
+            await drugbank_client.connect()
+            with patch("app.clients.interaction_graph.file_version", return_value="v2"), \
+                 patch("app.clients.drugbank_client.Gazetteer", side_effect=build):
+                assert await drugbank_client._swap() is True
+
+        # The old child kept serving with its own index while the new one loaded
+        assert seen_while_loading == [(old, {"ibuprofen": "DB01050"})]
+        assert drugbank_client._session is new
+        assert drugbank_client._aliases == {"ibuprofen": "DB99999"}
+        assert drugbank_client.gazetteer().find("ibuprofen")[0].drugbank_id == "DB99999"
+
+    async def test_call_straddling_a_swap_is_not_cached(self):
+        old, new = AsyncMock(), AsyncMock()
+        drugbank_client._session, drugbank_client._data_version = old, "v1"
+
+        async def swap_mid_call(*args):
+            drugbank_client._session, drugbank_client._data_version = new, "v2"
+            drugbank_client._invalidate("v1", "v2")
+            return _tool_result('{"drug_name":"Ibuprofen","interactions":[{"name":"Warfarin"}]}')
+
+        old.call_tool.side_effect = swap_mid_call
+        interactions = await drugbank_client.get_interactions("DB01050")
+
+        assert interactions[0]["drug"] == "Warfarin"
+        assert drugbank_client._cache_get("interactions:DB01050") is drugbank_client._CACHE_MISS
+
+    async def test_child_opens_the_watched_database(self):
+        session = AsyncMock()
+        session.list_tools.return_value = _tools_result()
+        with patch("app.clients.drugbank_client.stdio_client", return_value=_mock_streams()) as stdio, \
+             patch("app.clients.drugbank_client.ClientSession", return_value=session), \
+             patch("app.clients.drugbank_client.DRUGBANK_DB_WATCH_INTERVAL", 0), \
+             patch("app.clients.drugbank_client.DRUGBANK_DB_PATH", "/data/drugbank-v2.db"):
+            await drugbank_client.connect()
+        assert stdio.call_args.args[0].env["DRUGBANK_DB_PATH"] == "/data/drugbank-v2.db"
+
+    async def test_graph_follows_the_served_version(self):
+        session = AsyncMock()
+        session.list_tools.return_value = _tools_result()
+        with patch("app.clients.drugbank_client.stdio_client", return_value=_mock_streams()), \
+             patch("app.clients.drugbank_client.ClientSession", return_value=session), \
+             patch("app.clients.drugbank_client.DRUGBANK_DB_WATCH_INTERVAL", 0), \
+             patch("app.clients.drugbank_client.interaction_graph.expect_source") as expect, \
+             patch("app.clients.interaction_graph.file_version", return_value="v1"):
+            await drugbank_client.connect()
+        assert expect.call_args.args == ("v1",)
+
+    async def test_graph_reload_drops_entries_cached_from_the_old_graph(self):
+        drugbank_client._data_version = "v1"
+        drugbank_client._cache_set("interactions:DB01050", [{"drug": "Warfarin"}], "v1")
+        sleeps = 0
+
+        async def sleep(_):
+            nonlocal sleeps
+            sleeps += 1
+            if sleeps > 1:
+                raise asyncio.CancelledError
+
+        with patch("app.clients.drugbank_client.asyncio.sleep", side_effect=sleep), \
+             patch("app.clients.interaction_graph.file_version", return_value="g2"), \
+             patch("app.clients.interaction_graph.load", return_value=True):
+            with pytest.raises(asyncio.CancelledError):
+                await drugbank_client._watch_data()
+
+        assert drugbank_client._graph_version == "g2"
+        assert drugbank_client._cache_get("interactions:DB01050") is drugbank_client._CACHE_MISS
+
+
+class TestCallDeadline:
+    @pytest.fixture
+    def mock_session(self):
+        session = AsyncMock()
+        drugbank_client._session = session
+        yield session
+        drugbank_client._session = None
+
+    async def test_hung_call_times_out_and_drops_session(self, mock_session):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        mock_session.call_tool.side_effect = hang
+        with patch("app.clients.drugbank_client.DRUGBANK_CALL_TIMEOUT", 0.01):
+            with pytest.raises(drugbank_client.DrugBankUnavailableError, match="timed out"):
+                await drugbank_client._call_tool({"method": "search_by_name", "query": "x"})
+        assert drugbank_client._session is None
+
+    async def test_wait_for_restart_counts_against_the_deadline(self):
+        session = AsyncMock()
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        async def restart():
+            await asyncio.sleep(0.08)
+            drugbank_client._session = session
+            drugbank_client._ready.set()
+
+        session.call_tool.side_effect = hang
+        drugbank_client._ready = asyncio.Event()
+        drugbank_client._supervisor = asyncio.create_task(restart())
+        start = time.monotonic()
+        try:
+            with patch("app.clients.drugbank_client.DRUGBANK_CALL_TIMEOUT", 0.1):
+                with pytest.raises(drugbank_client.DrugBankUnavailableError, match="timed out"):
+                    await drugbank_client._call_tool({"method": "search_by_name", "query": "x"})
+        finally:
+            drugbank_client._supervisor = None
+            drugbank_client._ready = None
+            drugbank_client._session = None
+        assert time.monotonic() - start < 0.15
+
+    async def test_error_result_does_not_drop_session(self, mock_session):
+        mock_session.call_tool.return_value = MagicMock(content=[MagicMock(text="{}")], isError=True)
+        with pytest.raises(drugbank_client.DrugBankUnavailableError):
+            await drugbank_client._resolve_drugbank_id("ibuprofen")
+        assert drugbank_client._session is mock_session
+        assert drugbank_client._breaker.failures == 0
+
+
+class TestCircuitBreaker:
+    async def test_opens_after_threshold_and_fails_fast(self):
+        session = AsyncMock()
+        session.call_tool.side_effect = Exception("boom")
+        breaker = drugbank_client._CircuitBreaker(threshold=2, reset_timeout=60)
+        drugbank_client._breaker = breaker
+
+        for _ in range(2):
+            drugbank_client._session = session
+            with pytest.raises(drugbank_client.DrugBankUnavailableError):
+                await drugbank_client._call_tool({"method": "search_by_name"})
+        assert breaker.state == "open"
+
+        drugbank_client._session = session
+        with pytest.raises(drugbank_client.DrugBankUnavailableError, match="circuit breaker open"):
+            await drugbank_client._call_tool({"method": "search_by_name"})
+        assert session.call_tool.call_count == 2
+        drugbank_client._session = None
+
+    def test_half_open_allows_single_trial(self):
+        breaker = drugbank_client._CircuitBreaker(threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker._opened_at -= 61
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+    def test_failed_trial_reopens_and_success_closes(self):
+        breaker = drugbank_client._CircuitBreaker(threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == "open"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow() is True
@@ -0,0 +1,54 @@
+"""Tests for the Aho-Corasick drug name gazetteer."""
+
+from app.nlp.gazetteer import Gazetteer
+
+ALIASES = {
+    "ibuprofen": "DB01050",
+    "ibuprofen sodium": "DB01050",
+    "acetylsalicylic acid": "DB00945",
+    "salicylic acid": "DB00936",
+    "co codamol": "DB14009",
+    "codeine": "DB00318",
+    "tab": "DB99999",
+    "1000": "DB99998",
+    "water": "DB09145",
+    "lactose": "DB04465",
+}
+
+
+class TestFind:
+    def test_matches_keep_original_spelling_and_offsets(self):
+        text = "NUROFEN Ibuprofen-Sodium 256 mg"
+        [match] = Gazetteer(ALIASES).find(text)
+        assert (match.text, match.drugbank_id) == ("Ibuprofen-Sodium", "DB01050")
+        assert text[match.start:match.end] == match.text
+
+    def test_longest_overlapping_match_wins(self):
+        [match] = Gazetteer(ALIASES).find("Acetylsalicylic acid 75 mg")
+        assert match.drugbank_id == "DB00945"
+
+    def test_word_boundaries_are_required(self):
+        assert Gazetteer(ALIASES).find("Ibuprofenum codeines xcodeine") == []
+
+    def test_accents_and_punctuation_are_normalized(self):
+        matches = Gazetteer(ALIASES).find("CO-CODAMOL 8/500, Codéine")
+        assert [m.drugbank_id for m in matches] == ["DB14009", "DB00318"]
+        assert matches[1].text == "Codéine"
+
+    def test_short_and_numeric_aliases_are_skipped(self):
+        gazetteer = Gazetteer(ALIASES)
+        assert len(gazetteer) == 6
+        assert gazetteer.find("1 tab 1000 mg") == []
+
+    def test_excipients_and_plain_words_are_skipped(self):
+        text = "Ibuprofen 200 mg. Also contains: lactose, purified water"
+        assert [m.drugbank_id for m in Gazetteer(ALIASES).find(text)] == ["DB01050"]
+
+    def test_alias_ending_inside_a_longer_partial_match(self):
+        # "co codamol" only starts an alias; "codamol" is found through its suffix link
+        gazetteer = Gazetteer({"co codamol forte": "DB14009", "codamol": "DB00318"})
+        [match] = gazetteer.find("Co-codamol 30/500")
+        assert (match.text, match.drugbank_id) == ("codamol", "DB00318")
+
+    def test_empty_index(self):
+        assert Gazetteer({}).find("Ibuprofen") == []
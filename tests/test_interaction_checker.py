@@ -1,20 +1,47 @@
 """Tests for the interaction checker service."""
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 from app.clients.drugbank_client import DrugBankUnavailableError
 from app.services import interaction_checker
 
 
+def batch_via(get_interactions):
+    """Build a get_interactions_batch stand-in that delegates per drug.
+
+    Lets tests script per-drug results (and failures) on get_interactions
+    while the checker fetches through the batch API.
+    """
+    async def get_interactions_batch(names):
+        results = {}
+        for name in names:
+            try:
+                results[name] = await get_interactions(name)
+            except Exception as exc:
+                results[name] = exc
+        return results
+    return get_interactions_batch
+
+
 @pytest.fixture(autouse=True)
 def mock_drugbank():
     """Mock drugbank_client.get_interactions for all tests."""
     with patch("app.services.interaction_checker.drugbank_client") as mock:
         mock.get_interactions = AsyncMock()
+        mock.get_interactions_batch = AsyncMock(side_effect=batch_via(mock.get_interactions))
+        mock.canonical_id.return_value = None
         mock.DrugBankUnavailableError = DrugBankUnavailableError
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def reset_pair_cache():
+    interaction_checker._pair_cache.clear()
+    yield
+    interaction_checker._pair_cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def mock_severity():
     """Mock severity_classifier.classify for all tests."""
@@ -96,6 +123,13 @@ class TestInteractionChecker:
         pairs = [(i["drug_a"], i["drug_b"]) for i in result["interactions"]]
         assert ("warfarin", "aspirin") in pairs
 
+    async def test_fetches_whole_regimen_in_one_batch(self, mock_drugbank):
+        mock_drugbank.get_interactions.return_value = []
+        await interaction_checker.check(["ibuprofen", "warfarin", "ibuprofen", "aspirin"])
+        mock_drugbank.get_interactions_batch.assert_awaited_once_with(
+            ["ibuprofen", "warfarin", "aspirin"],
+        )
+
     async def test_duplicate_drug_names_no_self_interaction(self, mock_drugbank):
         """Duplicate drug names must not produce self-interaction pairs."""
         mock_drugbank.get_interactions.side_effect = [
@@ -107,6 +141,132 @@ class TestInteractionChecker:
         for interaction in result["interactions"]:
             assert interaction["drug_a"] != interaction["drug_b"]
 
+    async def test_aliases_of_one_drug_are_not_paired(self, mock_drugbank):
+        ids = {"Advil": "DB01050", "ibuprofen": "DB01050", "warfarin": "DB00682"}
+        mock_drugbank.canonical_id.side_effect = ids.get
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "bleeding"}],
+            [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "bleeding"}],
+            [{"drug": "Ibuprofen", "drugbank_id": "DB01050", "description": "bleeding"}],
+        ]
+        result = await interaction_checker.check(["Advil", "ibuprofen", "warfarin"])
+        pairs = [(i["drug_a"], i["drug_b"]) for i in result["interactions"]]
+        assert pairs == [("Advil", "warfarin")]
+
+    async def test_matches_partner_by_drugbank_id(self, mock_drugbank):
+        """A brand name matches the generic name in the partner's list via its ID."""
+        ids = {"Advil": "DB01050", "Coumadin": "DB00682"}
+        mock_drugbank.canonical_id.side_effect = ids.get
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "bleeding"}],
+            [],
+        ]
+        result = await interaction_checker.check(["Advil", "Coumadin"])
+        assert result["safe"] is False
+        assert result["interactions"][0]["description"] == "bleeding"
+
+
+class TestCheckRefs:
+    async def test_ids_skip_name_resolution(self, mock_drugbank):
+        mock_drugbank.resolve_rxcuis = AsyncMock(return_value={"11289": "DB00682"})
+        mock_drugbank.get_interactions.return_value = []
+        await interaction_checker.check_refs(
+            [{"drugbank_id": "DB01050", "name": "Ibuprofen"}, {"rxcui": "11289"}, "aspirin"],
+        )
+        mock_drugbank.resolve_rxcuis.assert_awaited_once_with(["11289"])
+        mock_drugbank.get_interactions_batch.assert_awaited_once_with(["DB01050", "DB00682", "aspirin"])
+
+    async def test_unmapped_rxcui_falls_back_to_name(self, mock_drugbank):
+        mock_drugbank.resolve_rxcuis = AsyncMock(return_value={"99999": None})
+        mock_drugbank.get_interactions.return_value = []
+        await interaction_checker.check_refs([{"rxcui": "99999", "name": "Brufen"}, "warfarin"])
+        mock_drugbank.get_interactions_batch.assert_awaited_once_with(["Brufen", "warfarin"])
+
+
+class TestInteractionGraph:
+    @pytest.fixture
+    def mock_graph(self):
+        with patch("app.services.interaction_checker.interaction_graph") as mock:
+            mock.has.return_value = True
+            mock.find.return_value = None
+            yield mock
+
+    async def test_pair_checked_by_edge_lookup(self, mock_drugbank, mock_graph, mock_severity):
+        ids = {"ibuprofen": "DB01050", "warfarin": "DB00682"}
+        mock_drugbank.canonical_id.side_effect = ids.get
+        mock_drugbank.get_interactions.return_value = [{"drug": "Unrelated"}]
+        mock_graph.find.side_effect = lambda a, b: (
+            {"drug": "Warfarin", "description": "bleeding", "severity": "major"}
+            if (a, b) == ("DB01050", "DB00682") else None
+        )
+        result = await interaction_checker.check(["ibuprofen", "warfarin"])
+
+        assert result["interactions"][0]["severity"] == "major"
+        mock_severity.classify.assert_not_called()
+
+    async def test_no_edge_means_no_interaction(self, mock_drugbank, mock_graph):
+        ids = {"ibuprofen": "DB01050", "amoxicillin": "DB01060"}
+        mock_drugbank.canonical_id.side_effect = ids.get
+        mock_drugbank.get_interactions.return_value = [{"drug": "Amoxicillin"}]
+        result = await interaction_checker.check(["ibuprofen", "amoxicillin"])
+
+        assert result["safe"] is True
+        assert mock_graph.find.call_count == 2
+
+
+class TestPairCache:
+    IDS = {"ibuprofen": "DB01050", "Advil": "DB01050", "warfarin": "DB00682", "amoxicillin": "DB01060"}
+
+    async def test_repeat_pair_skips_matching_and_classifier(self, mock_drugbank, mock_severity):
+        mock_drugbank.canonical_id.side_effect = self.IDS.get
+        mock_drugbank.get_interactions.side_effect = lambda name: {
+            "ibuprofen": [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "bleeding"}],
+            "Advil": [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "bleeding"}],
+            "warfarin": [{"drug": "Ibuprofen", "drugbank_id": "DB01050", "description": "bleeding"}],
+        }[name]
+        first = await interaction_checker.check(["ibuprofen", "warfarin"])
+        # Reversed order and a brand alias hit the same unordered pair
+        second = await interaction_checker.check(["warfarin", "Advil"])
+
+        assert mock_severity.classify.call_count == 1
+        assert first["interactions"][0]["drug_a"] == "ibuprofen"
+        assert second["interactions"][0]["drug_a"] == "warfarin"
+        assert second["interactions"][0]["drug_b"] == "Advil"
+        assert second["interactions"][0]["description"] == "bleeding"
+
+    async def test_negative_outcome_is_cached(self, mock_drugbank):
+        mock_drugbank.canonical_id.side_effect = self.IDS.get
+        mock_drugbank.get_interactions.side_effect = lambda name: [{"drug": "Unrelated"}]
+        await interaction_checker.check(["ibuprofen", "amoxicillin"])
+
+        with patch.object(interaction_checker, "_find_interaction", AsyncMock()) as find:
+            result = await interaction_checker.check(["amoxicillin", "ibuprofen"])
+        assert result["safe"] is True
+        find.assert_not_called()
+
+    async def test_negative_not_cached_when_a_list_is_empty(self, mock_drugbank, mock_openfda):
+        mock_drugbank.canonical_id.side_effect = self.IDS.get
+        mock_drugbank.get_interactions.side_effect = [
+            DrugBankUnavailableError("down"),
+            [{"drug": "Unrelated"}],
+        ]
+        await interaction_checker.check(["ibuprofen", "amoxicillin"])
+        assert len(interaction_checker._pair_cache) == 0
+
+    async def test_check_straddling_a_swap_is_not_cached(self, mock_drugbank):
+        mock_drugbank.canonical_id.side_effect = self.IDS.get
+        mock_drugbank.get_interactions.side_effect = lambda name: [{"drug": "Unrelated"}]
+        # Lists fetched from v1, pair finished after the swap to v2
+        mock_drugbank.data_version.side_effect = ["v1", "v2"]
+        result = await interaction_checker.check(["ibuprofen", "amoxicillin"])
+        assert result["safe"] is True
+        assert len(interaction_checker._pair_cache) == 0
+
+    async def test_pairs_without_ids_are_not_cached(self, mock_drugbank):
+        mock_drugbank.get_interactions.return_value = [{"drug": "Unrelated"}]
+        await interaction_checker.check(["ibuprofen", "amoxicillin"])
+        assert len(interaction_checker._pair_cache) == 0
+
 
 @pytest.fixture
 def mock_openfda(mock_drugbank):
@@ -182,3 +342,113 @@ class TestOpenFDAFallback:
         result = await interaction_checker.check(["warfarin", "ibuprofen"])
         assert result["safe"] is True
         assert result["error"] is None
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+class TestDegraded:
+    """Under overload: no zero-shot severity, no OpenFDA fallback, nothing cached."""
+
+    @pytest.fixture(autouse=True)
+    def degraded(self):
+        with patch("app.services.interaction_checker.overload.level", return_value=1):
+            yield
+
+    async def test_severity_without_the_full_model_and_not_cached(self, mock_drugbank, mock_severity):
+        mock_drugbank.canonical_id.side_effect = TestPairCache.IDS.get
+        mock_drugbank.get_interactions.side_effect = lambda name: {
+            "ibuprofen": [{"drug": "Warfarin", "drugbank_id": "DB00682", "description": "bleeding"}],
+            "warfarin": [],
+        }[name]
+        result = await interaction_checker.check(["ibuprofen", "warfarin"])
+        assert result["interactions"][0]["severity"] == "moderate"
+        mock_severity.classify.assert_called_once_with("bleeding", full_model=False)
+        assert len(interaction_checker._pair_cache) == 0
+
+    async def test_openfda_skipped(self, mock_drugbank, mock_openfda):
+        mock_drugbank.get_interactions.return_value = []
+        result = await interaction_checker.check(["ibuprofen", "warfarin"])
+        assert result["safe"] is True
+        mock_openfda.check_pair.assert_not_called()
+
+    async def test_regimen_pairs_not_kept(self, mock_drugbank):
+        mock_drugbank.get_interactions.return_value = [{"drug": "Unrelated"}]
+        pair_results = {}
+        await interaction_checker.check(["ibuprofen", "warfarin"], pair_results=pair_results)
+        assert pair_results == {}
+
+
+class TestStream:
+    async def test_fast_pair_is_emitted_before_slow_fallback(self, mock_drugbank, mock_openfda):
+        """Warfarin+aspirin matches in DrugBank while the ibuprofen pairs wait on OpenFDA."""
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Aspirin", "description": "bleeding"}],
+            [{"drug": "Warfarin", "description": "bleeding"}],
+            [],
+        ]
+        release = asyncio.Event()
+
+        async def slow_check_pair(a, b):
+            await release.wait()
+            return None
+
+        mock_openfda.check_pair.side_effect = slow_check_pair
+        events = interaction_checker.stream(["warfarin", "aspirin", "ibuprofen"])
+        kind, first = await anext(events)
+        assert kind == "interaction"
+        assert (first["drug_a"], first["drug_b"]) == ("warfarin", "aspirin")
+
+        release.set()
+        rest = await _collect(events)
+        assert rest == [("summary", {"safe": False, "error": None})]
+
+    async def test_summary_when_drugbank_unavailable(self, mock_drugbank):
+        mock_drugbank.get_interactions.side_effect = DrugBankUnavailableError("down")
+        events = await _collect(interaction_checker.stream(["ibuprofen", "warfarin"]))
+        assert events == [("summary", {
+            "safe": None, "error": "Drug interaction data temporarily unavailable",
+        })]
+
+    async def test_failed_pair_still_ends_with_summary(self, mock_drugbank, mock_openfda):
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Aspirin", "description": "bleeding"}],
+            [{"drug": "Warfarin", "description": "bleeding"}],
+            [],
+        ]
+        mock_openfda.check_pair.return_value = None
+        check_pair = interaction_checker._check_pair
+
+        async def failing_check_pair(drug_a, drug_b, *args):
+            if "ibuprofen" in (drug_a, drug_b):
+                raise RuntimeError("malformed record")
+            return await check_pair(drug_a, drug_b, *args)
+
+        with patch("app.services.interaction_checker._check_pair", side_effect=failing_check_pair):
+            events = await _collect(
+                interaction_checker.stream(["warfarin", "aspirin", "ibuprofen"])
+            )
+        assert [kind for kind, _ in events] == ["interaction", "summary"]
+        assert events[-1] == ("summary", {
+            "safe": None, "error": "Some drug pairs could not be checked",
+        })
+
+    async def test_closing_early_cancels_pending_pairs(self, mock_drugbank, mock_openfda):
+        mock_drugbank.get_interactions.side_effect = [
+            [{"drug": "Aspirin", "description": "bleeding"}],
+            [{"drug": "Warfarin", "description": "bleeding"}],
+            [],
+        ]
+        started = []
+
+        async def hang(a, b):
+            started.append(asyncio.current_task())
+            await asyncio.sleep(10)
+
+        mock_openfda.check_pair.side_effect = hang
+        events = interaction_checker.stream(["warfarin", "aspirin", "ibuprofen"])
+        await anext(events)
+        await events.aclose()
+        await asyncio.sleep(0)
+        assert started and all(task.done() for task in started)
@@ -0,0 +1,138 @@
+"""Tests for the memory-mapped interaction graph."""
+
+import json
+import sqlite3
+
+import pytest
+
+from app.clients import interaction_graph
+
+
+def _make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE drugs (drugbank_id TEXT, name TEXT, drug_interactions TEXT)")
+    conn.executemany("INSERT INTO drugs VALUES (?, ?, ?)", [
+        ("DB01050", "Ibuprofen", json.dumps([
+            {"drugbank_id": "DB00682", "name": "Warfarin",
+             "description": "The risk or severity of bleeding can be increased when Ibuprofen is combined with Warfarin."},
+            {"drugbank_id": "DB00945", "name": "Acetylsalicylic acid",
+             "description": "Ibuprofen may decrease the antiplatelet activities of Acetylsalicylic acid."},
+        ])),
+        ("DB00682", "Warfarin", json.dumps([
+            {"drugbank_id": "DB01050", "name": "Ibuprofen",
+             "description": "The risk or severity of bleeding can be increased when Warfarin is combined with Ibuprofen."},
+        ])),
+        ("DB00945", "Acetylsalicylic acid", "[]"),
+    ])
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def graph_file(tmp_path):
+    db = tmp_path / "drugbank.db"
+    _make_db(db)
+    return db, tmp_path / "interaction_graph.bin"
+
+
+@pytest.fixture(autouse=True)
+def close_graph():
+    yield
+    interaction_graph.close()
+
+
+class TestBuildAndLoad:
+    def test_pair_lookup_renders_description(self, graph_file):
+        db, out = graph_file
+        interaction_graph.build(str(db), str(out))
+        assert interaction_graph.load(str(out)) is True
+
+        assert interaction_graph.find("DB01050", "DB00682") == {
+            "drug": "Warfarin",
+            "drugbank_id": "DB00682",
+            "description": "The risk or severity of bleeding can be increased when Ibuprofen is combined with Warfarin.",
+            "severity": None,
+        }
+        assert interaction_graph.find("DB00682", "DB01050")["description"] == (
+            "The risk or severity of bleeding can be increased when Warfarin is combined with Ibuprofen."
+        )
+        assert interaction_graph.find("DB00945", "DB01050") is None
+
+    def test_descriptions_share_templates(self, graph_file):
+        db, out = graph_file
+        stats = interaction_graph.build(str(db), str(out))
+        assert stats == {"drugs": 3, "edges": 3, "templates": 2}
+
+    def test_interactions_row_is_lazy_sequence(self, graph_file):
+        db, out = graph_file
+        interaction_graph.build(str(db), str(out))
+        interaction_graph.load(str(out))
+
+        row = interaction_graph.interactions("DB01050")
+        assert len(row) == 2
+        assert [entry["drug"] for entry in row] == ["Warfarin", "Acetylsalicylic acid"]
+        assert len(interaction_graph.interactions("DB00945")) == 0
+        assert interaction_graph.interactions("DB99999") is None
+        assert interaction_graph.has("db00682") is True
+        assert interaction_graph.has("ibuprofen") is False
+
+    def test_classify_stores_severity_codes(self, graph_file):
+        db, out = graph_file
+        seen = []
+
+        def classify(text):
+            seen.append(text)
+            return "major" if "bleeding" in text else "minor"
+
+        interaction_graph.build(str(db), str(out), classify=classify)
+        interaction_graph.load(str(out))
+        assert len(seen) == 2  # once per template, not per edge
+        assert interaction_graph.find("DB01050", "DB00682")["severity"] == "major"
+        assert interaction_graph.find("DB01050", "DB00945")["severity"] == "minor"
+
+
+class TestSourceVersion:
+    @pytest.fixture(autouse=True)
+    def reset_source(self):
+        yield
+        interaction_graph.expect_source(None)
+
+    def test_graph_records_database_version(self, graph_file):
+        db, out = graph_file
+        interaction_graph.build(str(db), str(out))
+        interaction_graph.expect_source(interaction_graph.file_version(str(db)))
+        assert interaction_graph.load(str(out)) is True
+        assert interaction_graph.is_loaded() is True
+        assert interaction_graph.find("DB01050", "DB00682") is not None
+
+    def test_graph_from_another_database_is_not_used(self, graph_file):
+        db, out = graph_file
+        interaction_graph.build(str(db), str(out))
+        interaction_graph.load(str(out))
+        interaction_graph.expect_source("another-version")
+        assert interaction_graph.is_loaded() is False
+        assert interaction_graph.has("DB01050") is False
+        assert interaction_graph.interactions("DB01050") is None
+        assert interaction_graph.find("DB01050", "DB00682") is None
+        interaction_graph.expect_source(interaction_graph.file_version(str(db)))
+        assert interaction_graph.find("DB01050", "DB00682") is not None
+
+    def test_file_version_changes_with_content(self, tmp_path):
+        path = tmp_path / "drugbank.db"
+        assert interaction_graph.file_version(str(path)) is None
+        path.write_bytes(b"a")
+        first = interaction_graph.file_version(str(path))
+        path.write_bytes(b"ab")
+        assert interaction_graph.file_version(str(path)) != first
+
+
+class TestLoadFailures:
+    def test_missing_file(self, tmp_path):
+        assert interaction_graph.load(str(tmp_path / "missing.bin")) is False
+        assert interaction_graph.is_loaded() is False
+        assert interaction_graph.find("DB01050", "DB00682") is None
+
+    def test_wrong_format(self, tmp_path):
+        path = tmp_path / "bad.bin"
+        path.write_bytes(b"\0" * 256)
+        assert interaction_graph.load(str(path)) is False
@@ -0,0 +1,74 @@
+"""Tests for the compact cached interaction lists."""
+
+import sys
+
+from app.clients.interaction_records import InteractionList, render, templatize
+
+RECORDS = [
+    {
+        "drugbank_id": "DB00682",
+        "name": "Warfarin",
+        "description": "The risk or severity of bleeding can be increased when Ibuprofen is combined with Warfarin.",
+    },
+    {
+        "drugbank_id": "DB00945",
+        "name": "Aspirin",
+        "description": "The risk or severity of bleeding can be increased when Ibuprofen is combined with Aspirin.",
+    },
+    {"drugbank_id": None, "name": "Mystery", "description": None},
+]
+
+
+class TestTemplates:
+    def test_round_trip(self):
+        description = "Ibuprofen may increase the anticoagulant activities of Warfarin."
+        template = templatize(description, "Ibuprofen", "Warfarin")
+        assert "Ibuprofen" not in template and "Warfarin" not in template
+        assert render(template, "Ibuprofen", "Warfarin") == description
+
+    def test_longer_name_replaced_first(self):
+        description = "Insulin glargine may increase the hypoglycemic activities of Insulin."
+        template = templatize(description, "Insulin", "Insulin glargine")
+        assert render(template, "Insulin", "Insulin glargine") == description
+
+
+class TestInteractionList:
+    def test_renders_entries(self):
+        entries = InteractionList("Ibuprofen", RECORDS)
+        assert len(entries) == 3
+        assert entries[0] == {
+            "drug": "Warfarin",
+            "drugbank_id": "DB00682",
+            "description": RECORDS[0]["description"],
+        }
+        assert entries[2] == {"drug": "Mystery", "drugbank_id": None, "description": None}
+        assert entries[-1]["drug"] == "Mystery"
+        assert [e["drug"] for e in entries[:2]] == ["Warfarin", "Aspirin"]
+
+    def test_equals_plain_list(self):
+        entries = InteractionList("Ibuprofen", RECORDS[:1])
+        assert entries == [{
+            "drug": "Warfarin",
+            "drugbank_id": "DB00682",
+            "description": RECORDS[0]["description"],
+        }]
+        assert InteractionList(None, []) == []
+
+    def test_shared_templates_are_interned(self):
+        entries = InteractionList("Ibuprofen", RECORDS)
+        assert entries._templates[0] is entries._templates[1]
+
+    def test_nbytes_smaller_than_dicts(self):
+        records = [
+            {
+                "drugbank_id": f"DB{i:05d}",
+                "name": f"Drug {i}",
+                "description": f"The risk or severity of bleeding can be increased when Ibuprofen is combined with Drug {i}.",
+            }
+            for i in range(200)
+        ]
+        entries = InteractionList("Ibuprofen", records)
+        dict_size = sum(
+            sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values()) for r in records
+        )
+        assert entries.nbytes < dict_size
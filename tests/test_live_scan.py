@@ -0,0 +1,89 @@
+"""Tests for live scan sessions."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import interaction_checker, live_scan
+from tests.test_interaction_checker import batch_via
+
+
+LISTS = {
+    "Ibuprofen": [{"drug": "Warfarin", "description": "bleeding"}],
+    "Warfarin": [{"drug": "Ibuprofen", "description": "bleeding"}],
+    "Paracetamol": [],
+}
+
+
+def _drug(name, rxcui):
+    return {
+        "rxcui": rxcui, "name": name, "dosage": None,
+        "form": None, "source": "ner", "confidence": 0.9,
+    }
+
+
+@pytest.fixture(autouse=True)
+def mock_drugbank():
+    interaction_checker._pair_cache.clear()
+    with patch("app.services.interaction_checker.drugbank_client") as mock:
+        mock.resolve_rxcuis = AsyncMock(return_value={})
+        mock.get_interactions = AsyncMock(side_effect=lambda name: LISTS[name])
+        mock.get_interactions_batch = AsyncMock(side_effect=batch_via(mock.get_interactions))
+        mock.canonical_id.return_value = None
+        yield mock
+    interaction_checker._pair_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_severity():
+    with patch("app.services.interaction_checker.severity_classifier") as mock:
+        mock.classify.return_value = "major"
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_openfda():
+    with patch("app.services.interaction_checker.openfda_client") as mock:
+        mock.check_pair = AsyncMock(return_value=None)
+        yield mock
+
+
+@pytest.fixture
+def frames():
+    """Script analyze_incremental's result per frame text."""
+    results = {}
+    with patch(
+        "app.services.live_scan.drug_analyzer.analyze_incremental",
+        AsyncMock(side_effect=lambda text, state: results[text]),
+    ):
+        yield results
+
+
+class TestLiveScan:
+    async def test_reports_interaction_deltas_against_regimen(self, frames, mock_drugbank):
+        frames["a"] = [_drug("Paracetamol", "161")]
+        frames["b"] = [_drug("Ibuprofen", "5640")]
+        scan = live_scan.LiveScan([{"name": "Warfarin"}])
+
+        first = await scan.frame("a")
+        assert first["changed"] is True
+        assert first["added"] == [] and first["safe"] is True
+
+        second = await scan.frame("b")
+        assert [(r["drug_a"], r["drug_b"]) for r in second["added"]] == [("Warfarin", "Ibuprofen")]
+        assert second["safe"] is False
+
+        third = await scan.frame("a")
+        assert third["added"] == []
+        assert third["removed"] == [["Ibuprofen", "Warfarin"]]
+
+    async def test_unchanged_drugs_skip_the_check(self, frames, mock_drugbank):
+        frames["a"] = [_drug("Ibuprofen", "5640")]
+        frames["a2"] = [_drug("Ibuprofen", "5640")]
+        scan = live_scan.LiveScan([{"name": "Warfarin"}])
+
+        await scan.frame("a")
+        calls = mock_drugbank.get_interactions_batch.await_count
+        update = await scan.frame("a2")
+
+        assert update["changed"] is False
+        assert update["safe"] is False
+        assert mock_drugbank.get_interactions_batch.await_count == calls
@@ -0,0 +1,106 @@
+"""Tests for the NER wrapper's sliding windows over long texts."""
+
+import re
+import pytest
+from unittest.mock import patch
+from app.nlp import ner_model
+
+DRUGS = {"ibuprofen", "warfarin"}
+_TOKEN = re.compile(r"\w{1,3}|[^\w\s]")
+
+
+class FakeTokenizer:
+    """Splits words into pieces of up to three characters."""
+
+    def __call__(self, text, add_special_tokens, return_offsets_mapping):
+        return {"offset_mapping": [m.span() for m in _TOKEN.finditer(text)]}
+
+
+class FakePipeline:
+    """Labels every piece of a word in DRUGS as a chemical."""
+
+    tokenizer = FakeTokenizer()
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, chunks, batch_size):
+        self.calls.append(chunks)
+        return [self._tokens(chunk) for chunk in chunks]
+
+    def _tokens(self, chunk):
+        tokens = []
+        for word in re.finditer(r"\w+", chunk):
+            if word.group().lower() not in DRUGS:
+                continue
+            for i, piece in enumerate(_TOKEN.finditer(word.group())):
+                start = word.start() + piece.start()
+                tokens.append({
+                    "entity": ("B-" if i == 0 else "I-") + "CHEM", "score": 0.9,
+                    "start": start, "end": start + len(piece.group()),
+                })
+        return tokens
+
+
+@pytest.fixture
+def fake_pipeline():
+    pipeline = FakePipeline()
+    with patch.object(ner_model, "_ner_pipeline", pipeline), \
+         patch.object(ner_model, "NER_WINDOW_TOKENS", 8), \
+         patch.object(ner_model, "NER_WINDOW_STRIDE", 4):
+        yield pipeline
+
+
+class TestWindows:
+    def test_short_text_is_one_window(self, fake_pipeline):
+        entities = ner_model.predict("Take ibuprofen")
+        assert fake_pipeline.calls == [["Take ibuprofen"]]
+        assert [(e.text, e.start, e.end) for e in entities] == [("ibuprofen", 5, 14)]
+
+    def test_long_text_is_split_into_overlapping_windows_in_one_call(self, fake_pipeline):
+        text = "Take one tablet of ibuprofen with food; avoid taking warfarin at the same time."
+        entities = ner_model.predict(text)
+        assert len(fake_pipeline.calls) == 1
+        chunks = fake_pipeline.calls[0]
+        assert len(chunks) > 2
+        for left, right in zip(chunks, chunks[1:]):
+            assert text.index(right) < text.index(left) + len(left)  # windows overlap
+        assert [(e.text, e.start, e.end) for e in entities] == [
+            ("ibuprofen", text.index("ibuprofen"), text.index("ibuprofen") + 9),
+            ("warfarin", text.index("warfarin"), text.index("warfarin") + 8),
+        ]
+
+    def test_entity_across_a_window_boundary_is_found_once(self, fake_pipeline):
+        for pad in range(12):
+            text = "x " * pad + "ibuprofen and then some more words here to make it long"
+            entities = ner_model.predict(text)
+            assert [(e.text, e.start) for e in entities] == [("ibuprofen", 2 * pad)], pad
+
+    def test_batch_regroups_windows_per_text(self, fake_pipeline):
+        texts = ["ibuprofen", "no drugs here at all, only words and more words", "warfarin 5 mg"]
+        results = ner_model.predict_batch(texts)
+        assert len(fake_pipeline.calls) == 1
+        assert [[e.text for e in entities] for entities in results] == [
+            ["ibuprofen"], [], ["warfarin"],
+        ]
+
+    def test_not_loaded_raises(self):
+        with patch.object(ner_model, "_ner_pipeline", None), pytest.raises(RuntimeError):
+            ner_model.predict("ibuprofen")
+
+
+class TestPrefilter:
+    def test_offsets_map_back_past_dropped_lines(self, fake_pipeline):
+        text = (
+            "LOT 2391A EXP 03/2027\n5012345678900\n"
+            "BRUFEN Ibuprofen 400 mg\nKeep out of the reach of children"
+        )
+        entities = ner_model.predict(text)
+        assert fake_pipeline.calls == [["BRUFEN Ibuprofen 400 mg\n"]]
+        assert [(e.text, e.start, e.end) for e in entities] == [
+            ("Ibuprofen", text.index("Ibuprofen"), text.index("Ibuprofen") + 9),
+        ]
+
+    def test_all_boilerplate_skips_the_model(self, fake_pipeline):
+        assert ner_model.predict_batch(["LOT 2391A\nEXP 03/2027"]) == [[]]
+        assert fake_pipeline.calls == []
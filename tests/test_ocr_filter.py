@@ -0,0 +1,46 @@
+"""Tests for the OCR pre-filter in front of NER."""
+
+from unittest.mock import patch
+from app.nlp import ocr_filter
+
+
+class TestScore:
+    def test_drug_line_scores_high(self):
+        assert ocr_filter.score("Ibuprofen 400 mg Film-Coated Tablets") > 0.5
+
+    def test_boilerplate_lines_score_zero(self):
+        for line in [
+            "LOT 2391A EXP 03/2027",
+            "5012345678900",
+            "Keep out of the reach and sight of children",
+            "NDC 0573-0164-40",
+        ]:
+            assert ocr_filter.score(line) == 0.0, line
+
+    def test_blank_line(self):
+        assert ocr_filter.score("   \n") == 0.0
+
+
+class TestPrefilter:
+    def test_drops_boilerplate_lines(self):
+        text = "BATCH 2391A\nWarfarin Sodium 5 mg\nEXP 03/2027\nTablets\n"
+        assert ocr_filter.prefilter(text).text == "Warfarin Sodium 5 mg\nTablets\n"
+
+    def test_cuts_long_digit_runs(self):
+        filtered = ocr_filter.prefilter("Advil 200 mg 5012345678900 caplets")
+        assert filtered.text == "Advil 200 mg  caplets"
+
+    def test_offsets_map_back_to_the_original(self):
+        text = "LOT 2391A\nAdvil 5012345678900 ibuprofen\nEXP 03/2027\nNurofen"
+        filtered = ocr_filter.prefilter(text)
+        for word in ["Advil", "ibuprofen", "Nurofen"]:
+            start = filtered.text.index(word)
+            original = filtered.original_span(start, start + len(word))
+            assert text[original[0]:original[1]] == word
+
+    def test_zero_threshold_disables_the_filter(self):
+        text = "LOT 2391A\nAdvil"
+        with patch.object(ocr_filter, "NER_PREFILTER_MIN_SCORE", 0):
+            filtered = ocr_filter.prefilter(text)
+        assert filtered.text == text
+        assert filtered.original_span(10, 15) == (10, 15)
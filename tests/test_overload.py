@@ -0,0 +1,87 @@
+"""Tests for load-adaptive degradation levels."""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.services import overload
+
+
+@pytest.fixture(autouse=True)
+def reset_overload():
+    overload._level, overload._pending, overload._lag, overload._calm_since = 0, 0, 0.0, None
+    with patch.object(overload, "DEGRADE_QUEUE_DEPTH", [4, 8]), \
+         patch.object(overload, "DEGRADE_LOOP_LAG_MS", [100, 400]), \
+         patch.object(overload, "DEGRADE_RECOVERY_SECONDS", 5):
+        yield
+    overload._level, overload._pending, overload._lag, overload._calm_since = 0, 0, 0.0, None
+
+
+class TestLevels:
+    def test_queue_depth_raises_level_at_once(self):
+        overload._pending = 4
+        overload._update()
+        assert overload.level() == overload.REDUCED
+        overload._pending = 8
+        overload._update()
+        assert overload.level() == overload.MINIMAL
+
+    def test_loop_lag_raises_level(self):
+        overload._lag = 0.5
+        overload._update()
+        assert overload.level() == overload.MINIMAL
+
+    def test_recovers_one_step_per_calm_period(self):
+        overload._pending = 8
+        overload._update()
+        overload._pending = 0
+        clock = [100.0, 104.0, 105.0, 108.0, 110.0]
+        with patch("app.services.overload.time.monotonic", side_effect=clock):
+            overload._update()  # calm from 100
+            overload._update()
+            assert overload.level() == overload.MINIMAL
+            overload._update()
+            assert overload.level() == overload.REDUCED
+            overload._update()
+            assert overload.level() == overload.REDUCED
+            overload._update()
+            assert overload.level() == overload.NORMAL
+
+    def test_renewed_load_restarts_the_calm_period(self):
+        overload._pending = 4
+        overload._update()
+        overload._pending = 0
+        with patch("app.services.overload.time.monotonic", side_effect=[100.0, 106.0]):
+            overload._update()
+            overload._pending = 4
+            overload._update()
+            overload._pending = 0
+            overload._update()
+        assert overload.level() == overload.REDUCED
+
+    def test_zero_threshold_disables(self):
+        with patch.object(overload, "DEGRADE_QUEUE_DEPTH", [0, 0]):
+            overload._pending = 100
+            overload._update()
+        assert overload.level() == overload.NORMAL
+
+    def test_thresholds_parse_per_level(self):
+        with patch.dict("os.environ", {"DEGRADE_QUEUE_DEPTH": "10"}):
+            assert overload._thresholds("DEGRADE_QUEUE_DEPTH", "16,48") == [10.0, 0.0]
+
+
+class TestRequestLevel:
+    async def test_pinned_level_holds_for_the_request(self):
+        async def request():
+            pinned = overload.pin()
+            overload._level = overload.MINIMAL
+            return pinned, overload.level()
+
+        assert await asyncio.create_task(request()) == (overload.NORMAL, overload.NORMAL)
+        assert overload.level() == overload.MINIMAL  # outside the request
+
+    async def test_run_inference_counts_queue_depth(self):
+        seen = []
+        result = await overload.run_inference(lambda x: seen.append(overload._pending) or x * 2, 21)
+        assert result == 42
+        assert seen == [1]
+        assert overload._pending == 0
@@ -0,0 +1,124 @@
+"""Tests for peer-to-peer cache sharing."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.clients import peer_cache, ttl_cache
+
+NODES = ["http://api-1:8000", "http://api-2:8000", "http://api-3:8000"]
+
+
+@pytest.fixture
+def cluster():
+    """Peering on, as node api-1 of three, with one registered group."""
+    loader = AsyncMock(return_value="5640")
+    with patch.object(peer_cache, "CACHE_PEERS", NODES), \
+         patch.object(peer_cache, "CACHE_SELF", NODES[0]), \
+         patch.object(peer_cache, "_ring", peer_cache.HashRing(NODES)), \
+         patch.dict(peer_cache._groups, {"test.group": peer_cache._Group(loader, str.upper, str.lower)}):
+        peer_cache._hot.clear()
+        yield loader
+        peer_cache._hot.clear()
+
+
+def key_owned_by(node: str) -> str:
+    return next(k for k in (f"drug{i}" for i in range(1000)) if peer_cache.owner("test.group", k) == node)
+
+
+def peer_response(value):
+    resp = MagicMock()
+    resp.json.return_value = {"value": value}
+    return resp
+
+
+class TestHashRing:
+    def test_owner_is_stable(self):
+        ring = peer_cache.HashRing(NODES)
+        assert ring.owner("rxnorm.rxcui/ibuprofen") == peer_cache.HashRing(list(reversed(NODES))).owner(
+            "rxnorm.rxcui/ibuprofen"
+        )
+
+    def test_keys_spread_over_nodes(self):
+        ring = peer_cache.HashRing(NODES)
+        owners = [ring.owner(f"key{i}") for i in range(3000)]
+        assert all(owners.count(node) > 600 for node in NODES)
+
+    def test_removing_a_node_only_moves_its_keys(self):
+        before = peer_cache.HashRing(NODES)
+        after = peer_cache.HashRing(NODES[:2])
+        for i in range(1000):
+            key = f"key{i}"
+            if before.owner(key) != NODES[2]:
+                assert after.owner(key) == before.owner(key)
+
+    def test_empty_ring_has_no_owner(self):
+        assert peer_cache.HashRing([]).owner("key") is None
+
+
+class TestLookup:
+    async def test_disabled_without_peers(self):
+        assert peer_cache.enabled() is False
+        assert await peer_cache.lookup("rxnorm.rxcui", "ibuprofen") is ttl_cache.MISS
+
+    async def test_own_keys_are_not_fetched(self, cluster):
+        with patch.object(peer_cache, "_http") as http:
+            assert await peer_cache.lookup("test.group", key_owned_by(NODES[0])) is ttl_cache.MISS
+        http.assert_not_called()
+
+    async def test_asks_owner_and_keeps_hot_copy(self, cluster):
+        key = key_owned_by(NODES[1])
+        client = MagicMock(get=AsyncMock(return_value=peer_response("5640")))
+        with patch.object(peer_cache, "_http", return_value=client):
+            assert await peer_cache.lookup("test.group", key) == "5640"
+            assert await peer_cache.lookup("test.group", key) == "5640"
+        client.get.assert_awaited_once()
+        assert client.get.call_args.args[0] == f"{NODES[1]}/internal/cache/test.group"
+        assert client.get.call_args.kwargs["params"] == {"key": key}
+
+    async def test_decodes_peer_value(self, cluster):
+        client = MagicMock(get=AsyncMock(return_value=peer_response("ABC")))
+        with patch.object(peer_cache, "_http", return_value=client):
+            assert await peer_cache.lookup("test.group", key_owned_by(NODES[2])) == "abc"
+
+    async def test_peer_failure_falls_back_to_local(self, cluster):
+        client = MagicMock(get=AsyncMock(side_effect=Exception("connection refused")))
+        with patch.object(peer_cache, "_http", return_value=client):
+            assert await peer_cache.lookup("test.group", key_owned_by(NODES[1])) is ttl_cache.MISS
+
+
+class TestServe:
+    async def test_loads_and_encodes(self, cluster):
+        assert await peer_cache.serve("test.group", "ibuprofen") == "5640"
+        cluster.assert_awaited_once_with("ibuprofen")
+
+    async def test_concurrent_requests_share_one_load(self, cluster):
+        release = asyncio.Event()
+
+        async def slow_load(key):
+            await release.wait()
+            return "5640"
+
+        cluster.side_effect = slow_load
+        pending = [asyncio.ensure_future(peer_cache.serve("test.group", "ibuprofen")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*pending) == ["5640"] * 3
+        assert cluster.await_count == 1
+
+    async def test_loader_does_not_ask_other_peers(self, cluster):
+        seen = []
+
+        async def load(key):
+            seen.append(await peer_cache.lookup("test.group", key_owned_by(NODES[1])))
+            return "5640"
+
+        cluster.side_effect = load
+        with patch.object(peer_cache, "_http") as http:
+            await peer_cache.serve("test.group", "x")
+        assert seen == [ttl_cache.MISS]
+        http.assert_not_called()
+
+    async def test_unknown_group_raises(self, cluster):
+        with pytest.raises(KeyError):
+            await peer_cache.serve("nope", "x")
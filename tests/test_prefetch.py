@@ -0,0 +1,64 @@
+"""Tests for speculative prefetch after /analyze."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import prefetch
+
+
+@pytest.fixture(autouse=True)
+def reset_inflight():
+    prefetch._inflight.clear()
+    yield
+    prefetch._inflight.clear()
+
+
+@pytest.fixture
+def mock_drugbank():
+    with patch("app.services.prefetch.drugbank_client") as mock:
+        mock.resolve_rxcuis = AsyncMock(return_value={})
+        mock.get_interactions = AsyncMock(return_value=[{"drug": "Warfarin"}])
+        yield mock
+
+
+@pytest.fixture
+def mock_openfda():
+    with patch("app.services.prefetch.openfda_client") as mock:
+        mock.warm_label = AsyncMock()
+        yield mock
+
+
+class TestPrefetch:
+    async def test_warms_resolution_and_interactions(self, mock_drugbank, mock_openfda):
+        await prefetch.prefetch([{"name": "Ibuprofen", "rxcui": "5640"}])
+        mock_drugbank.resolve_rxcuis.assert_awaited_once_with(["5640"])
+        mock_drugbank.get_interactions.assert_awaited_once_with("Ibuprofen")
+        mock_openfda.warm_label.assert_not_awaited()
+        assert prefetch._inflight == set()
+
+    async def test_empty_drugbank_list_warms_openfda_label(self, mock_drugbank, mock_openfda):
+        mock_drugbank.get_interactions.return_value = []
+        await prefetch.prefetch([{"name": "Ibuprofen", "rxcui": "5640"}])
+        mock_openfda.warm_label.assert_awaited_once_with("Ibuprofen")
+
+    async def test_budget_skips_rather_than_queues(self, mock_drugbank, mock_openfda):
+        release = asyncio.Event()
+
+        async def slow(name):
+            await release.wait()
+            return [{"drug": "x"}]
+
+        mock_drugbank.get_interactions.side_effect = slow
+        drugs = [{"name": f"drug{i}", "rxcui": str(i)} for i in range(3)]
+        with patch("app.services.prefetch.PREFETCH_BUDGET", 2):
+            first = asyncio.create_task(prefetch.prefetch(drugs[:2]))
+            await asyncio.sleep(0)
+            await prefetch.prefetch(drugs[1:])  # drug1 is in flight, drug2 is over budget
+            release.set()
+            await first
+        assert mock_drugbank.get_interactions.await_count == 2
+
+    async def test_failures_are_swallowed(self, mock_drugbank, mock_openfda):
+        mock_drugbank.get_interactions.side_effect = Exception("DrugBank down")
+        await prefetch.prefetch([{"name": "Ibuprofen", "rxcui": "5640"}])
+        assert prefetch._inflight == set()
@@ -0,0 +1,40 @@
+"""Tests for the lite deployment profile."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def _python(code: str, profile: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env={**os.environ, "PILLCHECKER_PROFILE": profile},
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestLiteProfile:
+    def test_app_imports_without_transformers_or_torch(self):
+        result = _python(
+            "import sys, app.main; "
+            "print(sorted(m for m in ('transformers', 'torch') if m in sys.modules))",
+            "lite",
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+
+    def test_unknown_profile_is_rejected(self):
+        result = _python("import app.profile", "tiny")
+        assert result.returncode != 0
+        assert "PILLCHECKER_PROFILE" in result.stderr
+
+    @pytest.mark.parametrize("profile", ["lite", " LITE "])
+    def test_profile_is_normalized(self, profile):
+        result = _python("from app import profile; print(profile.is_lite())", profile)
+        assert result.stdout.strip() == "True"
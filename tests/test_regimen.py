@@ -0,0 +1,110 @@
+"""Tests for incremental regimen sessions."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import interaction_checker, regimen
+from tests.test_interaction_checker import batch_via
+
+
+LISTS = {
+    "ibuprofen": [{"drug": "Warfarin", "description": "bleeding"}],
+    "warfarin": [{"drug": "Ibuprofen", "description": "bleeding"}, {"drug": "Aspirin", "description": "bleeding"}],
+    "aspirin": [{"drug": "Warfarin", "description": "bleeding"}],
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_sessions():
+    regimen._sessions.clear()
+    interaction_checker._pair_cache.clear()
+    yield
+    regimen._sessions.clear()
+    interaction_checker._pair_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_drugbank():
+    with patch("app.services.interaction_checker.drugbank_client") as mock:
+        mock.get_interactions = AsyncMock(side_effect=lambda name: LISTS[name])
+        mock.get_interactions_batch = AsyncMock(side_effect=batch_via(mock.get_interactions))
+        mock.canonical_id.return_value = None
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_severity():
+    with patch("app.services.interaction_checker.severity_classifier") as mock:
+        mock.classify.return_value = "major"
+        yield mock
+
+
+class TestRegimen:
+    async def test_adding_a_drug_checks_only_its_new_pairs(self):
+        created = await regimen.create(["ibuprofen", "warfarin"])
+        assert created["safe"] is False
+
+        with patch(
+            "app.services.interaction_checker._check_pair",
+            wraps=interaction_checker._check_pair,
+        ) as check_pair:
+            added = await regimen.add(created["id"], ["aspirin"])
+
+        checked = {frozenset(c.args[:2]) for c in check_pair.call_args_list}
+        assert checked == {frozenset({"ibuprofen", "aspirin"}), frozenset({"warfarin", "aspirin"})}
+        assert added["drugs"] == ["ibuprofen", "warfarin", "aspirin"]
+        assert len(added["interactions"]) == 2
+
+    async def test_remove_drops_the_drug_and_its_pairs(self):
+        created = await regimen.create(["ibuprofen", "warfarin", "aspirin"])
+        updated = await regimen.remove(created["id"], "warfarin")
+        assert updated["drugs"] == ["ibuprofen", "aspirin"]
+        assert updated["safe"] is True
+        session = regimen._sessions.get(created["id"])
+        assert all("warfarin" not in key for key in session.pairs)
+
+    async def test_failed_fetch_is_not_remembered(self, mock_drugbank):
+        created = await regimen.create(["ibuprofen"])
+        mock_drugbank.get_interactions.side_effect = [LISTS["ibuprofen"], Exception("down")]
+        await regimen.add(created["id"], ["warfarin"])
+        assert regimen._sessions.get(created["id"]).pairs == {}
+
+    async def test_fallback_miss_is_rechecked_on_add(self, mock_drugbank):
+        """A pair OpenFDA could not confirm (empty DrugBank list) is checked again later."""
+        lists = {**LISTS, "newdrug": []}
+        mock_drugbank.get_interactions.side_effect = lambda name: lists[name]
+        fda_match = {"drug": "Warfarin", "description": "bleeding"}
+        with patch(
+            "app.services.interaction_checker.openfda_client.check_pair",
+            new=AsyncMock(return_value=None),
+        ) as check_pair:
+            created = await regimen.create(["warfarin", "newdrug"])
+            assert created["safe"] is True
+            assert regimen._sessions.get(created["id"]).pairs == {}
+
+            check_pair.side_effect = lambda a, b: fda_match if a == "warfarin" else None
+            added = await regimen.add(created["id"], ["aspirin"])
+
+        assert {frozenset((i["drug_a"], i["drug_b"])) for i in added["interactions"]} >= {
+            frozenset({"warfarin", "newdrug"}),
+        }
+
+    async def test_unknown_session(self):
+        assert regimen.get("missing") is None
+        assert await regimen.add("missing", ["ibuprofen"]) is None
+        assert regimen.delete("missing") is False
+
+    async def test_drug_limit(self):
+        created = await regimen.create(["ibuprofen"])
+        with patch("app.services.regimen.REGIMEN_MAX_DRUGS", 2):
+            with pytest.raises(regimen.RegimenFullError):
+                await regimen.add(created["id"], ["warfarin", "aspirin"])
+        assert regimen.get(created["id"])["drugs"] == ["ibuprofen"]
+
+    async def test_sessions_share_a_byte_budget(self):
+        with patch.object(regimen._sessions, "max_bytes", 6000):
+            first = await regimen.create(["ibuprofen", "warfarin"])
+            second = await regimen.create(["warfarin", "aspirin"])
+            third = await regimen.create(["ibuprofen", "aspirin"])
+        assert regimen.get(first["id"]) is None
+        assert regimen.get(second["id"]) is not None
+        assert regimen.get(third["id"]) is not None
@@ -0,0 +1,74 @@
+"""Tests for the combined analyze-and-check pipeline."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import scan_checker
+
+
+def _drug(name, rxcui):
+    return {
+        "rxcui": rxcui, "name": name, "dosage": None,
+        "form": None, "source": "ner", "confidence": 0.9,
+    }
+
+
+@pytest.fixture
+def mock_drugbank():
+    with patch("app.services.scan_checker.drugbank_client") as mock:
+        mock.resolve_rxcuis = AsyncMock(side_effect=lambda rxcuis: {r: f"DB{r:0>5}" for r in rxcuis})
+        mock.get_interactions = AsyncMock(return_value=[])
+        yield mock
+
+
+@pytest.fixture
+def mock_checker():
+    with patch("app.services.scan_checker.interaction_checker") as mock:
+        mock.check_refs = AsyncMock(return_value={"interactions": [], "safe": True, "error": None})
+        yield mock
+
+
+class TestAnalyzeAndCheck:
+    async def test_fetch_starts_before_analysis_finishes(self, mock_drugbank, mock_checker):
+        fetched_during_analysis = []
+
+        async def analyze_batch(texts, on_identified=None):
+            on_identified("Ibuprofen", "5640")
+            await asyncio.sleep(0.01)  # rest of the enrichment
+            fetched_during_analysis.extend(c.args[0] for c in mock_drugbank.get_interactions.await_args_list)
+            return [[_drug("Ibuprofen", "5640")]]
+
+        with patch("app.services.scan_checker.drug_analyzer.analyze_batch", side_effect=analyze_batch):
+            result = await scan_checker.analyze_and_check(["Ibuprofen 400 mg"], ["warfarin"])
+
+        assert set(fetched_during_analysis) == {"warfarin", "DB05640"}
+        assert result["drugs"] == [[_drug("Ibuprofen", "5640")]]
+        assert result["safe"] is True
+
+    async def test_checks_known_and_identified_drugs_once_each(self, mock_drugbank, mock_checker):
+        async def analyze_batch(texts, on_identified=None):
+            on_identified("Ibuprofen", "5640")
+            on_identified("ibuprofen", "5640")
+            return [[_drug("Ibuprofen", "5640")], [_drug("ibuprofen", "5640")]]
+
+        with patch("app.services.scan_checker.drug_analyzer.analyze_batch", side_effect=analyze_batch):
+            await scan_checker.analyze_and_check(["box 1", "box 2"], [{"drugbank_id": "DB00682"}])
+
+        mock_checker.check_refs.assert_awaited_once_with([
+            {"drugbank_id": "DB00682"},
+            {"name": "Ibuprofen", "rxcui": "5640"},
+        ])
+        assert mock_drugbank.get_interactions.await_count == 2
+
+    async def test_prefetch_failure_does_not_fail_the_scan(self, mock_drugbank, mock_checker):
+        mock_drugbank.get_interactions.side_effect = Exception("DrugBank down")
+
+        async def analyze_batch(texts, on_identified=None):
+            on_identified("Ibuprofen", "5640")
+            return [[_drug("Ibuprofen", "5640")]]
+
+        with patch("app.services.scan_checker.drug_analyzer.analyze_batch", side_effect=analyze_batch):
+            result = await scan_checker.analyze_and_check(["Ibuprofen"])
+
+        assert result["error"] is None
+        mock_checker.check_refs.assert_awaited_once()
@@ -91,3 +91,34 @@ class TestLoadModel:
     def test_is_loaded_false_initially(self):
         severity_classifier._classifier = None
         assert severity_classifier.is_loaded() is False
+
+
+class TestFastTier:
+    """The hashed n-gram tier answers confident cases; the rest go to the zero-shot model."""
+
+    @pytest.fixture(autouse=True)
+    def pipeline(self):
+        mock = MagicMock(return_value={
+            "labels": ["moderate interaction requiring monitoring"], "scores": [0.9],
+        })
+        severity_classifier._classifier = mock
+        severity_classifier._stats.update(fast=0, escalated=0)
+        yield mock
+        severity_classifier._classifier = None
+
+    def test_confident_tier_skips_the_model(self, pipeline):
+        with patch.object(severity_classifier.severity_tier, "predict", return_value=("major", 0.8)):
+            assert severity_classifier.classify("contraindicated") == "major"
+        pipeline.assert_not_called()
+        assert severity_classifier.status()["fast"] == 1
+
+    def test_low_margin_escalates(self, pipeline):
+        with patch.object(severity_classifier.severity_tier, "predict", return_value=("major", 0.05)):
+            assert severity_classifier.classify("monitor closely") == "moderate"
+        pipeline.assert_called_once()
+        assert severity_classifier.status()["escalated"] == 1
+
+    def test_low_margin_without_model_keeps_tier_answer(self):
+        severity_classifier._classifier = None
+        with patch.object(severity_classifier.severity_tier, "predict", return_value=("minor", 0.05)):
+            assert severity_classifier.classify("slight decrease") == "minor"
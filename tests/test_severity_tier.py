@@ -0,0 +1,59 @@
+"""Tests for the hashed n-gram severity tier."""
+
+import pytest
+from app.nlp import severity_tier
+
+TRAINING = [
+    ("Drug A is contraindicated with Drug B: risk of fatal arrhythmia.", "major"),
+    ("Concomitant use may cause life-threatening serotonin syndrome.", "major"),
+    ("Drug A may increase the serum concentration of Drug B; monitor levels.", "moderate"),
+    ("Monitor blood pressure when Drug A is combined with Drug B.", "moderate"),
+    ("Drug A may slightly decrease the absorption of Drug B.", "minor"),
+    ("A minor decrease in the excretion rate of Drug B is possible.", "minor"),
+]
+
+
+@pytest.fixture
+def trained(tmp_path):
+    path = tmp_path / "severity_tier.bin"
+    texts, labels = zip(*TRAINING)
+    path.write_bytes(severity_tier.train(list(texts), list(labels), bits=12, epochs=30))
+    assert severity_tier.load(str(path))
+    yield path
+    severity_tier._model = None
+
+
+class TestPredict:
+    def test_learns_the_training_labels(self, trained):
+        for text, label in TRAINING:
+            assert severity_tier.predict(text)[0] == label
+
+    def test_margin_is_a_probability_gap(self, trained):
+        _, margin = severity_tier.predict(TRAINING[0][0])
+        assert 0 < margin <= 1
+        _, unseen_margin = severity_tier.predict("zzz qqq")
+        assert unseen_margin < margin
+
+    def test_artifact_is_small(self, trained):
+        assert trained.stat().st_size == 16 + 4 * 3 + 4 * 3 * 4096
+
+    def test_not_loaded(self):
+        assert severity_tier.predict("anything") is None
+
+
+class TestLoad:
+    def test_missing_file(self, tmp_path):
+        assert severity_tier.load(str(tmp_path / "missing.bin")) is False
+        assert severity_tier.is_loaded() is False
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "graph.bin"
+        path.write_bytes(b"PCIG" + bytes(64))
+        assert severity_tier.load(str(path)) is False
+
+
+class TestFeatures:
+    def test_unigrams_and_bigrams_are_hashed_into_buckets(self):
+        buckets = severity_tier.features("Monitor closely, monitor", bits=8)
+        assert len(buckets) <= 4  # monitor, closely, "monitor closely", "closely monitor"
+        assert all(0 <= b < 256 for b in buckets)
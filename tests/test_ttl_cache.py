@@ -0,0 +1,144 @@
+"""Tests for the byte-budgeted TTL cache."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+from app.clients import ttl_cache
+
+
+class TestTTLCache:
+    def test_get_returns_miss_for_unknown_key(self):
+        cache = ttl_cache.TTLCache(60)
+        assert cache.get("x") is ttl_cache.MISS
+        assert cache.get("x", None) is None
+
+    def test_caches_none(self):
+        cache = ttl_cache.TTLCache(60)
+        cache.set("x", None)
+        assert cache.get("x") is None
+        assert "x" in cache
+
+    def test_entries_expire(self):
+        cache = ttl_cache.TTLCache(60)
+        cache.set("x", 1)
+        with patch("app.clients.ttl_cache.time.time", return_value=time.time() + 61):
+            assert cache.get("x") is ttl_cache.MISS
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = ttl_cache.TTLCache(60)
+        cache.set("a", "x" * 100)
+        budget = cache.nbytes * 2
+        cache = ttl_cache.TTLCache(60, max_bytes=budget)
+        cache.set("a", "x" * 100)
+        cache.set("b", "y" * 100)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", "z" * 100)
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.nbytes <= budget
+
+    def test_skips_values_larger_than_budget(self):
+        cache = ttl_cache.TTLCache(60, max_bytes=200)
+        cache.set("small", 1)
+        cache.set("big", "x" * 1000)
+        assert "big" not in cache
+        assert "small" in cache
+
+    def test_overwrite_replaces_accounted_size(self):
+        cache = ttl_cache.TTLCache(60)
+        cache.set("x", "a" * 1000)
+        cache.set("x", "a")
+        assert cache.nbytes < 200
+
+    def test_clear_resets_accounting(self):
+        cache = ttl_cache.TTLCache(60)
+        cache.set("x", [1, 2, 3])
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+
+class TestStaleWhileRevalidate:
+    async def test_stale_value_served_and_refreshed_once(self):
+        cache = ttl_cache.TTLCache(60, hard_ttl=120)
+        cache.set("x", "old")
+        refresh = AsyncMock(return_value="new")
+        with patch("app.clients.ttl_cache.time.time", return_value=time.time() + 90):
+            assert cache.get("x", refresh=refresh) == "old"
+            assert cache.get("x", refresh=refresh) == "old"
+            await asyncio.sleep(0)
+        refresh.assert_awaited_once()
+        assert cache.get("x") == "new"
+
+    async def test_fresh_value_not_refreshed(self):
+        cache = ttl_cache.TTLCache(60, hard_ttl=120)
+        cache.set("x", "old")
+        refresh = AsyncMock(return_value="new")
+        assert cache.get("x", refresh=refresh) == "old"
+        await asyncio.sleep(0)
+        refresh.assert_not_called()
+
+    async def test_failed_refresh_keeps_stale_value(self):
+        cache = ttl_cache.TTLCache(60, hard_ttl=120)
+        cache.set("x", "old")
+        refresh = AsyncMock(side_effect=Exception("down"))
+        with patch("app.clients.ttl_cache.time.time", return_value=time.time() + 90):
+            cache.get("x", refresh=refresh)
+            await asyncio.sleep(0)
+            assert cache.get("x") == "old"
+
+    def test_hard_ttl_bounds_staleness(self):
+        cache = ttl_cache.TTLCache(60, hard_ttl=120)
+        cache.set("x", "old")
+        with patch("app.clients.ttl_cache.time.time", return_value=time.time() + 121):
+            assert cache.get("x", refresh=AsyncMock()) is ttl_cache.MISS
+
+    def test_jitter_shortens_soft_ttl_only(self):
+        cache = ttl_cache.TTLCache(100, hard_ttl=200, jitter=0.5)
+        now = time.time()
+        for i in range(50):
+            cache.set(str(i), i)
+        soft = {entry[1] - now for entry in cache._entries.values()}
+        hard = {round(entry[2] - now) for entry in cache._entries.values()}
+        assert all(49 <= ttl <= 101 for ttl in soft)
+        assert len(soft) > 1
+        assert hard == {200}
+
+
+class TestTags:
+    def test_invalidate_tag_drops_only_that_tag(self):
+        version = "v1"
+        cache = ttl_cache.TTLCache(60, max_bytes=10_000, tagger=lambda: version)
+        cache.set("a", "old")
+        version = "v2"
+        cache.set("b", "new")
+        assert cache.invalidate_tag("v1") == 1
+        assert cache.get("a") is ttl_cache.MISS
+        assert cache.get("b") == "new"
+        assert cache.nbytes == sum(entry[3] for entry in cache._entries.values())
+
+    async def test_invalidate_tag_cancels_pending_refresh(self):
+        cache = ttl_cache.TTLCache(60, hard_ttl=120, tagger=lambda: "v1")
+        cache.set("x", "old")
+        refresh = AsyncMock(return_value="new")
+        with patch("app.clients.ttl_cache.time.time", return_value=time.time() + 90):
+            cache.get("x", refresh=refresh)
+        task = cache._refreshing["x"]
+        cache.invalidate_tag("v1")
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert cache.get("x") is ttl_cache.MISS
+
+
+class TestApproxSize:
+    def test_walks_containers(self):
+        assert ttl_cache.approx_size({"k": ["x" * 1000]}) > 1000
+
+    def test_uses_nbytes_attribute(self):
+        class Compact:
+            nbytes = 42
+
+        assert ttl_cache.approx_size(Compact()) == 42